@@ -1,4 +1,8 @@
 # main/apps.py
+import os
+import sys
+import threading
+
 from django.apps import AppConfig
 
 class MainConfig(AppConfig):
@@ -6,4 +10,21 @@ class MainConfig(AppConfig):
     name = 'main'
 
     def ready(self):
-        return;
+        # prdinfo 템플릿 → Luckysheet 변환(캐시가 비면 수 초)을 서버 기동 시 백그라운드로 미리 만든다
+        # (PRDINFO_LUCKY_WARM=0이면 끔, 서버 외 관리 명령과 runserver 자동 재시작 감시 프로세스에서는 하지 않음)
+        if os.environ.get("PRDINFO_LUCKY_WARM", "1") == "0":
+            return
+        if "manage.py" in os.path.basename(sys.argv[0]):
+            if sys.argv[1:2] != ["runserver"]:
+                return
+            if os.environ.get("RUN_MAIN") != "true" and "--noreload" not in sys.argv:
+                return
+        threading.Thread(target=_warm_prdinfo_lucky, name="prdinfo-lucky-warm", daemon=True).start()
+
+
+def _warm_prdinfo_lucky():
+    from main.views.certy.prdinfo_lucky import get_lucky_json
+    try:
+        get_lucky_json()
+    except Exception as e:
+        print(f"prdinfo 템플릿 변환 미리 만들기 실패: {e}")
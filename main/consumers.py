@@ -2,6 +2,9 @@ from channels.generic.websocket import AsyncWebsocketConsumer
 import json
 import asyncio
 
+from main.views.testing.security_GPT import run_gpt_batch
+from main.views.testing.security_session import is_valid_session_id
+
 class StatusConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.task_id = self.scope['url_route']['kwargs']['task_id']
@@ -29,3 +32,59 @@ class StatusConsumer(AsyncWebsocketConsumer):
             'status': event['status'],
             'message': event.get('message', '')
         }))
+
+
+class SecurityGptBatchConsumer(AsyncWebsocketConsumer):
+    """
+    Invicti 파싱 세션 전체에 대한 GPT 추천 일괄 생성
+    - 클라이언트: {"session": <parse_session>, "rows": [detail_no...](선택)} 전송
+    - 서버: start → result/item_error(완료 순) → done 전송 후 종료
+    - 연결이 끊기면 진행 중인 요청을 취소
+    """
+
+    async def connect(self):
+        self.batch_task = None
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        if self.batch_task and not self.batch_task.done():
+            self.batch_task.cancel()
+
+    async def _safe_send(self, payload):
+        try:
+            await self.send(text_data=json.dumps(payload, ensure_ascii=False))
+        except Exception:
+            pass
+
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            payload = json.loads(text_data or "{}")
+        except Exception:
+            await self._safe_send({"status": "error", "message": "잘못된 요청 데이터(JSON)"})
+            await self.close()
+            return
+
+        session_id = (payload.get("session") or "").strip()
+        if not is_valid_session_id(session_id):
+            await self._safe_send({"status": "error", "message": "파싱 세션이 없습니다. 리포트를 다시 업로드하세요."})
+            await self.close()
+            return
+        if self.batch_task and not self.batch_task.done():
+            await self._safe_send({"status": "error", "message": "이미 일괄 추천이 진행 중입니다."})
+            return
+
+        # receive 안에서 오래 기다리면 disconnect 처리가 밀리므로 별도 태스크로 실행
+        self.batch_task = asyncio.create_task(self._run_batch(session_id, payload.get("rows")))
+
+    async def _run_batch(self, session_id, row_nos):
+        try:
+            await run_gpt_batch(session_id, self._safe_send, row_nos=row_nos)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._safe_send({"status": "error", "message": f"일괄 추천 중 오류 발생: {e}"})
+        finally:
+            try:
+                await self.close()
+            except Exception:
+                pass
@@ -0,0 +1,211 @@
+"""
+Invicti 결과 행 기준 구현 (BeautifulSoup html.parser)
+- lxml 스트리밍 파서(security_extractHTML)로 옮기기 전의 추출 로직 그대로 (스니펫 invicti_analysis 제외)
+- 결과 비교용(테스트, bench_invicti --check)이며 서비스 경로에서는 쓰지 않는다
+"""
+import json
+import re
+from typing import Optional, Dict, Any, List
+
+from main.utils.resources import get_resource
+from main.views.testing import security_matcher  # noqa: F401  ("security_matcher" 리소스 등록)
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+
+# 기준 구현과 비교하는 행 필드 (스니펫은 정리 방식이 달라 제외)
+FIELDS = (
+    "id", "test_env_os", "defect_summary", "defect_level", "frequency", "quality_attribute",
+    "defect_description", "invicti_report", "vuln_detail_json", "gpt_prompt",
+)
+
+
+def _clean_text(el) -> str:
+    return "" if el is None else el.get_text("\n", strip=True)
+
+
+def _find_h4_sibling_text(block, text):
+    h4_tag = block.find('h4', string=re.compile(text, re.I))
+    if h4_tag:
+        next_sibling = h4_tag.find_next_sibling()
+        if next_sibling and next_sibling.find('li'):
+            return next_sibling.find('li').text.strip()
+    return ''
+
+
+def _variables_for_urls(block):
+    url_texts = []
+    for url in block.select('.vuln-url div'):
+        text = re.sub(r'^\d+\.\d+\.\s*', '', url.text.strip())
+        if text.endswith('확정됨'):
+            text = text[:-len('확정됨')].strip()
+        if text:
+            url_texts.append(text)
+    return {'url': '\n'.join(url_texts)}
+
+
+def _variables_for_weak_ciphers(block):
+    selector = "li[data-description*='지원되는 약한 암호 목록']"
+    return {'weak': '\n'.join(li.text.strip() for li in block.select(selector))}
+
+
+def _variables_for_out_of_date(block):
+    return {'v1': _find_h4_sibling_text(block, 'Overall Latest Version'), 'v2': _find_h4_sibling_text(block, '확인된 버전')}
+
+
+# 템플릿 번호 → 변수 추출 (나머지 번호는 변수 없음)
+_VARIABLE_HANDLERS = {
+    1: _variables_for_out_of_date, 2: _variables_for_out_of_date,
+    9: _variables_for_urls, 10: _variables_for_urls, 12: _variables_for_urls, 14: _variables_for_urls,
+    16: _variables_for_urls, 17: _variables_for_urls, 18: _variables_for_urls, 19: _variables_for_urls,
+    11: _variables_for_weak_ciphers, 22: _variables_for_weak_ciphers,
+}
+
+
+def _parse_table(table_tag) -> Optional[Dict[str, Any]]:
+    if not table_tag:
+        return None
+    first_tr = table_tag.find('tr')
+    if not first_tr:
+        return None
+    headers = [th.get_text(strip=True) for th in first_tr.find_all(['th', 'td'])]
+
+    mapping: List[tuple] = []
+    for h in headers:
+        h_norm = h.replace(" ", "").lower()
+        if ('메서드' in h) or ('method' in h_norm): mapping.append(("method", h))
+        elif ('매개변수형식' in h) or ('형식' in h) or ('type' in h_norm): mapping.append(("type", h))
+        elif ('매개변수' in h) or ('parameter' in h_norm) or ('param' in h_norm): mapping.append(("param", h))
+        elif ('값' in h) or ('value' in h_norm): mapping.append(("value", h))
+        else: mapping.append((f"col_{len(mapping)}", h))
+
+    rows = []
+    for tr in table_tag.find_all('tr')[1:]:
+        cells = [td.get_text("\n", strip=True) for td in tr.find_all(['td', 'th'])]
+        if len(cells) < len(mapping):
+            cells += [''] * (len(mapping) - len(cells))
+        rows.append({key: val for (key, _label), val in zip(mapping, cells[:len(mapping)])})
+
+    return {"columns": [{"key": k, "label": lbl} for (k, lbl) in mapping], "rows": rows}
+
+
+def _extract_pre_text(container, selector: str) -> Optional[str]:
+    el = container.select_one(selector)
+    if not el:
+        return None
+    pre = el.find('pre')
+    if not pre:
+        return _clean_text(el)
+    code = pre.find('code')
+    return code.get_text("\n", strip=False) if code else pre.get_text("\n", strip=False)
+
+
+def _detail_json(vuln_block) -> Optional[Dict[str, Any]]:
+    header_div = vuln_block.select_one('div.vuln-desc-header')
+    first_vuln = vuln_block.select_one('div.vuln')
+    if not first_vuln:
+        return None
+
+    detail_container = first_vuln.select_one('div.vuln-detail')
+    if not detail_container:
+        return {"header": _clean_text(header_div), "list": [], "request": None, "response": None}
+
+    data_list = []
+    table_data = _parse_table(detail_container.find('table'))
+    if table_data:
+        data_list.append({"type": "table", "data": table_data})
+
+    code_block = detail_container.select_one('pre.cprompt')
+    if code_block:
+        key_tag = code_block.find_previous_sibling('h3') or code_block.find_previous_sibling('h4')
+        key = _clean_text(key_tag) if key_tag else "Code Block"
+        data_list.append({"type": "code", "key": key, "value": _clean_text(code_block)})
+
+    for h4 in detail_container.find_all('h4'):
+        key = _clean_text(h4)
+        next_sibling = h4.find_next_sibling()
+        if next_sibling and next_sibling.name == 'ul':
+            link_tag = next_sibling.find('a')
+            li_tag = next_sibling.find('li')
+            if link_tag:
+                data_list.append({"type": "link", "key": key, "value": link_tag.get('href', _clean_text(link_tag))})
+            elif li_tag:
+                data_list.append({"type": "key-value", "key": key, "value": _clean_text(li_tag)})
+
+    return {
+        "header": _clean_text(header_div),
+        "list": data_list,
+        "request": _extract_pre_text(detail_container, '.vuln-tab.vuln-req1-tab'),
+        "response": _extract_pre_text(detail_container, '.vuln-tab.vuln-resp1-tab'),
+    }
+
+
+def _defect_text(vuln_desc_div, block, h2_text, matched_row):
+    """(결함 요약, 결함 내용, 템플릿 변수): 템플릿이 매칭되면 변수 치환, 아니면 h2/본문 문단 그대로"""
+    defect_description = "\n".join(p.text.strip() for p in vuln_desc_div.find_all('p'))
+    if matched_row is None:
+        return h2_text, defect_description, {}
+
+    summary = str(matched_row['TTA 결함 리포트 결함 요약'])
+    description = str(matched_row['결함 내용'])
+    match = re.search(r'\((.*?)\)', h2_text)
+    handler = _VARIABLE_HANDLERS.get(matched_row['번호'])
+    variables = {'o': match.group(1).strip() if match else '', **(handler(block) if handler else {})}
+    for key, value in variables.items():
+        if value:
+            summary = summary.replace(f'{{{key}}}', value)
+            description = description.replace(f'{{{key}}}', value)
+    return summary, description, variables
+
+
+def _gpt_prompt(vuln_detail_json) -> str:
+    if not vuln_detail_json:
+        return ""
+    prompt_body = json.dumps({k: v for k, v in vuln_detail_json.items() if v}, indent=2, ensure_ascii=False)
+    return (
+        "다음 Invicti 취약점 데이터에 대한 구체적인 해결 방안을 한글로 제시해줘.\n"
+        "코드가 포함된 답변이라면, 해당 코드는 마크다운 코드 블록으로 감싸줘.\n\n"
+        f"{prompt_body}"
+    )
+
+
+def reference_details(html_content) -> List[Dict[str, Any]]:
+    """
+    대상 등급(criticals/highs/mediums) 취약점마다 FIELDS 필드의 결과 행
+    + "variables": 템플릿 치환에 쓴 변수({o}, {url}, {weak}, {v1}/{v2}; 매칭 실패면 빈 dict)
+    """
+    if BeautifulSoup is None:
+        raise RuntimeError("BeautifulSoup(bs4)가 설치되어 있지 않습니다.")
+    matcher = get_resource("security_matcher")
+    soup = BeautifulSoup(html_content, 'html.parser')
+    details = []
+    for vuln_desc_div in soup.select('div.vuln-desc.criticals, div.vuln-desc.highs, div.vuln-desc.mediums'):
+        h2_tag = vuln_desc_div.find('h2')
+        if not h2_tag:
+            continue
+        block = [vuln_desc_div]
+        for sibling in vuln_desc_div.find_next_siblings():
+            if sibling.name == 'div' and 'vuln-desc' in sibling.get('class', []):
+                break
+            block.append(sibling)
+        block_soup = BeautifulSoup("".join(str(el) for el in block), 'html.parser')
+        h2_text = h2_tag.text.strip()
+        matched_row = matcher.match(re.sub(r'^\d+\.\s*', '', h2_text))
+        defect_summary, defect_description, variables = _defect_text(vuln_desc_div, block_soup, h2_text, matched_row)
+        vuln_detail_json = _detail_json(block_soup)
+        level_class = vuln_desc_div.get('class', [])
+        details.append({
+            "id": None, "test_env_os": "시험환경\n모든 OS",
+            "defect_summary": defect_summary,
+            "defect_level": 'H' if any(c in level_class for c in ['criticals', 'highs']) else 'M' if 'mediums' in level_class else '',
+            "frequency": "A", "quality_attribute": "보안성",
+            "defect_description": defect_description,
+            "invicti_report": h2_text,
+            "vuln_detail_json": vuln_detail_json,
+            "gpt_prompt": _gpt_prompt(vuln_detail_json),
+            "variables": variables,
+        })
+    return details
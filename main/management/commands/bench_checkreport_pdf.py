@@ -0,0 +1,86 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.views.review import report_pdf_parser as rpp
+
+
+def synthetic_report_pdf(n_pages=200, seed=0):
+    """
+    대형 시험결과서 PDF 생성 (PyMuPDF)
+    - 머리글: 왼쪽 제목 + 오른쪽 시험번호(같은 행), 바닥글: 왼쪽 양식번호 + 가운데 쪽번호
+    - 본문 줄 수는 페이지마다 다름(빈 페이지, 머리글/바닥글이 없는 페이지, 가로 페이지 포함)
+    """
+    import pymupdf
+
+    rnd = random.Random(seed)
+    doc = pymupdf.open()
+    for i in range(n_pages):
+        width, height = (842, 595) if i % 10 == 9 else (595, 842)
+        page = doc.new_page(width=width, height=height)
+        if i % 17 == 16:
+            continue  # 빈 페이지
+        if i % 7 != 3:
+            page.insert_text((56, 40), "시험결과서", fontname="korea", fontsize=9)
+            page.insert_text((width - 160, 40), "GS-A-25-0001", fontname="korea", fontsize=9)
+        for k in range(rnd.randint(0, int((height - 140) / 16))):
+            text = f"{i + 1}.{k + 1} 기능 시험 항목 {rnd.randint(1, 999)} 결과: {'통과' if k % 4 else '보완 필요'}"
+            page.insert_text((72, 80 + k * 16), text, fontname="korea", fontsize=10)
+        if i % 5 != 2:
+            page.insert_text((56, height - 24), "TTA-QP-601-04", fontname="korea", fontsize=8)
+            page.insert_text((width / 2 - 10, height - 24), f"- {i + 1} -", fontname="korea", fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000, result
+
+
+class Command(BaseCommand):
+    help = "시험결과서 PDF 머리글/바닥글 추출: pdfminer(전체 레이아웃) vs PyMuPDF(위/아래 띠) 소요 시간과 결과 일치 여부를 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", help=".pdf 경로 (없으면 합성 문서 사용)")
+        parser.add_argument("--pages", type=int, nargs="+", default=[50, 300], help="합성 문서 페이지 수")
+        parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수(중앙값 보고)")
+
+    def handle(self, *args, **options):
+        if rpp._pymupdf() is None:
+            raise CommandError("PyMuPDF(pymupdf)가 설치되어 있지 않습니다.")
+        repeat = max(1, options["repeat"])
+        if options["paths"]:
+            corpus = []
+            for path in options["paths"]:
+                try:
+                    with open(path, "rb") as f:
+                        corpus.append((path, f.read()))
+                except OSError as e:
+                    raise CommandError(f"문서를 열 수 없습니다: {path} ({e})")
+        else:
+            corpus = [(f"합성 문서({n}쪽)", synthetic_report_pdf(n)) for n in options["pages"]]
+
+        pool = rpp.get_resource("checkreport_parse_pool")
+        for name, data in corpus:
+            self.stdout.write(f"▶ {name}: {len(data) / 1024:.0f} KB")
+            base_ms, base = _median_ms(lambda: rpp.parse_pdf(data, engine="pdfminer"), 1)
+            n = base["total_pages"]
+            runs = [
+                ("pdfminer(extract_pages)", base_ms, base),
+                # 페이지 수와 관계없이 한 프로세스에서 전체 구간 처리 (_parse_pdf_pymupdf는 페이지가 많으면 공용 풀로 넘김)
+                ("PyMuPDF 순차", *_median_ms(lambda: rpp._result(rpp._scan_pages(data, 0, n)), repeat)),
+                (f"PyMuPDF 병렬({rpp.PARSE_WORKERS})", *_median_ms(lambda: rpp._parse_pdf_pymupdf(data, executor=pool), repeat)),
+            ]
+            for label, ms, result in runs:
+                same = sum(a == b for a, b in zip(result["pages"], base["pages"]))
+                self.stdout.write(
+                    f"  {label:<24} {ms:9.1f} ms   x{base_ms / ms:5.1f}   일치 {same}/{base['total_pages']}쪽"
+                )
@@ -0,0 +1,93 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# 워커 콜드스타트 = django.setup() + URLConf(모든 뷰 모듈) import
+_COLD_START_SNIPPET = (
+    "import os, importlib, django;"
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings');"
+    "django.setup();"
+    "from django.conf import settings;"
+    "importlib.import_module(settings.ROOT_URLCONF)"
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _run_once():
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _COLD_START_SNIPPET],
+        cwd=str(settings.BASE_DIR),
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    wall_ms = (time.perf_counter() - t0) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import 실패")
+
+    modules = []
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            self_us, cum_us, indent, name = m.groups()
+            modules.append({
+                "module": name,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cum_us) / 1000,
+                "depth": len(indent) // 2,
+            })
+    return wall_ms, modules
+
+
+class Command(BaseCommand):
+    help = "python -X importtime으로 워커 콜드스타트(import) 시간을 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수(중앙값 보고)")
+        parser.add_argument("--top", type=int, default=15, help="출력할 상위 모듈 수")
+        parser.add_argument("--json-out", type=str, default=None,
+                            help="결과를 JSON Lines로 누적 기록할 파일(추이 추적용)")
+
+    def handle(self, *args, **options):
+        runs = [_run_once() for _ in range(max(1, options["repeat"]))]
+        walls = [w for w, _ in runs]
+        wall_ms = statistics.median(walls)
+        # 모듈별 수치는 중앙값 실행의 것을 사용
+        _, modules = min(runs, key=lambda r: abs(r[0] - wall_ms))
+
+        import_total_ms = sum(m["cumulative_ms"] for m in modules if m["depth"] == 0)
+        self.stdout.write(f"▶ 콜드스타트 wall(중앙값 {len(walls)}회): {wall_ms:.1f} ms")
+        self.stdout.write(f"▶ import 합계(최상위 cumulative): {import_total_ms:.1f} ms")
+
+        top = sorted((m for m in modules if m["depth"] == 0),
+                     key=lambda m: -m["cumulative_ms"])[: options["top"]]
+        self.stdout.write("\n[최상위 import cumulative]")
+        for m in top:
+            self.stdout.write(f"  {m['cumulative_ms']:9.1f} ms  {m['module']}")
+
+        heavy_self = sorted(modules, key=lambda m: -m["self_ms"])[: options["top"]]
+        self.stdout.write("\n[self time 상위]")
+        for m in heavy_self:
+            self.stdout.write(f"  {m['self_ms']:9.1f} ms  {m['module']}")
+
+        if options["json_out"]:
+            record = {
+                "ts": datetime.now().isoformat(timespec="seconds"),
+                "python": sys.version.split()[0],
+                "wall_ms": round(wall_ms, 1),
+                "import_ms": round(import_total_ms, 1),
+                "top": [{"module": m["module"], "cumulative_ms": round(m["cumulative_ms"], 1)} for m in top],
+            }
+            with open(options["json_out"], "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.stdout.write(f"\n▶ 기록: {options['json_out']}")
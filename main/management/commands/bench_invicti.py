@@ -0,0 +1,228 @@
+import copy
+import gc
+import json
+import os
+import statistics
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+from lxml import html as lxml_html
+
+from main.views.testing import security_extractHTML as ex
+from main.views.testing.security_matcher import SecurityTemplateMatcher
+from . import _invicti_reference
+from .gen_invicti_corpus import DEFAULT_SIZES, generate_report
+
+# --check: BeautifulSoup 기준 구현과 비교하는 행 필드(스니펫 제외) (골든 파일과는 모든 필드 비교)
+CHECK_FIELDS = _invicti_reference.FIELDS
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class PeakMemory:
+    """
+    구간 최대 메모리 증가량(bytes)
+    - Linux: RSS를 5ms 간격으로 샘플링 (lxml/libxml2 할당까지 포함)
+    - 그 외: tracemalloc (파이썬 할당만)
+    """
+
+    def __enter__(self):
+        gc.collect()
+        self.peak = 0
+        self._base = _rss_bytes()
+        if self._base is None:
+            tracemalloc.start()
+            return self
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(0.005):
+            self.peak = max(self.peak, _rss_bytes() - self._base)
+
+    def __exit__(self, *exc):
+        if self._base is None:
+            self.peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        else:
+            self._stop.set()
+            self._thread.join()
+            self.peak = max(self.peak, _rss_bytes() - self._base)
+
+
+def _load_blocks(data):
+    """parse 단계: 문서 파싱 + 대상 등급 블록 수집"""
+    root = lxml_html.document_fromstring(data)
+    blocks = []
+    for desc in root.iter("div"):
+        if ex._is_vuln_desc(desc) and ex._TARGET_LEVELS & set(ex._classes(desc)):
+            blocks.append((desc, ex._collect_block(desc)))
+    return root, blocks
+
+
+def _match_templates(blocks, df):
+    """template match 단계: 제목 매칭 + VARIABLE_HANDLERS 변수 추출 (매칭기는 매번 새로 컴파일)"""
+    matcher = SecurityTemplateMatcher(df)
+    out = []
+    for desc, block in blocks:
+        h2 = next(desc.iterdescendants("h2"), None)
+        title = ex._text(h2).strip() if h2 is not None else ""
+        row = matcher.match(title.split(". ", 1)[-1])
+        variables = {}
+        if row is not None:
+            variables = ex.VARIABLE_HANDLERS.get(row["번호"], ex.get_variables_default)(block)
+        out.append({"title": title, "template": None if row is None else int(row["번호"]), **variables})
+    return out
+
+
+def _detail_json(blocks):
+    return [ex._extract_vuln_detail_as_json(block) for _desc, block in blocks]
+
+
+def _sanitize(blocks):
+    return [ex._sanitize_block_html(block) for _desc, block in blocks]
+
+
+def _json_size(obj):
+    return len(json.dumps(obj, ensure_ascii=False).encode("utf-8"))
+
+
+def _diff_rows(got, want, fields=None):
+    """행 목록 비교 → 불일치 설명 목록 (fields=None이면 기준 행의 모든 필드)"""
+    diffs = []
+    if len(got) != len(want):
+        diffs.append(f"행 수 {len(got)} ≠ 기준 {len(want)}")
+    for i, (g, w) in enumerate(zip(got, want), start=1):
+        for field in fields or w:
+            if g.get(field) != w.get(field):
+                diffs.append(f"#{i} {w.get('invicti_report', '')}: {field}")
+    return diffs
+
+
+class Command(BaseCommand):
+    help = "Invicti 파서 단계별(parse / template match / detail JSON / sanitize) 소요 시간, 최대 메모리, 출력 크기를 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", help="Invicti HTML 리포트 경로 (없으면 --sizes로 합성 리포트 생성)")
+        parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="합성 리포트 취약점 수")
+        parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수(중앙값 보고)")
+        parser.add_argument("--json-out", type=str, default=None,
+                            help="결과를 JSON Lines로 누적 기록할 파일(변경 전후 비교용)")
+        parser.add_argument("--check", action="store_true",
+                            help="파서 출력(invicti_report/vuln_detail_json)을 BeautifulSoup 기준 구현과 비교, 불일치 시 실패")
+        parser.add_argument("--golden", type=str, default=None,
+                            help="저장된 골든 JSON과 모든 행 필드를 비교, 불일치 시 실패")
+        parser.add_argument("--write-golden", type=str, default=None,
+                            help="현재 파서 출력을 골든 JSON으로 저장")
+
+    def _measure(self, fn, repeat):
+        times, peaks, result = [], [], None
+        for _ in range(repeat):
+            with PeakMemory() as mem:
+                t0 = time.perf_counter()
+                result = fn()
+                times.append(time.perf_counter() - t0)
+            peaks.append(mem.peak)
+        return result, statistics.median(times) * 1000, max(peaks)
+
+    def handle(self, *args, **options):
+        repeat = max(1, options["repeat"])
+        df = pd.read_excel("main/data/security.xlsx", sheet_name="Sheet1")
+        if options["check"] and _invicti_reference.BeautifulSoup is None:
+            raise CommandError("--check에는 BeautifulSoup(bs4)가 필요합니다.")
+        golden = None
+        if options["golden"]:
+            try:
+                with open(options["golden"], encoding="utf-8") as f:
+                    golden = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"골든 파일을 읽을 수 없습니다: {options['golden']} ({e})")
+
+        if options["paths"]:
+            corpus = []
+            for path in options["paths"]:
+                try:
+                    with open(path, "rb") as f:
+                        corpus.append((path, f.read()))
+                except OSError as e:
+                    raise CommandError(f"리포트를 열 수 없습니다: {path} ({e})")
+        else:
+            corpus = [(f"합성 {n}개", generate_report(n).encode("utf-8")) for n in options["sizes"]]
+
+        records, outputs, mismatches = [], {}, []
+        for name, data in corpus:
+            self.stdout.write(f"▶ {name}: 입력 {len(data) / 1024:.0f} KB")
+            stages = []
+
+            (_root, blocks), ms, peak = self._measure(lambda: _load_blocks(data), repeat)
+            stages.append(("parse", ms, peak, len(blocks), "블록"))
+
+            matched, ms, peak = self._measure(lambda: _match_templates(blocks, df), repeat)
+            stages.append(("template match", ms, peak, _json_size(matched), "B"))
+
+            details, ms, peak = self._measure(lambda: _detail_json(blocks), repeat)
+            stages.append(("detail JSON", ms, peak, _json_size(details), "B"))
+
+            # 정리는 노드를 제자리에서 바꾸므로 매 회 사본 사용(복사 시간은 제외)
+            times, peaks, snippets = [], [], []
+            for _ in range(repeat):
+                copies = [(desc, [copy.deepcopy(el) for el in block]) for desc, block in blocks]
+                with PeakMemory() as mem:
+                    t0 = time.perf_counter()
+                    snippets = _sanitize(copies)
+                    times.append(time.perf_counter() - t0)
+                peaks.append(mem.peak)
+            stages.append(("sanitize", statistics.median(times) * 1000, max(peaks), sum(len(s.encode("utf-8")) for s in snippets), "B"))
+            del _root, blocks, copies
+
+            parsed, ms, peak = self._measure(lambda: ex.extract_vulnerability_sections(data), repeat)
+            stages.append(("end-to-end (stream)", ms, peak, _json_size(parsed["rows"]), "B"))
+
+            rows = parsed["rows"]
+            outputs[name] = rows
+            checks = []
+            if options["check"]:
+                checks.append(("BeautifulSoup 기준", _diff_rows(rows, _invicti_reference.reference_details(data), CHECK_FIELDS)))
+            if golden is not None:
+                if name in golden:
+                    checks.append(("골든", _diff_rows(rows, golden[name])))
+                else:
+                    checks.append(("골든", ["골든 파일에 이 리포트가 없습니다"]))
+
+            for stage, ms, peak, size, unit in stages:
+                size_text = f"{size:,} {unit}" if unit != "B" else f"{size / 1024:,.0f} KB"
+                self.stdout.write(f"  {stage:<20} {ms:9.1f} ms   peak {peak / 2**20:7.1f} MB   출력 {size_text}")
+                records.append({"report": name, "input_bytes": len(data), "stage": stage,
+                                "ms": round(ms, 2), "peak_bytes": peak, "output": size, "unit": unit})
+            for label, diffs in checks:
+                if diffs:
+                    mismatches.append(name)
+                    self.stdout.write(self.style.ERROR(f"  ✗ {label}과 불일치 {len(diffs)}건"))
+                    for diff in diffs[:10]:
+                        self.stdout.write(f"      {diff}")
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"  ✓ {label}과 일치 ({len(rows)}행)"))
+
+        if options["json_out"]:
+            with open(options["json_out"], "a", encoding="utf-8") as f:
+                for rec in records:
+                    f.write(json.dumps({"ts": time.strftime("%Y-%m-%dT%H:%M:%S"), **rec}, ensure_ascii=False) + "\n")
+            self.stdout.write(f"기록: {options['json_out']}")
+
+        if options["write_golden"]:
+            with open(options["write_golden"], "w", encoding="utf-8") as f:
+                json.dump(outputs, f, ensure_ascii=False, indent=1)
+            self.stdout.write(f"골든 저장: {options['write_golden']}")
+        if mismatches:
+            raise CommandError(f"출력 불일치: {', '.join(dict.fromkeys(mismatches))}")
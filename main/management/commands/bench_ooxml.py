@@ -0,0 +1,160 @@
+import io
+import random
+import statistics
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.views.certy.prdinfo_parse_agreement import extract_process1_docx_basic
+from main.views.certy.prdinfo_parse_report import extract_process2_docx_overview
+from main.views.review.report_docx_parser import parse_docx as parse_review_docx
+from main.views.testing.similar_summary import parse_docx as parse_summary_docx
+from .bench_invicti import PeakMemory
+
+_NS_DECL = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:m="http://schemas.openxmlformats.org/officeDocument/2006/math" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+)
+
+
+def _r(text):
+    return f'<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
+
+
+def _p(*runs):
+    return "<w:p>" + "".join(runs) + "</w:p>"
+
+
+def _math(k):
+    # ∑_{i=1}^{n} (x_{i}) + (a)/(b)
+    return (
+        '<m:oMath><m:nary><m:naryPr><m:chr m:val="∑"/></m:naryPr>'
+        '<m:sub><m:r><m:t>i=1</m:t></m:r></m:sub><m:sup><m:r><m:t>n</m:t></m:r></m:sup>'
+        f'<m:e><m:sSub><m:e><m:r><m:t>x</m:t></m:r></m:e><m:sub><m:r><m:t>{k}</m:t></m:r></m:sub></m:sSub></m:e></m:nary>'
+        '<m:f><m:num><m:r><m:t>a</m:t></m:r></m:num><m:den><m:r><m:t>b</m:t></m:r></m:den></m:f></m:oMath>'
+    )
+
+
+def _alt_content(text):
+    # 도형 텍스트: Choice/Fallback에 같은 내용이 두 번 들어가는 형태
+    box = f'<w:txbxContent>{_p(_r(text))}</w:txbxContent>'
+    return (
+        f'<w:r><mc:AlternateContent><mc:Choice Requires="wps"><w:drawing>{box}</w:drawing></mc:Choice>'
+        f'<mc:Fallback><w:pict>{box}</w:pict></mc:Fallback></mc:AlternateContent></w:r>'
+    )
+
+
+def _tc(text, grid_span=1, vmerge=None, inner=""):
+    pr = ""
+    if grid_span > 1:
+        pr += f'<w:gridSpan w:val="{grid_span}"/>'
+    if vmerge == "restart":
+        pr += '<w:vMerge w:val="restart"/>'
+    elif vmerge == "continue":
+        pr += "<w:vMerge/>"
+    lines = text.split("\n")
+    runs = _r(lines[0]) + "".join(f"<w:r><w:br/><w:t>{escape(line)}</w:t></w:r>" for line in lines[1:])
+    return f"<w:tc><w:tcPr>{pr}</w:tcPr>{_p(runs)}{inner}</w:tc>"
+
+
+def _tbl(rows):
+    return "<w:tbl>" + "".join("<w:tr>" + "".join(cells) + "</w:tr>" for cells in rows) + "</w:tbl>"
+
+
+def _agreement_table():
+    rows = [
+        ["시험신청번호", "GS-A-25-0001"], ["국문명", "주식회사 예시"], ["영문명", "Example Inc."],
+        ["사업자등록번호", "123-45-67890"], ["대표자", "홍길동"], ["대표자 E-mail", "ceo@example.com"],
+        ["주        소", "서울특별시 중구"], ["담당자", "성   명"], ["성   명", "김담당"], ["E-mail", "qa@example.com"],
+        ["제품명 및 버전", "국문명: 예시 문서관리\n영문명: Example DMS"], ["제조자", "예시"], ["제조국가", "대한민국"],
+    ]
+    return _tbl([[_tc(a), _tc(b)] for a, b in rows])
+
+
+def synthetic_docx(n_sections=200, seed=0):
+    """
+    대형 DOCX 생성: 4개 파서가 쓰는 요소를 고르게 포함
+    - 합의서 라벨 표, 성적서 시험기간/개요/주요 기능, 목차
+    - 섹션마다: 라벨 문단, 수식 문단, 도형(AlternateContent) 문단, 병합(gridSpan/vMerge) + 중첩 표 + 소요일수 열이 있는 표
+    """
+    rnd = random.Random(seed)
+    body = [
+        _p(_r("시험성적서 및 시험결과서")),
+        _agreement_table(),
+        _tbl([[_tc("6. 시험기간 : 2025년 6월 23일 ~ 2025년 7월 4일")], [_tc("(재시험) 2025.07.10 ~ 2025.07.11")]]),
+        _p(_r("본 제품은 대용량 문서를 관리하는 통합 솔루션으로 주요 기능은 다음과 같다.")),
+        *(_p(_r(f"- 주요 기능 {i}: 문서 등록, 검색")) for i in range(1, 6)),
+        _p(_r("※ 상세기능은 별첨 참조")),
+        _p(_r("목 차")),
+        *(_p(_r(f"{i}. 시험 항목 {i} ..... {i + 2}")) for i in range(1, 6)),
+        _p(_r("7. 시험방법")),
+    ]
+    for s in range(n_sections):
+        body.append(_p(_r(f"{s + 1}.{rnd.randint(1, 3)} 시험 항목 {s}")))
+        body.append(_p(_r("산식: "), _math(s)))
+        body.append(_p(_r(f"본문 설명 {s} "), _alt_content(f"도형 {s}"), _r(" 이어지는 문장")))
+        rows = [[_tc("번호"), _tc("시험 항목", grid_span=2), _tc("소요일수")]]
+        for r in range(rnd.randint(5, 15)):
+            inner = _tbl([[_tc("중첩"), _tc(str(r))]]) if r == 2 else ""
+            vmerge = "restart" if r % 4 == 0 else "continue"
+            rows.append([
+                _tc(str(r + 1), vmerge=vmerge),
+                _tc(f"기능 {s}-{r}\n세부 {r}", inner=inner),
+                _tc(f"결과 {'통과' if r % 3 else '보완'}"),
+                _tc(str(r % 3 + 1)),
+            ])
+        body.append(_tbl(rows))
+    xml = f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:document {_NS_DECL}><w:body>{"".join(body)}<w:sectPr/></w:body></w:document>'
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("word/document.xml", xml)
+    return buf.getvalue()
+
+
+PARSERS = {
+    "합의서(prdinfo_parse_agreement)": lambda path, data: extract_process1_docx_basic(data, path),
+    "성적서(prdinfo_parse_report)": lambda path, data: extract_process2_docx_overview(data, path, enrich=False),
+    "검토 리포트(report_docx_parser)": lambda path, data: parse_review_docx(data),
+    "유사도 요약(similar_summary)": lambda path, data: parse_summary_docx(io.BytesIO(data)),
+}
+
+
+class Command(BaseCommand):
+    help = "DOCX 파서 4종(공통 OOXML 코어 사용)의 소요 시간/최대 메모리를 측정합니다. (경로가 없으면 대형 합성 문서 사용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", help=".docx 경로")
+        parser.add_argument("--sections", type=int, nargs="+", default=[200, 2000], help="합성 문서 섹션 수")
+        parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수(중앙값 보고)")
+
+    def handle(self, *args, **options):
+        repeat = max(1, options["repeat"])
+        if options["paths"]:
+            corpus = []
+            for path in options["paths"]:
+                try:
+                    with open(path, "rb") as f:
+                        corpus.append((path, f.read()))
+                except OSError as e:
+                    raise CommandError(f"문서를 열 수 없습니다: {path} ({e})")
+        else:
+            corpus = [(f"합성 문서(섹션 {n}개)", synthetic_docx(n)) for n in options["sections"]]
+
+        for name, data in corpus:
+            with zipfile.ZipFile(io.BytesIO(data)) as zf:
+                xml_size = zf.getinfo("word/document.xml").file_size
+            self.stdout.write(f"▶ {name}: {len(data) / 1024:.0f} KB (document.xml {xml_size / 2**20:.1f} MB)")
+            for parser_name, fn in PARSERS.items():
+                times, peaks = [], []
+                for _ in range(repeat):
+                    with PeakMemory() as mem:
+                        t0 = time.perf_counter()
+                        fn(name, data)
+                        times.append(time.perf_counter() - t0)
+                    peaks.append(mem.peak)
+                self.stdout.write(
+                    f"  {parser_name:<32} {statistics.median(times) * 1000:9.1f} ms   peak {max(peaks) / 2**20:7.1f} MB"
+                )
@@ -0,0 +1,104 @@
+import io
+import statistics
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.views.certy import prdinfo_parse_report as pr
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _p(text):
+    return f'<w:p><w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+
+def _tc(*lines):
+    paras = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r><w:r><w:br/><w:t>{escape(line)}</w:t></w:r></w:p>'
+        for line in lines
+    )
+    return f"<w:tc>{paras}</w:tc>"
+
+
+def _tbl(rows):
+    return "<w:tbl>" + "".join("<w:tr>" + "".join(cells) + "</w:tr>" for cells in rows) + "</w:tbl>"
+
+
+def synthetic_report_docx(n_tables=300, rows_per_table=20):
+    """
+    대형 '시험성적서 및 시험결과서' 형식 DOCX 생성
+    - 상단: 시험기간(날짜 라인), 개요 및 특성(설명/주요 기능), '7. 시험방법'
+    - 본문: 소요일수 열이 있는 표 n_tables개(일부는 셀 안에 중첩 표)
+    """
+    body = [
+        _p("시험성적서 및 시험결과서"),
+        _tbl([[_tc("6. 시험기간 : 2025년 6월 23일 ~ 2025년 7월 4일")], [_tc("(재시험) 2025.07.10 ~ 2025.07.11")]]),
+        _p("본 제품은 대용량 문서를 관리하고 검색하는 통합 문서관리 솔루션으로 주요 기능은 다음과 같다."),
+    ]
+    body += [_p(f"- 주요 기능 {i}: 문서 등록, 검색, 버전 관리") for i in range(1, 11)]
+    body.append(_p("※ 상세기능은 별첨 참조"))
+    body.append(_p("7. 시험방법"))
+    for t in range(n_tables):
+        rows = [[_tc("번호"), _tc("시험 항목"), _tc("세부 내용"), _tc("소요일수")]]
+        for r in range(rows_per_table):
+            detail = _tc(f"항목 {t}-{r} 상세 설명", "2025.06.30 수행")
+            if r == 0 and t % 10 == 0:
+                detail = f"<w:tc>{_tbl([[_tc('중첩'), _tc('소요 일수')], [_tc('a'), _tc('1')]])}<w:p/></w:tc>"
+            rows.append([_tc(str(r + 1)), _tc(f"기능 시험 {t}-{r}"), detail, _tc(str((r % 3) + 1))])
+        body.append(_tbl(rows))
+        body.append(_p(f"표 {t + 1} 끝"))
+    xml = f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:document xmlns:w="{_W_NS}"><w:body>{"".join(body)}</w:body></w:document>'
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("word/document.xml", xml)
+    return buf.getvalue()
+
+
+class Command(BaseCommand):
+    help = "성적서(prdinfo 결과보고서) 추출 단계별 소요 시간을 측정합니다. (경로가 없으면 대형 합성 성적서 사용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", help="성적서 .docx 경로")
+        parser.add_argument("--tables", type=int, default=300, help="합성 성적서의 표 개수")
+        parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수(중앙값 보고)")
+
+    def handle(self, *args, **options):
+        repeat = max(1, options["repeat"])
+        if options["paths"]:
+            corpus = []
+            for path in options["paths"]:
+                try:
+                    with open(path, "rb") as f:
+                        corpus.append((path, f.read()))
+                except OSError as e:
+                    raise CommandError(f"성적서를 열 수 없습니다: {path} ({e})")
+        else:
+            corpus = [(f"합성 성적서(표 {options['tables']}개)", synthetic_report_docx(options["tables"]))]
+
+        for name, byts in corpus:
+            self.stdout.write(f"▶ {name}: {len(byts) / 1024:.0f} KB")
+            doc = pr.ReportDocument.from_docx(byts)
+            stages = {
+                "문서 모델(스트리밍 파싱)": lambda: pr.ReportDocument.from_docx(byts),
+                "시험기간": lambda: pr._extract_period_lines(doc),
+                "개요 및 특성(설명)": lambda: pr._extract_description(doc),
+                "개요 및 특성(주요 기능)": lambda: pr._extract_features(doc),
+                "소요일수 합계": lambda: pr._sum_days(doc),
+                "합계(파싱~추출 4종)": lambda: (
+                    lambda d: (pr._extract_period_lines(d), pr._extract_description(d),
+                               pr._extract_features(d), pr._sum_days(d))
+                )(pr.ReportDocument.from_docx(byts)),
+            }
+            for stage, fn in stages.items():
+                times = []
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    fn()
+                    times.append(time.perf_counter() - t0)
+                self.stdout.write(f"  {stage:<20} {statistics.median(times) * 1000:9.1f} ms")
+            self.stdout.write(
+                f"  (본문 라인 {len(doc.lines)}개, 표 {len(doc.tables)}개, 소요일수 합계 {pr._sum_days(doc)})"
+            )
@@ -0,0 +1,82 @@
+import copy
+import statistics
+import time
+
+import bleach
+from bleach.css_sanitizer import CSSSanitizer
+from django.core.management.base import BaseCommand, CommandError
+from lxml import html as lxml_html
+
+from main.views.testing import security_extractHTML as ex
+
+
+def _load_blocks(path):
+    """리포트에서 대상 취약점 블록(노드 목록)과 감싸는 container 클래스 추출"""
+    with open(path, "rb") as f:
+        root = lxml_html.document_fromstring(f.read())
+    blocks = []
+    for desc in root.iter("div"):
+        if ex._is_vuln_desc(desc) and ex._TARGET_LEVELS & set(ex._classes(desc)):
+            blocks.append(ex._collect_block(desc))
+    container = next((el for el in root.iter("div") if "container-fluid" in ex._classes(el)), None)
+    parent_class = " ".join(ex._classes(container)) if container is not None else ""
+    return blocks, parent_class
+
+
+def _legacy_clean(raw_html):
+    # 변경 전: 블록마다 허용 목록/CSSSanitizer를 새로 만들고 bleach.clean 호출
+    css_sanitizer = CSSSanitizer(allowed_css_properties=list(ex.ALLOWED_CSS_PROPERTIES))
+    allowed_tags = set(bleach.sanitizer.ALLOWED_TAGS) | set(ex.ALLOWED_TAGS)
+    allowed_attrs = {'*': list(ex.ALLOWED_ATTRIBUTES)}
+    return bleach.clean(raw_html, tags=allowed_tags, attributes=allowed_attrs, css_sanitizer=css_sanitizer, strip=True)
+
+
+class Command(BaseCommand):
+    help = "Invicti 스니펫 정리(sanitize) 방식별 소요 시간을 측정합니다. (bleach.clean / 재사용 Cleaner / 트리 기반)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="Invicti HTML 리포트 경로")
+        parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수(중앙값 보고)")
+
+    def handle(self, *args, **options):
+        repeat = max(1, options["repeat"])
+        for path in options["paths"]:
+            try:
+                blocks, parent_class = _load_blocks(path)
+            except OSError as e:
+                raise CommandError(f"리포트를 열 수 없습니다: {path} ({e})")
+            raw_blocks = [
+                f'<div class="{parent_class}">' + "".join(ex._outer_html(el) for el in block) + "</div>"
+                for block in blocks
+            ]
+            self.stdout.write(f"▶ {path}: 블록 {len(blocks)}개, 원본 HTML {sum(map(len, raw_blocks)) / 1024:.0f} KB")
+
+            def bench_strings(fn):
+                times = []
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    out = [fn(raw) for raw in raw_blocks]
+                    times.append(time.perf_counter() - t0)
+                return statistics.median(times), sum(map(len, out))
+
+            def bench_tree():
+                times = []
+                for _ in range(repeat):
+                    # 트리 정리는 노드를 제자리에서 바꾸므로 매 회 사본 사용(복사 시간은 제외)
+                    copies = [[copy.deepcopy(el) for el in block] for block in blocks]
+                    t0 = time.perf_counter()
+                    out = [f'<div class="{parent_class}">{ex._sanitize_block_html(block)}</div>' for block in copies]
+                    times.append(time.perf_counter() - t0)
+                return statistics.median(times), sum(map(len, out))
+
+            results = [
+                ("bleach.clean (블록마다 새 설정)", *bench_strings(_legacy_clean)),
+                ("bleach.Cleaner 재사용", *bench_strings(ex._bleach_cleaner().clean)),
+                ("트리 기반 정리", *bench_tree()),
+            ]
+            base = results[0][1]
+            for name, sec, size in results:
+                per_block = sec * 1000 / max(1, len(blocks))
+                self.stdout.write(
+                    f"  {name:<28} {sec * 1000:9.1f} ms  ({per_block:6.2f} ms/블록, x{base / sec if sec else 0:5.1f}, 출력 {size / 1024:.0f} KB)"
+                )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from main.utils.eval_sw_classifier import evaluate_leave_one_out
+from main.views.certy.prdinfo_classify import TOP_K
+
+class Command(BaseCommand):
+    help = "로컬 SW분류 분류기를 sw_data leave-one-out으로 평가합니다(정확도/지연)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sample", type=int, default=2000, help="평가 샘플 수(0=전체)")
+        parser.add_argument("--k", type=int, default=TOP_K, help="투표 이웃 수")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"▶ leave-one-out (sample={options['sample']}, k={options['k']})")
+        evaluate_leave_one_out(sample=options["sample"], k=options["k"], seed=options["seed"])
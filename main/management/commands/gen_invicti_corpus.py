@@ -0,0 +1,137 @@
+import html
+import random
+from pathlib import Path
+
+import pandas as pd
+from django.core.management.base import BaseCommand
+
+from main.views.testing.security_extractHTML import (
+    VARIABLE_HANDLERS,
+    get_variables_for_out_of_date,
+    get_variables_for_urls,
+    get_variables_for_weak_ciphers,
+)
+
+DEFAULT_SIZES = (10, 100, 1000)
+DEFAULT_OUT_DIR = Path("main/data/bench/invicti")
+LEVELS = ("criticals", "highs", "mediums")
+
+# 템플릿에 없는 제목(매칭 실패 경로)
+UNMATCHED_TITLES = ["Missing X-Frame-Options Header", "Version Disclosure (Nginx)", "Internal Path Disclosure"]
+PRODUCTS = ["jQuery", "Apache", "OpenSSL", "Bootstrap", "Tomcat", "nginx"]
+PROTOCOLS = ["TLS 1.0", "TLS 1.1", "SSL 3.0"]
+
+
+def _template_items():
+    """(번호, 항목, 템플릿에 {o}(제목 괄호 값) 사용 여부)"""
+    df = pd.read_excel("main/data/security.xlsx", sheet_name="Sheet1")
+    return [
+        (int(row["번호"]), str(row["invicti 결함 리포트 항목"]).strip(),
+         "{o}" in f'{row["TTA 결함 리포트 결함 요약"]}{row["결함 내용"]}')
+        for _, row in df.iterrows()
+        if str(row["invicti 결함 리포트 항목"]).strip()
+    ]
+
+
+def _url_list(i, rnd):
+    return "".join(
+        f'<div class="vuln-url"><div>{i}.{k}. https://target.example.com/app/page{k}.do?id={rnd.randint(1, 999)} 확정됨</div></div>'
+        for k in range(1, rnd.randint(2, 6))
+    )
+
+
+def _version_lists(k):
+    return (
+        f'<h4>Overall Latest Version</h4><ul><li> 3.{k}.1 </li></ul>'
+        f'<h4>확인된 버전</h4><ul><li>1.{k}.0</li></ul>'
+    )
+
+
+def _weak_cipher_list(rnd):
+    ciphers = ["TLS_RSA_WITH_3DES_EDE_CBC_SHA", "TLS_RSA_WITH_RC4_128_SHA", "TLS_ECDHE_RSA_WITH_DES_CBC_SHA", "TLS_RSA_WITH_NULL_SHA"]
+    return "<ul>" + "".join(
+        f'<li data-description="지원되는 약한 암호 목록">{c}</li>' for c in rnd.sample(ciphers, rnd.randint(1, len(ciphers)))
+    ) + "</ul>"
+
+
+def _vuln(i, k, handler, rnd):
+    """개별 vuln(요청 1건) — 상세 표/코드/참고 링크/요청·응답 탭 + 정리 대상(inline style, svg, script, 주석)"""
+    extra = ""
+    if handler is get_variables_for_out_of_date:
+        extra = _version_lists(k)
+    elif handler is get_variables_for_weak_ciphers:
+        extra = _weak_cipher_list(rnd)
+    body_lines = "\n".join(f"<tr><td>line {n}</td><td>{'x' * rnd.randint(10, 80)}</td></tr>" for n in range(rnd.randint(5, 30)))
+    return f'''<div class="vuln">
+<a class="vuln-url-link" href="#v{i}-{k}">#{k}</a>{_url_list(i, rnd) if handler is get_variables_for_urls else ""}
+<div class="vuln-detail">
+<table class="table"><tr><th>메서드</th><th>매개변수</th><th>매개변수 형식</th><th>값</th></tr>
+<tr><td>GET</td><td>id</td><td>Querystring</td><td>&lt;script&gt;alert({k})&lt;/script&gt;</td></tr></table>
+<h3>Proof of Exploit</h3><pre class="cprompt">select * from users where id={k}</pre>
+{extra}
+<h4>참고</h4><ul><li><a href="https://www.example.org/ref/{i}/{k}">참고 자료</a></li></ul>
+<div class="vuln-tabs">
+<div class="vuln-tab vuln-req1-tab" id="req-{i}-{k}" role="tabpanel"><pre><code>GET /app/page{k}.do?id=1 HTTP/1.1
+Host: target.example.com
+Cookie: JSESSIONID={rnd.getrandbits(64):x}
+</code></pre></div>
+<div class="vuln-tab vuln-resp1-tab" id="resp-{i}-{k}" role="tabpanel"><pre>HTTP/1.1 200 OK
+Content-Type: text/html<span style="color: red; position: fixed; font-weight: bold">marker</span>
+<table>{body_lines}</table></pre></div>
+</div>
+<svg viewBox="0 0 16 16" width="16" height="16"><use xlink:href="#icon-link"></use></svg>
+<script>window.__report = {k};</script><!-- generated -->
+</div></div>'''
+
+
+def _block(i, level, title, handler, rnd):
+    vulns = "".join(_vuln(i, k, handler, rnd) for k in range(1, rnd.randint(2, 5)))
+    return f'''<div class="vuln-desc {level}" id="v{i}"><div class="vuln-desc-header"><h2>{i}. {html.escape(title)}</h2><span class="badge">{level}</span></div>
+<p>취약점 {i}에 대한 설명입니다. <b>공격자</b>는 이 취약점을 이용해 정보를 획득할 수 있습니다.</p><p>영향: 기밀성 저하</p></div>
+<div class="vulns" style="color: #333; position: absolute; margin: 0">{vulns}</div>
+'''
+
+
+def generate_report(n, seed=0):
+    """
+    취약점 n개짜리 Invicti 형식 HTML 리포트 생성 (같은 n/seed → 같은 결과)
+    - 등급: criticals/highs/mediums 순환, 제목: security.xlsx 항목 순환(+ 매칭 실패 제목 일부)
+    - VARIABLE_HANDLERS의 모든 핸들러 유형(버전/URL/약한 암호/기본)이 포함된다
+    """
+    rnd = random.Random(seed)
+    items = _template_items()
+    blocks = []
+    for i in range(1, n + 1):
+        if i % 10 == 0:
+            title, handler = UNMATCHED_TITLES[(i // 10) % len(UNMATCHED_TITLES)], None
+        else:
+            no, title, uses_o = items[(i - 1) % len(items)]
+            handler = VARIABLE_HANDLERS.get(no)
+            if uses_o:
+                value = rnd.choice(PRODUCTS if handler is get_variables_for_out_of_date else PROTOCOLS)
+                title = f"{title} ({value})"
+        blocks.append(_block(i, LEVELS[(i - 1) % len(LEVELS)], title, handler, rnd))
+    return f'''<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>Invicti Report</title>
+<style>body{{font-family:sans-serif;color:#222}} .vuln-desc{{margin:8px 0}} .vuln-tab{{display:none}}</style>
+<style>.criticals h2{{color:#b00}} .highs h2{{color:#d60}} .mediums h2{{color:#e90}}</style>
+</head><body><div class="container-fluid report-body">
+{"".join(blocks)}
+</div></body></html>'''
+
+
+class Command(BaseCommand):
+    help = "파서 벤치마크용 Invicti 형식 HTML 리포트를 생성합니다. (기본: 취약점 10/100/1000개)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="리포트별 취약점 수")
+        parser.add_argument("--out-dir", type=str, default=str(DEFAULT_OUT_DIR), help="출력 디렉터리")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        out_dir = Path(options["out_dir"])
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for n in options["sizes"]:
+            path = out_dir / f"invicti_{n}.html"
+            path.write_text(generate_report(n, options["seed"]), encoding="utf-8")
+            self.stdout.write(f"{path} ({path.stat().st_size / 1024:.0f} KB, 취약점 {n}개)")
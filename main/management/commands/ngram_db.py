@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from main.utils.ngram_to_faiss import build_ngram_table, OUT_NPZ
+
+class Command(BaseCommand):
+    help = "DB 제품설명으로 n-gram 키워드 테이블(ngram_table.npz)을 생성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("db_path", type=str, help="DB 파일 경로")
+        parser.add_argument("--out", type=str, default=OUT_NPZ, help="출력 npz 경로")
+        parser.add_argument("--workers", type=int, default=None, help="Kiwi 토큰화 프로세스 수(기본: CPU 수)")
+
+    def handle(self, *args, **options):
+        db_path = options["db_path"]
+        self.stdout.write(f"▶ DB 파일: {db_path}")
+        self.stdout.write(f"▶ 출력: {options['out']}")
+        build_ngram_table(db_path, out_path=options["out"], workers=options["workers"])
@@ -0,0 +1,203 @@
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+
+from main.views.certy.prdinfo_download import render_filled_xlsx
+from main.views.certy.prdinfo_fillmap import build_fill_map
+from main.views.certy.prdinfo_generate import _classify_files
+from main.views.certy.prdinfo_parse_agreement import extract_process1_docx_basic
+from main.views.certy.prdinfo_parse_defects import extract_process3_xlsx_defects
+from main.views.certy.prdinfo_parse_report import enrich_process2, extract_process2_docx_overview
+
+OUTPUT_NAME = "prdinfo_filled.xlsx"
+
+# (구분, 추출 함수, 소요시간 키) — 웹 화면(generate_prdinfo)과 같은 순서/키
+STAGES = (
+    ("합의서", extract_process1_docx_basic, "agreement_ms"),
+    ("성적서", extract_process2_docx_overview, "report_ms"),
+    ("결함리포트", extract_process3_xlsx_defects, "defects_ms"),
+)
+
+
+def find_groups(root: Path, exclude: Path = None):
+    """
+    폴더별로 합의서/성적서/결함리포트 묶음을 찾는다 (분류 규칙은 _classify_files와 동일)
+    → [(폴더 상대경로, [합의서], [성적서], [결함리포트])]
+    """
+    groups = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        here = Path(dirpath)
+        dirnames[:] = sorted(d for d in dirnames if exclude is None or (here / d).resolve() != exclude)
+        files = [here / name for name in sorted(filenames) if not name.startswith("~$")]  # 엑셀/워드 잠금 파일 제외
+        p1, p2, p3 = _classify_files(files)
+        if p1 or p2 or p3:
+            groups.append((here.relative_to(root), p1, p2, p3))
+    return groups
+
+
+def _write_atomic(path: Path, data: bytes):
+    # 중간에 끊겨도 '입력보다 새로운 출력'이 반쯤 쓴 파일이 되지 않게
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _init_worker():
+    # spawn 방식(macOS/Windows)의 자식 프로세스에서도 Django 설정을 사용
+    django.setup()
+
+
+def parse_group(inputs):
+    """
+    묶음 1개 파싱(작업 프로세스에서 실행) → {"parsed", "timings", "errors"}
+    SW분류/키워드(enrich_process2)는 여기서 하지 않는다: 워커마다 임베딩 모델·FAISS 인덱스를 올리지 않도록 부모 프로세스에서 실행
+    """
+    timings, errors, parsed = {}, [], {}
+    for (kind, fn, key), path in zip(STAGES, inputs):
+        if path is None:
+            continue
+        kwargs = {"enrich": False} if fn is extract_process2_docx_overview else {}
+        t0 = time.perf_counter()
+        try:
+            parsed[kind] = fn(Path(path).read_bytes(), Path(path).name, **kwargs)
+        except Exception as e:
+            errors.append(f"{Path(path).name}: {e}")
+        timings[key] = round((time.perf_counter() - t0) * 1000)
+    return {"parsed": parsed, "timings": timings, "errors": errors}
+
+
+def fill_group(parsed, out_path):
+    """build_fill_map → 템플릿 채우기 → 저장 (작업 프로세스에서 실행)"""
+    t0 = time.perf_counter()
+    errors = []
+    try:
+        fill_map = build_fill_map(parsed.get("합의서", {}), parsed.get("성적서", {}), parsed.get("결함리포트", {}))
+        _write_atomic(Path(out_path), render_filled_xlsx(fill_map))
+    except Exception as e:
+        errors.append(f"{OUTPUT_NAME}: {e}")
+    return {"timings": {"fill_ms": round((time.perf_counter() - t0) * 1000)}, "errors": errors}
+
+
+def _stage_result(future):
+    try:
+        return future.result()
+    except Exception as e:  # 작업 프로세스 자체가 죽은 경우 등
+        return {"timings": {}, "errors": [str(e)]}
+
+
+class Command(BaseCommand):
+    help = (
+        "폴더 트리에서 합의서/성적서/결함리포트 묶음을 찾아 prdinfo 엑셀을 일괄 생성합니다. "
+        "(출력이 입력보다 새로우면 건너뜀)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("input_dir", help="제출 파일 폴더(하위 폴더별로 묶음 인식)")
+        parser.add_argument("--out-dir", type=str, default=None,
+                            help=f"출력 폴더 (기본: 입력 폴더 안, 묶음 폴더 구조 그대로 {OUTPUT_NAME})")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                            help="파싱/템플릿 채우기 작업 프로세스 수 (워커는 문서 파서만 올려 프로세스당 수십~100MB). "
+                                 "SW분류/키워드는 부모 프로세스에서만 실행되어 임베딩 모델(bge-m3, 약 2GB)과 "
+                                 "FAISS 인덱스를 워커 수와 관계없이 한 번만 올린다")
+        parser.add_argument("--force", action="store_true", help="최신 출력도 다시 생성")
+        parser.add_argument("--no-enrich", action="store_true",
+                            help="SW분류/키워드 추출(GPT 포함) 생략 — 임베딩 모델·FAISS 인덱스를 올리지 않음")
+        parser.add_argument("--report", type=str, default=None, help="요약 보고서(JSON) 저장 경로")
+
+    def handle(self, *args, **options):
+        root = Path(options["input_dir"])
+        if not root.is_dir():
+            raise CommandError(f"입력 폴더가 없습니다: {root}")
+        out_root = Path(options["out_dir"]) if options["out_dir"] else root
+        exclude = out_root.resolve() if options["out_dir"] else None
+
+        jobs, results = [], []
+        for rel, p1, p2, p3 in find_groups(root, exclude):
+            inputs = [group[0] if group else None for group in (p1, p2, p3)]
+            out_path = out_root / rel / OUTPUT_NAME
+            record = {
+                "group": str(rel), "output": str(out_path),
+                "inputs": [str(p) for p in inputs if p is not None],
+                "ignored": [str(p) for group in (p1, p2, p3) for p in group[1:]],
+            }
+            newest_input = max(p.stat().st_mtime for p in inputs if p is not None)
+            if not options["force"] and out_path.exists() and out_path.stat().st_mtime >= newest_input:
+                results.append({**record, "status": "skipped", "timings": {}, "errors": []})
+                continue
+            jobs.append((record, [str(p) if p is not None else None for p in inputs], str(out_path)))
+
+        self.stdout.write(f"묶음 {len(jobs) + len(results)}개 (처리 {len(jobs)}, 최신이라 건너뜀 {len(results)})")
+        t_start = time.perf_counter()
+        if jobs:
+            workers = max(1, min(options["workers"], len(jobs)))
+            enrich = not options["no_enrich"]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                # 워커: 파싱 → 부모: SW분류/키워드(모델·인덱스 1벌) → 워커: 템플릿 채우기
+                # 입력 중 하나라도 실패하면 출력하지 않는다(다음 실행에서 다시 시도)
+                parsing = {pool.submit(parse_group, inputs): (record, out_path) for record, inputs, out_path in jobs}
+                filling = {}
+                pending = set(parsing)
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stage = _stage_result(future)
+                        if future in filling:
+                            result = filling.pop(future)
+                            result["timings"].update(stage["timings"])
+                            result["errors"].extend(stage["errors"])
+                            self._finish(result, results)
+                            continue
+                        record, out_path = parsing.pop(future)
+                        parsed = stage.pop("parsed", {})
+                        result = {**record, **stage, "gsNumber": parsed.get("합의서", {}).get("시험신청번호", "")}
+                        if result["errors"]:
+                            self._finish(result, results)
+                            continue
+                        if enrich and "성적서" in parsed:
+                            t0 = time.perf_counter()
+                            parsed["성적서"] = enrich_process2(parsed["성적서"])
+                            result["timings"]["classify_ms"] = round((time.perf_counter() - t0) * 1000)
+                        fill = pool.submit(fill_group, parsed, out_path)
+                        filling[fill] = result
+                        pending.add(fill)
+        elapsed = time.perf_counter() - t_start
+
+        results.sort(key=lambda r: r["group"])
+        counts = {s: sum(r["status"] == s for r in results) for s in ("ok", "skipped", "failed")}
+        self.stdout.write(
+            f"완료: 성공 {counts['ok']}, 건너뜀 {counts['skipped']}, 실패 {counts['failed']} ({elapsed:.1f}초)"
+        )
+        for r in results:
+            if r["status"] == "failed":
+                self.stdout.write(self.style.ERROR(f"  ✗ {r['group']}: {' / '.join(r['errors'])}"))
+
+        if options["report"]:
+            summary = {"ts": time.strftime("%Y-%m-%dT%H:%M:%S"), "elapsed_s": round(elapsed, 2), **counts, "groups": results}
+            with open(options["report"], "w", encoding="utf-8") as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+            self.stdout.write(f"보고서: {options['report']}")
+
+    def _finish(self, result, results):
+        result["status"] = "failed" if result["errors"] else "ok"
+        result["timings"]["total_ms"] = sum(result["timings"].values())
+        results.append(result)
+        self._print_result(result)
+
+    def _print_result(self, r):
+        t = r["timings"]
+        stages = "  ".join(f"{k[:-3]} {t[k]}ms" for k in ("agreement_ms", "report_ms", "defects_ms", "classify_ms", "fill_ms") if k in t)
+        mark = "✓" if r["status"] == "ok" else "✗"
+        self.stdout.write(f"  {mark} {r['group']:<30} {t.get('total_ms', 0):7d} ms   {stages}")
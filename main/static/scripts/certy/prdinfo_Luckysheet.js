@@ -7,33 +7,45 @@ document.addEventListener("DOMContentLoaded", async function () {
     console.error("Luckysheet 전역이 없습니다.", { luckysheet: window.luckysheet, Luckysheet: window.Luckysheet });
     return;
   }
-  if (!window.LuckyExcel) {
-    console.error("LuckyExcel이 로드되지 않았습니다.");
-    return;
-  }
-  if (!window.XLSX) {
-    console.error("SheetJS(XLSX)가 로드되지 않았습니다.");
-    return;
-  }
 
   let workbookInfo = { name: "Workbook", creator: "" };
 
-  // 서버 원본 XLSX → LuckyJSON → 렌더
-  try {
+  // 서버에서 미리 변환한 LuckyJSON (ETag 재검증 → 변경 없으면 304로 브라우저 캐시 사용)
+  async function fetchLuckyJson() {
+    const res = await fetch("/source-excel/lucky/", { credentials: "same-origin", cache: "no-cache" });
+    if (!res.ok) throw new Error("변환된 시트를 불러오지 못했습니다: " + res.status);
+    const json = await res.json();
+    if (!json || !Array.isArray(json.sheets)) throw new Error("변환 결과가 비어있습니다.");
+    return json;
+  }
+
+  // (대체 경로) 서버 원본 XLSX → 브라우저에서 LuckyExcel 변환
+  async function convertSourceExcel() {
+    if (!window.LuckyExcel) throw new Error("LuckyExcel이 로드되지 않았습니다.");
+    if (!window.XLSX) throw new Error("SheetJS(XLSX)가 로드되지 않았습니다.");
     const res = await fetch("/source-excel/", { credentials: "same-origin" });
     if (!res.ok) throw new Error("엑셀 파일을 불러오지 못했습니다: " + res.status);
     const blob = await res.blob();
     const file = new File([blob], "server.xlsx", {
       type: blob.type || "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
     });
-
-    const exportJson = await new Promise((resolve, reject) => {
+    return new Promise((resolve, reject) => {
       window.LuckyExcel.transformExcelToLucky(
         file,
         (json) => (json && Array.isArray(json.sheets) ? resolve(json) : reject(new Error("변환 결과가 비어있습니다."))),
         (err) => reject(err)
       );
     });
+  }
+
+  try {
+    let exportJson;
+    try {
+      exportJson = await fetchLuckyJson();
+    } catch (e) {
+      console.warn("서버 변환 시트 사용 불가, 원본 XLSX를 직접 변환합니다:", e);
+      exportJson = await convertSourceExcel();
+    }
 
     workbookInfo = {
       name: (exportJson.info && exportJson.info.name) || "Workbook",
@@ -84,6 +84,19 @@ document.addEventListener('DOMContentLoaded', function () {
     return { [sheetName]: fillData };
   }
 
+  // 서버(로컬 분류기)가 추천한 SW분류를 드롭다운에 반영 — 사용자가 직접 고른 경우는 유지
+  const swSelect = document.getElementById('swClassification');
+  swSelect?.addEventListener('change', () => { swSelect.dataset.touched = '1'; });
+
+  function applySuggestedSwClassification(list2) {
+    if (!swSelect || swSelect.dataset.touched === '1') return;
+    const obj2 = (list2 || []).find(x => x && typeof x === 'object') || {};
+    const suggested = obj2['SW분류'];
+    if (!suggested) return;
+    const exists = Array.from(swSelect.options).some(o => o.value === suggested);
+    if (exists) swSelect.value = suggested;
+  }
+
   async function doGenerate() {
     const files = Array.from(fileInput?.files || []);
     if (files.length !== 3) {
@@ -132,11 +145,13 @@ document.addEventListener('DOMContentLoaded', function () {
       console.log('[DEBUG] list2:', data.list2);
       console.log('[DEBUG] list3:', data.list3);
       console.log('[DEBUG] fillMap from Server:', data.fillMap);
+      console.log('[DEBUG] timings(ms):', data.timings);
 
       if (!data || !data.fillMap) {
         throw new Error('서버 응답에 fillMap이 없습니다.');
       }
       
+      applySuggestedSwClassification(data.list2);
       const preInputFillMap = getPreInputData();
       console.log('[DEBUG] fillMap from Pre-Input:', preInputFillMap);
 
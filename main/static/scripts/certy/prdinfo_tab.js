@@ -75,10 +75,41 @@ document.addEventListener('DOMContentLoaded', function () {
   reCertSelect.addEventListener('change', updateReCertVisibility);
   updateReCertVisibility(); // 초기 상태 반영
 
-  // '조회' 버튼 클릭 이벤트
+  // 조회 결과 캐시(번호 → 결과 | null): 탭 전환/재조회 시 다시 요청하지 않음
+  const certInfoCache = new Map();
+
+  // 캐시에 없는 번호만 모아 배치 엔드포인트로 1번 요청
+  function lookupCertInfos(certNos) {
+    const pending = certNos.filter(no => !certInfoCache.has(no));
+    if (!pending.length) return Promise.resolve();
+    const params = new URLSearchParams();
+    pending.forEach(no => params.append('cert_no', no));
+    return fetch(`/lookup_cert_info/batch/?${params}`)
+      .then(response => {
+        if (!response.ok) {
+          return response.json().catch(() => ({})).then(body => {
+            throw new Error(body.message || `HTTP error! status: ${response.status}`);
+          });
+        }
+        return response.json();
+      })
+      .then(result => {
+        pending.forEach(no => certInfoCache.set(no, result.data[no] || null));
+      });
+  }
+
+  function formatCertInfo(data) {
+    return `- 기 인증번호: ${data.cert_id}\n` +
+      `- 기 인증 제품명 및 버전: ${data.product_name}\n` +
+      `- 기 인증 제품 WD: ${data.total_wd}`;
+  }
+
+  // '조회' 버튼 클릭 이벤트 (쉼표/공백으로 여러 번호 입력 가능)
   btnLookupCert.addEventListener('click', function() {
-    const certNo = reCertNumberInput.value.trim().toUpperCase();
-    if (!certNo) {
+    const certNos = [...new Set(
+      reCertNumberInput.value.toUpperCase().split(/[\s,;]+/).filter(Boolean)
+    )];
+    if (!certNos.length) {
       alert('기존 인증 제품 번호를 입력하세요.');
       return;
     }
@@ -87,25 +118,21 @@ document.addEventListener('DOMContentLoaded', function () {
     btnLookupCert.disabled = true;
     reCertResultText.classList.add('hidden-section'); // 조회 시작 시 결과 칸 숨김
 
-    fetch(`/lookup_cert_info/?cert_no=${encodeURIComponent(certNo)}`)
-      .then(response => {
-        if (!response.ok) {
-          throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        return response.json();
-      })
-      .then(result => {
-        if (result.success) {
-          const data = result.data;
-          reCertResultText.value =
-            `- 기 인증번호: ${data.cert_id}\n` +
-            `- 기 인증 제품명 및 버전: ${data.product_name}\n` +
-            `- 기 인증 제품 WD: ${data.total_wd}`;
+    lookupCertInfos(certNos)
+      .then(() => {
+        const found = certNos.filter(no => certInfoCache.get(no));
+        const missing = certNos.filter(no => !certInfoCache.get(no));
+        if (found.length) {
+          reCertResultText.value = found.length === 1
+            ? formatCertInfo(certInfoCache.get(found[0]))
+            : found.map(no => `[${no}]\n${formatCertInfo(certInfoCache.get(no))}`).join('\n');
           reCertResultText.classList.remove('hidden-section');
         } else {
-          alert(result.message || '데이터를 조회하지 못했습니다.');
           reCertResultText.value = '';
         }
+        if (missing.length) {
+          alert(`해당 번호의 제품을 찾을 수 없습니다: ${missing.join(', ')}`);
+        }
       })
       .catch(error => {
         console.error('Fetch Error:', error);
@@ -140,7 +140,12 @@
       return;
     }
 
-    // 2) 프롬프트 유효성 검사
+    // 2) 프롬프트는 요약 응답에 없으므로 서버 세션에서 가져온 뒤 유효성 검사
+    try {
+      if (AppNS.loadRowDetail) await AppNS.loadRowDetail(row, ["gpt_prompt"]);
+    } catch (error) {
+      console.error("프롬프트 로드 실패:", error);
+    }
     if (!row.gpt_prompt) {
       const html = buildGptMessageHTML({
         title: "오류",
@@ -167,26 +172,38 @@
     displayContent(loading);
     openModal();
 
-    // 4) 백엔드 호출
+    // 4) 백엔드 호출 (SSE 스트리밍: 조각이 도착하는 대로 표시)
     try {
-      const response = await fetch("/security/gpt/recommend/", {
+      const response = await fetch("/security/gpt/recommend/stream/", {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
+        headers: { "Content-Type": "application/json", Accept: "text/event-stream" },
         body: JSON.stringify({ prompt: row.gpt_prompt }),
       });
 
-      const result = await response.json();
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
+        const result = await response.json().catch(() => ({}));
         throw new Error(result.error || `서버에서 오류가 발생했습니다: ${response.status}`);
       }
 
-      // 5) 성공: 캐시 + 표시
-      row.gpt_response = result.response;
-      const success = buildGptMessageHTML({
-        title: "🤖 GPT 추천 수정 방안",
-        bodyHTML: `<pre class="whitespace-pre-wrap">${result.response}</pre>`,
+      displayContent(buildGptMessageHTML({
+        title: "🤖 GPT 추천 수정 방안 (생성 중...)",
+        bodyHTML: `<pre class="whitespace-pre-wrap"></pre>`,
+      }));
+      const pre = host.querySelector(".gpt-body pre");
+      const titleEl = host.querySelector(".gpt-title");
+
+      const text = await readGptStream(response, (delta) => {
+        // 모달이 닫히면(host 비워짐) 읽기를 중단 → 서버가 업스트림 요청을 취소
+        if (!pre.isConnected) return false;
+        pre.textContent += delta;
+        return true;
       });
-      displayContent(success);
+
+      // 5) 성공: 캐시 + 표시
+      if (text !== null) {
+        row.gpt_response = text;
+        if (titleEl) titleEl.textContent = "🤖 GPT 추천 수정 방안";
+      }
     } catch (error) {
       // 6) 실패 표시
       console.error("GPT 요청 실패:", error);
@@ -199,6 +216,121 @@
     }
   }
 
+  /**
+   * text/event-stream 응답을 읽어 delta 이벤트마다 onDelta(text) 호출.
+   * onDelta가 false를 반환하면 스트림을 취소하고 null 반환, 정상 종료 시 전체 텍스트 반환.
+   */
+  async function readGptStream(response, onDelta) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "", full = "";
+
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let sep;
+      while ((sep = buffer.indexOf("\n\n")) >= 0) {
+        const block = buffer.slice(0, sep);
+        buffer = buffer.slice(sep + 2);
+        let event = "message", data = "";
+        block.split("\n").forEach((line) => {
+          if (line.startsWith("event:")) event = line.slice(6).trim();
+          else if (line.startsWith("data:")) data += line.slice(5).trim();
+        });
+        const payload = data ? JSON.parse(data) : {};
+
+        if (event === "delta") {
+          full += payload.text || "";
+          if (onDelta(payload.text || "") === false) {
+            await reader.cancel();
+            return null;
+          }
+        } else if (event === "error") {
+          await reader.cancel();
+          throw new Error(payload.error || "GPT 응답 생성 중 오류가 발생했습니다.");
+        } else if (event === "done") {
+          await reader.cancel();
+          return full;
+        }
+      }
+    }
+    return full;
+  }
+
+  /**
+   * 현재 파싱 세션의 모든 행에 대해 GPT 추천을 한 번에 받아 row.gpt_response에 채운다.
+   * 서버가 취약점 유형별로 묶어 동시 요청하고, 완료되는 순서대로 결과를 보낸다.
+   */
+  function runBatch() {
+    const state = AppNS.state || {};
+    const rows = (state.currentData || []).filter((r) => r.parse_session);
+    const btn = document.getElementById("gptBatchBtn");
+    if (!rows.length) {
+      alert("추천할 데이터가 없습니다. 먼저 HTML 파일을 업로드/분석하세요.");
+      return;
+    }
+    if (btn && btn.disabled) return;
+
+    const label = btn ? btn.textContent : "";
+    const setLabel = (text) => { if (btn) btn.textContent = text; };
+    if (btn) btn.disabled = true;
+
+    const session = rows[0].parse_session;
+    const byNo = new Map(rows.filter((r) => r.parse_session === session).map((r) => [r.detail_no, r]));
+    const scheme = location.protocol === "https:" ? "wss" : "ws";
+    const ws = new WebSocket(`${scheme}://${location.host}/ws/security/gpt/batch/`);
+    let total = 0, done = 0, failed = 0;
+
+    const finish = (message) => {
+      try { ws.close(); } catch (e) {}
+      if (btn) btn.disabled = false;
+      setLabel(label);
+      if (message) alert(message);
+    };
+
+    ws.onopen = () => {
+      setLabel("GPT 일괄 추천 준비 중...");
+      ws.send(JSON.stringify({ session }));
+    };
+
+    ws.onmessage = (e) => {
+      let msg;
+      try { msg = JSON.parse(e.data); } catch { return; }
+      if (msg.status === "start") {
+        total = msg.requests;
+        setLabel(`GPT 일괄 추천 0/${total}`);
+      } else if (msg.status === "result" || msg.status === "item_error") {
+        done += 1;
+        if (msg.status === "result") {
+          (msg.rows || []).forEach((no) => {
+            const row = byNo.get(no);
+            if (row) row.gpt_response = msg.response;
+          });
+        } else {
+          failed += 1;
+          console.error("GPT 일괄 추천 실패:", msg.vuln_type, msg.message);
+        }
+        setLabel(`GPT 일괄 추천 ${done}/${total}`);
+      } else if (msg.status === "done") {
+        console.log(`[GPT batch] ${total}건 ${msg.elapsed_ms} ms`);
+        finish(failed ? `${total}건 중 ${failed}건이 실패했습니다. 해당 행은 개별로 다시 요청하세요.` : "");
+      } else if (msg.status === "error") {
+        finish(msg.message || "GPT 일괄 추천 중 오류가 발생했습니다.");
+      }
+    };
+
+    ws.onerror = () => finish("GPT 일괄 추천 연결에 실패했습니다.");
+    ws.onclose = () => { if (btn && btn.disabled) finish(""); };
+  }
+
   AppNS.gpt.getGptRecommendation = getGptRecommendation;
+  AppNS.gpt.runBatch = runBatch;
+
+  document.addEventListener("DOMContentLoaded", () => {
+    const btn = document.getElementById("gptBatchBtn");
+    if (btn) btn.addEventListener("click", runBatch);
+  });
 
 })(window, document);
@@ -217,7 +217,7 @@ ${bodyHtml}
   }
 
   // ========= 공개 API: 테이블의 "Invicti 분석" 버튼에서 호출 =========
-  App.popup.showInvictiAnalysis = function (rowId) {
+  App.popup.showInvictiAnalysis = async function (rowId) {
     ensureModal();
 
     // rows는 /security/invicti/parse/ 응답을 사용(이미 별도 스크립트에서 setData/주입) :contentReference[oaicite:3]{index=3}
@@ -225,6 +225,15 @@ ${bodyHtml}
     const row  = rows.find((r) => r.id === rowId);
     if (!row) { alert("행 데이터를 찾을 수 없습니다."); return; }
 
+    // 스니펫 HTML은 요약 응답에 없으므로 처음 열 때 서버에서 가져온다
+    try {
+      if (App.loadRowDetail) await App.loadRowDetail(row, ["invicti_analysis"]);
+    } catch (err) {
+      console.error("상세 정보 로드 실패:", err);
+      alert(err.message || "상세 정보를 불러오지 못했습니다.");
+      return;
+    }
+
     // 팝업 동안 전역 원본 CSS 비활성화(누수 방지)
     disableGlobalInvictiStyle();
 
@@ -287,6 +296,14 @@ ${bodyHtml}
         return;
       }
 
+      // 아직 받지 않은 스니펫은 동시 6개씩 가져온다
+      if (App.loadRowDetail) {
+        const pending = rows.filter((r) => r.invicti_analysis === undefined);
+        for (let i = 0; i < pending.length; i += 6) {
+          await Promise.all(pending.slice(i, i + 6).map((r) => App.loadRowDetail(r, ["invicti_analysis"])));
+        }
+      }
+
       const zip = new JSZip();
       const folder = zip.folder("invicti_html") || zip;
 
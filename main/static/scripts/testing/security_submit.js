@@ -90,6 +90,78 @@
     styleTag.textContent = css;
   }
   
+  // NDJSON 스트림을 읽어 {css, rows, files, error} 형태로 모은다 (읽는 동안 표를 주기적으로 갱신)
+  // 파일은 끝나는 순서대로 도착하므로 행/파일 정보는 파일 순번(업로드 순서)별로 모아 이어 붙인다
+  async function readParseStream(res) {
+    const out = { css_url: "", rows: [], files: [], error: null };
+    const rowsByFile = [];
+    const filesByIndex = [];
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder("utf-8");
+    let buffer = "";
+    let lastRender = 0;
+
+    const handleLine = (line) => {
+      if (!line.trim()) return;
+      const msg = JSON.parse(line);
+      if (msg.type === "css") {
+        out.css_url = msg.css_url;
+        loadReportCss(msg.css_url).catch((e) => console.warn("CSS 로드 실패:", e));
+      } else if (msg.type === "row") {
+        if (!msg.row.id) msg.row.id = App.generateId();
+        const i = msg.file || 0;
+        (rowsByFile[i] = rowsByFile[i] || []).push(msg.row);
+      } else if (msg.type === "file") {
+        filesByIndex[msg.file || 0] = { name: msg.name, rows: msg.rows, duration_ms: msg.duration_ms };
+      } else if (msg.type === "error") {
+        out.error = msg.error;
+      }
+    };
+
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split("\n");
+      buffer = lines.pop();
+      lines.forEach(handleLine);
+
+      const now = Date.now();
+      if (rowsByFile.length && now - lastRender > 300) {
+        lastRender = now;
+        App.setData(rowsByFile.flat());
+      }
+    }
+    handleLine(buffer + decoder.decode());
+    out.rows = rowsByFile.flat();
+    out.files = filesByIndex.filter(Boolean);
+    return out;
+  }
+
+  // 행 상세(스니펫/상세 JSON/GPT 프롬프트)는 팝업을 열 때 서버 세션에서 가져와 행에 캐시
+  App.loadRowDetail = async function (row, fields) {
+    const missing = (fields || ["invicti_analysis", "vuln_detail_json", "gpt_prompt"]).filter((f) => row[f] === undefined);
+    if (!missing.length || !row.parse_session || row.detail_no === undefined) return row;
+    const url = `/security/invicti/detail/${row.parse_session}/${row.detail_no}/?fields=${missing.join(",")}`;
+    const res = await fetch(url, { headers: { "X-Requested-With": "XMLHttpRequest" } });
+    const json = await res.json();
+    if (!res.ok) throw new Error(json.error || `서버 오류 (${res.status})`);
+    missing.forEach((f) => { row[f] = json[f]; });
+    return row;
+  };
+
+  // 리포트 CSS는 내용 해시 URL로 받는다 → 같은 CSS면 브라우저 캐시에서 바로 로드
+  async function loadReportCss(url) {
+    if (!url) return;
+    App.state = App.state || {};
+    if (App.state.reportCssUrl === url && App.state.reportCss) return injectStyles(App.state.reportCss);
+    const res = await fetch(url);
+    if (!res.ok) return;
+    App.state.reportCss = await res.text();
+    App.state.reportCssUrl = url;
+    injectStyles(App.state.reportCss);
+  }
+
   async function requestInvictiParse(files) {
     const fd = new FormData();
     files.forEach((f) => fd.append("file", f, f.name));
@@ -104,27 +176,34 @@
     try {
       const res = await fetch(API_ENDPOINT, {
         method: "POST",
-        headers: { "X-CSRFToken": csrf, "X-Requested-With": "XMLHttpRequest" },
+        headers: {
+          "X-CSRFToken": csrf,
+          "X-Requested-With": "XMLHttpRequest",
+          "Accept": "application/x-ndjson, application/json",
+        },
         body: fd,
       });
       if (!res.ok) throw new Error(`서버 오류 (${res.status})`);
-      
-      const json = await res.json();
-      
+
+      // 증분 응답(NDJSON): 행이 도착하는 대로 표에 반영
+      const isStream = (res.headers.get("Content-Type") || "").includes("application/x-ndjson");
+      const json = isStream ? await readParseStream(res) : await res.json();
+
       if (json.error) { App.clearData(); return App.showError(json.error); }
       const rows = Array.isArray(json?.rows) ? json.rows : [];
       if (!rows.length) { App.clearData(); return App.showError("추출 가능한 결함 항목이 없습니다."); }
-      
-      if (json.css) {
-        App.state = App.state || {};
-        App.state.reportCss = json.css;
-        injectStyles(json.css);
+
+      if (json.css_url && !isStream) {
+        await loadReportCss(json.css_url).catch((e) => console.warn("CSS 로드 실패:", e));
       }
       App.state.firstVulnDetailJson = json.first_vuln_detail_json || null;
 
+      // 파일별 파싱 시간 (느린 리포트 확인용)
+      if (Array.isArray(json.files) && json.files.length) console.table(json.files);
+
       rows.forEach((r) => { if (!r.id) r.id = App.generateId(); });
       App.setData(rows);
-      
+
       App.showSuccess(`총 ${rows.length}개 항목을 반영했습니다.`);
     } catch (err) {
       console.error(err);
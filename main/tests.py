@@ -1,3 +1,403 @@
-from django.test import TestCase
+import json
+import os
+import re
+import unittest
+import zipfile
+from io import BytesIO
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import pandas as pd
+from django.test import SimpleTestCase
+
+from main.management.commands import _invicti_reference
+from main.management.commands.gen_invicti_corpus import generate_report
+from main.utils import resources
+from main.views.review import checkreport_GPT, report_pdf_parser
+from main.views.testing import security_extractHTML
+from main.views.testing.security_matcher import SecurityTemplateMatcher, SIMILARITY_THRESHOLD
+
+try:
+    from fuzzywuzzy import fuzz as fw_fuzz
+except ImportError:
+    fw_fuzz = None
+
+
+# Invicti 리포트에서 실제로 나오는 형태의 제목들(번호 접두어 제거 후)
+INVICTI_TITLES = [
+    "오래된 버전 (jQuery)", "Out-of-date Version (Apache)", "Out‐of‐date Version (OpenSSL)",
+    "SSL Untrusted Root Certificate", "비밀번호가 HTTP를 통해 전송됩니다.", "HTTPS 미사용",
+    "Session Cookie Not Marked as Secure", "Cookie Not Marked as HttpOnly",
+    "HTTP 엄격한 전송 보안 (HSTS) 정책이 비활성화 되었습니다", "HSTS 정책 미사용",
+    "스택 추적 공개 (Java)", "스택 추적 공개 (ASP.NET)", "크로스 사이트 스크립팅",
+    "[가능] 크로스 사이트 스크립팅", "약한 암호가 사용되었습니다.", "약한 암호 사용",
+    "비밀번호가 쿼리 문자열을 통해 전송됩니다", "크로스 사이트 요청 변조", "크로스 사이트 요청 변조 CSRF",
+    "프레임 인젝션", "SSL/TLS Not Implemented", "부울 기반 SQL 인젝션", "블라인드 SQL 인젝션",
+    "SQL 인젝션", "블라인드 커맨드 인젝션", "HTTPS 상의 혼합 콘텐츠", "쿠키가 HttpOnly가 아닙니다",
+    "데이터베이스 권한 제한 오류", "약한 서명 알고리즘이 지원됩니다.", "안전하지 않은 HTTP 사용",
+    "Open 리디렉션", "오픈 리디렉션", "SSL Certificate Name Hostname Mismatch",
+    "안전하지 않은 Transportation Security Protocol Supported (TLS 1.0)",
+    "Insecure Transportation Security Protocol Supported (TLS 1.1)",
+    "LFI(Local File Inclusion)", "Local File Inclusion",
+    "Sensitive Data Exposure - JDBC Database Connection String", "RegreSSHion Attack",
+    "Missing X-Frame-Options Header", "Version Disclosure (Nginx)", "[Possible] Cross-site Scripting",
+    "Boolean Based SQL Injection", "Blind SQL Injection", "Weak Ciphers Enabled",
+    "", "   ", "!!!", "é à ü", "버전", "SQL", "HTTP", "쿠키",
+]
+
+
+def _fuzzywuzzy_loop(df, title):
+    """변경 전 extract_vulnerability_sections의 iterrows + fuzzywuzzy 매칭(기준 구현)"""
+    best_score, best_row = 0, None
+    for _, row in df.iterrows():
+        item = str(row['invicti 결함 리포트 항목']).strip()
+        if not item:
+            continue
+        score = fw_fuzz.token_set_ratio(title, item)
+        if score > best_score:
+            best_score, best_row = score, row
+    if best_score >= SIMILARITY_THRESHOLD:
+        return int(best_row['번호'])
+    return None
+
+
+class SecurityTemplateMatcherTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.df = pd.read_excel("main/data/security.xlsx", sheet_name="Sheet1")
+        cls.matcher = SecurityTemplateMatcher(cls.df)
+
+    def _matched_no(self, title):
+        row = self.matcher.match(title)
+        return None if row is None else int(row['번호'])
+
+    def test_template_items_match_themselves(self):
+        for item in self.df['invicti 결함 리포트 항목']:
+            row = self.matcher.match(item)
+            self.assertIsNotNone(row, item)
+
+    def test_memoized_result_is_stable(self):
+        title = "Out-of-date Version (Apache)"
+        self.assertEqual(self._matched_no(title), self._matched_no(title))
+        self.assertIn(title, self.matcher._memo)
+
+    def test_empty_sheet_never_matches(self):
+        matcher = SecurityTemplateMatcher(pd.DataFrame())
+        self.assertIsNone(matcher.match("크로스 사이트 스크립팅"))
+
+    @unittest.skipIf(fw_fuzz is None, "fuzzywuzzy 미설치")
+    def test_parity_with_fuzzywuzzy_loop(self):
+        titles = INVICTI_TITLES + [str(x) for x in self.df['invicti 결함 리포트 항목']]
+        for title in titles:
+            with self.subTest(title=title):
+                self.assertEqual(self._matched_no(title), _fuzzywuzzy_loop(self.df, title))
+
+
+@unittest.skipIf(_invicti_reference.BeautifulSoup is None, "bs4 미설치")
+class InvictiDetailParityTests(SimpleTestCase):
+    """security_extractHTML: lxml 스트리밍 파서의 결과 행(스니펫 제외)과 BeautifulSoup 기준 구현 비교"""
+
+    def _assert_parity(self, html_content):
+        rows = security_extractHTML.extract_vulnerability_sections(html_content)["rows"]
+        expected = _invicti_reference.reference_details(html_content)
+        self.assertEqual(len(rows), len(expected))
+        for row, want in zip(rows, expected):
+            with self.subTest(title=want["invicti_report"]):
+                for field in _invicti_reference.FIELDS:
+                    self.assertEqual(row[field], want[field], field)
+        return expected
+
+    def test_generated_corpus(self):
+        variables = set()
+        for n in (12, 60):
+            expected = self._assert_parity(generate_report(n, seed=n))
+            variables.update(key for want in expected for key, value in want["variables"].items() if value)
+        # 템플릿 변수 핸들러(버전/URL/약한 암호)가 모두 결함 요약·내용 비교에 쓰였는지
+        self.assertEqual(variables, {"o", "url", "weak", "v1", "v2"})
+
+    def test_table_inside_response_pre(self):
+        # libxml2는 <pre> 안의 <table>에서 pre를 닫는다 → 표와 뒤 텍스트도 응답에 남아야 한다
+        html_content = (
+            '<html><body><div class="container-fluid">'
+            '<div class="vuln-desc highs"><h2>1. SQL 인젝션</h2></div>'
+            '<div class="vulns"><div class="vuln"><div class="vuln-detail">'
+            '<div class="vuln-tab vuln-resp1-tab"><pre>HTTP/1.1 200 OK\n'
+            '<table><tr><td>a</td></tr>\n<tr><td>b</td></tr></table>tail</pre></div>'
+            '</div></div></div></div></body></html>'
+        )
+        self._assert_parity(html_content)
+        row = security_extractHTML.extract_vulnerability_sections(html_content)["rows"][0]
+        self.assertTrue(row["vuln_detail_json"]["response"].endswith("tail"))
+
+
+class PrdinfoTemplatePatchTests(SimpleTestCase):
+    """download_filled_prdinfo: 템플릿 XML 패치 경로와 openpyxl 경로의 결과 비교"""
+
+    PAYLOAD = {
+        "prdinfo": {
+            "row_B5_N5": ["문서관리 시스템\nDocMan", "DocMan v2.0", "GS-A-25-0001", "응용 소프트웨어",
+                          "설명 <본 제품> & 기능", "'- 기능 1\n- 기능 2", 12, None, "", 3.5,
+                          "2025년 6월 23일 ~ 2025년 7월 4일", True, "신규"],
+            "row_B7_N7": ["123-45-67890", "110111-1234567", "홍길동", "02-123-4567", "ceo@example.com",
+                          "서울시 강남구", "김담당\n개발팀/과장", "010-1234-5678", "02-123-4568",
+                          "dev@example.com", "(주)예시\n/대한민국", "https://example.com", "문서, 검색"],
+            "B9": "비고", "D9": "", "F9": "2025-07-04", "G9": "재인증", "H9": "x", "J9": "y", "L9": "z",
+        },
+        "defect": {"row_B4_O4": [1, 2, 0, 0, 3, 0, 1, 0, 0, 0, 4, 2, 1, 7]},
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from main.views.certy import prdinfo_download
+        cls.dl = prdinfo_download
+        # openpyxl 경로는 템플릿 styles.xml이 커서 느리므로(수십 초) 1회만 만든다
+        values = cls.dl._cell_values(cls.PAYLOAD)
+        cls.fast = cls.dl._get_patcher().render(values)
+        cls.slow = cls.dl._fill_with_openpyxl(values)
+
+    def test_patched_output_is_valid_zip(self):
+        self.assertIsNotNone(self.fast)
+        self.assertIsNone(zipfile.ZipFile(BytesIO(self.fast)).testzip())
+        self.assertNotIn("xl/calcChain.xml", zipfile.ZipFile(BytesIO(self.fast)).namelist())
+
+    def test_patched_output_matches_openpyxl(self):
+        from openpyxl import load_workbook
+        wb_fast, wb_slow = load_workbook(BytesIO(self.fast)), load_workbook(BytesIO(self.slow))
+        self.assertEqual(wb_fast.sheetnames, wb_slow.sheetnames)
+        for name in wb_slow.sheetnames:
+            ws_fast, ws_slow = wb_fast[name], wb_slow[name]
+            self.assertEqual(ws_fast.merged_cells.ranges, ws_slow.merged_cells.ranges)
+            for row in ws_slow.iter_rows():
+                for cell in row:
+                    other = ws_fast[cell.coordinate]
+                    with self.subTest(sheet=name, cell=cell.coordinate):
+                        self.assertEqual(other.value, cell.value)
+                        # 스타일은 StyleProxy라 repr로 비교
+                        for attr in ("alignment", "font", "border", "fill", "protection"):
+                            self.assertEqual(repr(getattr(other, attr)), repr(getattr(cell, attr)))
+                        self.assertEqual(other.number_format, cell.number_format)
+
+    def test_legacy_defect_row_keeps_template_formula(self):
+        values = self.dl._cell_values({"prdinfo": {}, "defect": {"row_B4_N4": list(range(13))}})
+        data = self.dl._get_patcher().render(values)
+        sheet = zipfile.ZipFile(BytesIO(data)).read("xl/worksheets/sheet2.xml").decode("utf-8")
+        self.assertIn("<f>SUM($C$4:$K$4)</f>", sheet)
+        self.assertIn('<c r="N4" s="', sheet)
+
+    def test_unsupported_values_fall_back_to_openpyxl(self):
+        patcher = self.dl._get_patcher()
+        self.assertIsNone(patcher.render({"제품 정보 요청": {"B9": "=1+1"}}))
+        self.assertIsNone(patcher.render({"제품 정보 요청": {"O5": "범위 밖"}}))
+        self.assertIsNone(patcher.render({"제품 정보 요청": {"B9": ["list"]}}))
+        self.assertIsNone(patcher.render({"제품 정보 요청": {"B9": "bad\x01char"}}))
+
+
+class PrdinfoLuckyTests(SimpleTestCase):
+    """prdinfo_lucky: 서버 변환 결과에 다른 시트 범위를 참조하는 목록(x14 확장) 드롭다운과 셀 메모가 남아야 한다"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        import gzip
+        from main.views.certy.prdinfo_lucky import get_lucky_json
+        cls.sheets = {sheet["name"]: sheet for sheet in json.loads(gzip.decompress(get_lucky_json().gz))["sheets"]}
+        cls.sheet = cls.sheets["제품 정보 요청"]
+
+    def _items(self, ref):
+        from openpyxl.utils.cell import coordinate_to_tuple
+        row, col = coordinate_to_tuple(ref)
+        rule = self.sheet["dataVerification"].get(f"{row - 1}_{col - 1}")
+        self.assertIsNotNone(rule, ref)
+        self.assertEqual(rule["type"], "dropdown")
+        return rule["value1"].split(",")
+
+    def test_cross_sheet_dropdowns(self):
+        self.assertIn("유틸리티 SW-압축", self._items("E5"))   # SW분류!C2:C124
+        self.assertIn("중요 변경 재인증", self._items("G9"))    # SW분류!$H$3:$H$6
+        self.assertIn("TTA", self._items("N5"))                 # SW분류!E2:E4
+
+    def test_cell_comments(self):
+        from openpyxl.utils.cell import coordinate_to_tuple
+        expected = {
+            "제품 정보 요청": ["H4", "I4", "J4", "B8", "F8", "G8", "J8", "L8"],
+            "결함정보": ["O2"],
+            "SW분류": ["B45", "B61", "B77"],
+        }
+        for name, refs in expected.items():
+            notes = {(cell["r"], cell["c"]): cell["v"]["ps"] for cell in self.sheets[name]["celldata"] if "ps" in cell["v"]}
+            cells = {tuple(x - 1 for x in coordinate_to_tuple(ref)) for ref in refs}
+            self.assertEqual(set(notes), cells, name)
+            for note in notes.values():
+                self.assertTrue(note["value"].strip())
+                self.assertFalse(note["isshow"])
+            if name == "제품 정보 요청":
+                self.assertIn("계약된 총WD", notes[(3, 7)]["value"])  # H4
+
+
+@unittest.skipIf(report_pdf_parser._pymupdf() is None, "PyMuPDF 미설치")
+class CheckreportPdfParserTests(SimpleTestCase):
+    """report_pdf_parser: PyMuPDF 위/아래 띠 경로와 pdfminer 전체 레이아웃 경로의 결과 비교"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from main.management.commands.bench_checkreport_pdf import synthetic_report_pdf
+        cls.data = synthetic_report_pdf(60, seed=1)
+        cls.expected = report_pdf_parser.parse_pdf(BytesIO(cls.data), engine="pdfminer")
+
+    def test_parity_with_pdfminer(self):
+        result = report_pdf_parser.parse_pdf(BytesIO(self.data))
+        self.assertEqual(result["total_pages"], self.expected["total_pages"])
+        for got, want in zip(result["pages"], self.expected["pages"]):
+            with self.subTest(page=want["page"]):
+                self.assertEqual(got, want)
+
+    def test_page_ranges_keep_order(self):
+        # 구간 병렬 처리와 같은 방식으로 나눠 읽어도 페이지 순서/내용이 같아야 한다
+        pages = []
+        for start in range(0, 60, 16):
+            pages.extend(report_pdf_parser._scan_pages(self.data, start, min(start + 16, 60)))
+        self.assertEqual(report_pdf_parser._result(pages), self.expected)
+
+
+class CheckreportSplitTests(SimpleTestCase):
+    """checkreport_GPT.split_payload: 하위 라벨 없는 큰 절/큰 표도 예산 크기 청크로 나뉘어야 한다"""
+
+    BUDGET = 3000
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        sentences = [{"sen": f"5.1.{i} 기능 시험 항목 {i}: 입력값 검증 결과 정상 처리됨을 확인하였다."} for i in range(800)]
+        table = [[1, c, 1, 1, f"머리글{c}"] for c in range(1, 5)]
+        table += [[r, c, 1, 1, f"{r}행 {c}열 측정값 {r * c}"] for r in range(2, 402) for c in range(1, 5)]
+        table.append([402, 1, 2, 1, "세로 병합"])
+        table += [[402, 2, 1, 1, "a"], [403, 2, 1, 1, "b"]]
+        cls.content = [
+            {"sen": "시험결과서"},
+            {"label": "1 개요", "content": [{"sen": "개요 문장"}]},
+            {"label": "5 시험 결과", "content": sentences[:400] + [{"table": table}] + sentences[400:]},
+            {"label": "6 시험 기간", "content": [{"sen": "- 끝 -"}]},
+        ]
+        pages = [{"page": i, "header": ["시험결과서"], "footer": [f"TTA-QP-601-04 - {i} -"]} for i in range(1, 41)]
+        cls.pdf = {"v": "1", "total_pages": 40, "pages": pages}
+        cls.chunks = checkreport_GPT.split_payload(
+            {"v": "1", "document": {"docx": {"v": "1", "content": cls.content}, "pdf": cls.pdf}}, budget=cls.BUDGET,
+        )
+
+    @staticmethod
+    def _leaves(nodes):
+        for node in nodes:
+            if "label" in node:
+                yield from CheckreportSplitTests._leaves(node["content"])
+            elif "table" in node:
+                yield from (tuple(cell) for cell in node["table"])
+            else:
+                yield node["sen"]
+
+    def test_chunks_stay_within_budget(self):
+        self.assertGreater(len(self.chunks), 5)
+        for chunk in self.chunks:
+            with self.subTest(index=chunk["index"]):
+                document = chunk["payload"]["document"]
+                # 청크 본문 + 청크마다 붙는 PDF 페이지와 감싸는 키 몫
+                overhead = checkreport_GPT._estimate_tokens(document["pdf"]) + 100
+                self.assertLessEqual(chunk["est_tokens"], self.BUDGET + overhead)
+                self.assertLessEqual(len(document["pdf"]["pages"]), 40 // 2)
+
+    def test_content_order_is_preserved(self):
+        got = [leaf for c in self.chunks for leaf in self._leaves(c["payload"]["document"]["docx"]["content"])
+               if not (isinstance(leaf, tuple) and leaf[0] == 1)]
+        want = [leaf for leaf in self._leaves(self.content) if not (isinstance(leaf, tuple) and leaf[0] == 1)]
+        self.assertEqual(got, want)
+
+    def test_table_pieces_repeat_header_and_keep_merged_rows(self):
+        pieces = [n["table"] for c in self.chunks for part in c["payload"]["document"]["docx"]["content"]
+                  for n in part.get("content", []) if "table" in n]
+        self.assertGreater(len(pieces), 1)
+        for cells in pieces:
+            self.assertEqual([cell for cell in cells if cell[0] == 1], [[1, c, 1, 1, f"머리글{c}"] for c in range(1, 5)])
+        self.assertTrue(any([403, 2, 1, 1, "b"] in cells and [402, 1, 2, 1, "세로 병합"] in cells for cells in pieces))
+        labels = {label for c in self.chunks for label in c["labels"]}
+        self.assertEqual(labels, {"1 개요", "5 시험 결과", "6 시험 기간"})
+
+
+class _StubCompletions:
+    """chat.completions.create 대역: 청크 번호별 응답 items를 돌려주고, fail에 든 청크는 예외"""
+
+    def __init__(self, items_by_chunk, fail=()):
+        self.items_by_chunk = items_by_chunk
+        self.fail = set(fail)
+        self.calls = []
+
+    def create(self, **request):
+        note = re.search(r"(\d+)개 부분 중 (\d+)번째", request["messages"][1]["content"])
+        index = int(note.group(2)) if note else 0
+        self.calls.append(index)
+        if index in self.fail:
+            raise RuntimeError("stub failure")
+        content = json.dumps({"items": self.items_by_chunk(index)}, ensure_ascii=False)
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=2, total_tokens=12)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage, model="stub")
+
+
+class CheckreportChunkedReviewTests(SimpleTestCase):
+    """checkreport_GPT 분할 검토: 기본은 1회 호출, 분할 시 청크별 items 병합(중복 제거/중요도 정렬/번호 재부여)"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        sentences = [{"sen": f"시험 항목 {i}: 입력값 검증 결과 정상 처리됨을 확인하였다."} for i in range(500)]
+        content = [{"label": f"{n} 절", "content": sentences} for n in range(1, 4)]
+        cls.payload = {"v": "1", "document": {"docx": {"v": "1", "content": content}, "pdf": {"v": "1", "total_pages": 0, "pages": []}}}
+
+    def setUp(self):
+        patcher = mock.patch.dict(os.environ, {"OPENAI_API_KEY": "test"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(resources.reset_resource, "openai")
+
+    def _use_client(self, completions):
+        resources._INSTANCES["openai"] = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    @staticmethod
+    def _item(severity, summary, evidence="근거"):
+        return {"category": "표기", "severity": severity, "location": "1.1", "summary": summary, "evidence": evidence, "recommendation": ""}
+
+    def test_merge_items(self):
+        merged = checkreport_GPT.merge_items([
+            [self._item("🟨 보통", "A"), self._item("🟥 심각", "B")],
+            [self._item("🟨 보통", " A ", "근거 "), self._item("🟦 참고", "C"), self._item("🟥 심각", "D")],
+            [self._item("", "E")],
+        ])
+        self.assertEqual([it["summary"] for it in merged], ["B", "D", "A", "C", "E"])
+        self.assertEqual([it["no"] for it in merged], [1, 2, 3, 4, 5])
+
+    def test_large_payload_is_single_call_by_default(self):
+        self.assertGreater(checkreport_GPT._estimate_tokens(self.payload), checkreport_GPT.CHUNK_TOKEN_BUDGET)
+        completions = _StubCompletions(lambda index: [self._item("🟨 보통", "A")])
+        self._use_client(completions)
+        result, _ = checkreport_GPT.run_checkreport_gpt(self.payload)
+        self.assertEqual(completions.calls, [0])
+        self.assertEqual(result["total"], 1)
+
+    def test_run_chunked_merges_and_records_failures(self):
+        total = len(checkreport_GPT.split_payload(self.payload))
+        self.assertGreater(total, 2)
+        completions = _StubCompletions(
+            lambda index: [self._item("🟨 보통", "공통"), self._item("🟥 심각" if index == total else "🟦 참고", f"청크 {index}")],
+            fail={2},
+        )
+        self._use_client(completions)
+        result, debug = checkreport_GPT.run_checkreport_gpt(self.payload, debug=True, chunked=True)
+
+        self.assertEqual(sorted(completions.calls), list(range(1, total + 1)))
+        summaries = [it["summary"] for it in result["items"]]
+        self.assertEqual(summaries, [f"청크 {total}", "공통"] + [f"청크 {i}" for i in range(1, total) if i != 2])
+        self.assertEqual([it["no"] for it in result["items"]], list(range(1, len(summaries) + 1)))
+        self.assertEqual(result["total"], len(summaries))
+        self.assertIn("#2: OpenAI call failed: stub failure", debug["error"])
+        self.assertEqual(debug["gpt_response_meta"]["chunks"], total)
+        self.assertEqual(debug["gpt_response_meta"]["usage"]["total_tokens"], 12 * (total - 1))
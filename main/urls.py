@@ -6,12 +6,14 @@ from main.views.init import index, similar, security, prdinfo, checkreport, test
 from main.views.testing.history import history
 from main.views.testing.similar_summary import summarize_document
 from main.views.testing.security import invicti_parse_view
-from main.views.testing.security_GPT import get_gpt_recommendation_view
+from main.views.testing.security_css import invicti_css_view
+from main.views.testing.security_session import invicti_detail_view
+from main.views.testing.security_GPT import get_gpt_recommendation_view, get_gpt_recommendation_stream_view
 
 from main.views.certy.prdinfo_generate import generate_prdinfo
-from main.views.certy.prdinfo_URL import source_excel_view
+from main.views.certy.prdinfo_URL import source_excel_view, source_lucky_view
 from main.views.certy.prdinfo_download import download_filled_prdinfo
-from main.views.certy.prdinfo_db import lookup_cert_info
+from main.views.certy.prdinfo_db import lookup_cert_info, lookup_cert_info_batch
 
 from main.views.review.checkreport import parse_view
 
@@ -25,12 +27,17 @@ urlpatterns = [
     path('summarize_document/', summarize_document, name='summarize_document'),
     path('security/', security, name='security'),
     path('security/invicti/parse/', invicti_parse_view, name='invicti_parse'),
+    path('security/invicti/css/<slug:css_hash>.css', invicti_css_view, name='invicti_css'),
+    path('security/invicti/detail/<slug:session_id>/<int:row_no>/', invicti_detail_view, name='invicti_detail'),
     path('security/gpt/recommend/', get_gpt_recommendation_view, name='gpt_recommend'),
+    path('security/gpt/recommend/stream/', get_gpt_recommendation_stream_view, name='gpt_recommend_stream'),
 
     path('prdinfo/', prdinfo, name='prdinfo'),
     path('lookup_cert_info/', lookup_cert_info, name='lookup_cert_info'),
+    path('lookup_cert_info/batch/', lookup_cert_info_batch, name='lookup_cert_info_batch'),
     path('generate_prdinfo/', generate_prdinfo, name='generate_prdinfo'),
     path('source-excel/', source_excel_view, name='source-excel'),
+    path('source-excel/lucky/', source_lucky_view, name='source-excel-lucky'),
     path("download-filled/", download_filled_prdinfo, name="download_filled"),
     
     path('checkreport/', checkreport, name='checkreport'),
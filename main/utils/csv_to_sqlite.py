@@ -3,6 +3,8 @@ import pandas as pd
 from datetime import datetime
 import sqlite3
 
+from main.utils.reference_db import LOOKUP_INDEX_SQL
+
 # 개선된 날짜 변환 함수
 def parse_korean_date_range(date_str):
     if pd.isna(date_str):
@@ -64,6 +66,9 @@ def convert_csv_to_sqlite(csv_path, db_path):
     ]
     print(df.columns.tolist())
 
+    # 시험번호 앞뒤 공백/줄바꿈 제거 (조회는 정확히 일치하는 번호로 인덱스를 탐)
+    df['시험번호'] = df['시험번호'].str.strip()
+
     # 날짜 처리 및 새 컬럼 생성
     df[['시작일자', '종료일자']] = df['시작날짜종료날짜'].apply(
         lambda x: pd.Series(parse_korean_date_range(str(x)))
@@ -94,6 +99,10 @@ def convert_csv_to_sqlite(csv_path, db_path):
     conn.execute('DROP TABLE sw_data;')
     conn.execute('ALTER TABLE sw_data_new RENAME TO sw_data;')
 
+    # prdinfo 인증 정보 조회(시험번호 → 인증번호/제품/총WD)용 커버링 인덱스
+    # 시험번호는 중복·빈 값이 있어 UNIQUE가 아닌 일반 인덱스 (중복이면 일련번호가 가장 작은 행을 쓴다)
+    conn.execute(LOOKUP_INDEX_SQL)
+
     conn.commit()
     conn.close()
 
@@ -0,0 +1,96 @@
+import random
+import sqlite3
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from main.utils.resources import get_resource
+from main.views.certy.prdinfo_classify import DB_PATH, TOP_K, MIN_CONFIDENCE
+
+
+def _major(label):
+    # "보안용 SW-PC보안" → "보안용 SW"
+    return label.split("-", 1)[0].strip()
+
+
+def _description_twins(db_path):
+    """일련번호 → 제품설명이 같은(공백 정규화) 행들의 id 묶음 (같은 설명 = 같은 임베딩 벡터)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("""
+            SELECT 일련번호, 제품설명
+            FROM sw_data
+            WHERE 제품설명 IS NOT NULL AND TRIM(제품설명) != ''
+        """).fetchall()
+    finally:
+        conn.close()
+    by_text = defaultdict(set)
+    for i, text in rows:
+        by_text[" ".join(str(text).split())].add(int(i))
+    twins = {}
+    for ids in by_text.values():
+        group = frozenset(ids)
+        for i in ids:
+            twins[i] = group
+    return twins
+
+
+def evaluate_leave_one_out(sample=2000, k=TOP_K, seed=0):
+    """
+    sw_data 라벨 행을 하나씩 빼고 이웃 투표로 분류 → 정확도/지연 측정.
+    쿼리 벡터는 인덱스에 저장된 벡터(reconstruct)를 그대로 써서 임베딩 모델 없이 돈다.
+    - 설명이 같은 행(재인증 등)은 벡터가 같아 자기 자신만 빼면 정답이 그대로 이웃에 남는다
+      → 같은 설명 묶음 전체를 이웃에서 빼고, 묶음마다 1건만 평가
+    """
+    clf = get_resource("sw_classifier")
+    twins = _description_twins(DB_PATH)
+    ids = [i for i in clf.labels if i >= 0]
+    random.Random(seed).shuffle(ids)
+    unique, seen = [], set()
+    for i in ids:
+        group = twins.get(i, frozenset((i,)))
+        if group not in seen:
+            seen.add(group)
+            unique.append(i)
+    ids = unique[:sample] if sample else unique
+
+    hit = major_hit = covered = covered_hit = 0
+    latencies = []
+    evaluated = 0
+    for i in ids:
+        try:
+            q = clf.index.reconstruct(int(i))
+        except RuntimeError:
+            continue  # 인덱스에 없는 id(설명 없음/2016년 이전)
+        t0 = time.perf_counter()
+        res = clf.classify_vector(np.asarray(q, dtype="float32"), k=k, exclude_ids=twins.get(i, frozenset((i,))))
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+        evaluated += 1
+        truth = clf.labels[i]
+        ok = res["label"] == truth
+        hit += ok
+        major_hit += bool(res["label"]) and _major(res["label"]) == _major(truth)
+        if res["confidence"] >= MIN_CONFIDENCE:
+            covered += 1
+            covered_hit += ok
+
+    if not evaluated:
+        print("평가할 샘플이 없습니다.")
+        return {}
+
+    lat = np.array(latencies)
+    report = {
+        "samples": evaluated,
+        "k": k,
+        "accuracy": hit / evaluated,
+        "major_accuracy": major_hit / evaluated,
+        "coverage@min_conf": covered / evaluated,
+        "accuracy@min_conf": (covered_hit / covered) if covered else 0.0,
+        "latency_ms_p50": float(np.percentile(lat, 50)),
+        "latency_ms_p95": float(np.percentile(lat, 95)),
+    }
+    for key, val in report.items():
+        print(f"{key:>20}: {val:.4f}" if isinstance(val, float) else f"{key:>20}: {val}")
+    return report
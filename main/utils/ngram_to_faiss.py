@@ -0,0 +1,187 @@
+import os
+import math
+import sqlite3
+import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+OUT_NPZ   = "main/data/ngram_table.npz"
+MODEL     = "upskyy/bge-m3-korean"
+
+# 워커 프로세스마다 1회만 생성되는 Kiwi 인스턴스
+_kiwi = None
+
+def fetch_texts(db_path):
+    conn = sqlite3.connect(db_path)
+    cur  = conn.cursor()
+    cur.execute("SELECT 제품설명 FROM sw_data WHERE 시작일자 >= '2016-01-01'")
+    rows = cur.fetchall()
+    conn.close()
+    return [ (r[0] or "").strip() for r in rows if r[0] ]
+
+def _get_kiwi():
+    global _kiwi
+    if _kiwi is None:
+        from kiwipiepy import Kiwi
+        _kiwi = Kiwi()
+    return _kiwi
+
+def kiwi_noun_tokens(s: str):
+    toks = []
+    for t in _get_kiwi().tokenize(s):
+        if t.tag.startswith("NN"):
+            toks.append(t.lemma if t.lemma else t.form)
+    return [w for w in toks if len(w) >= 2]
+
+def _count_shard(texts):
+    """워커: 샤드 하나의 DF/CF(명사 uni/bi-gram)를 센다."""
+    DF = Counter(); CF_uni = Counter(); CF_bi = Counter()
+    for s in texts:
+        toks = kiwi_noun_tokens(s)
+        unis = toks
+        bis  = [f"{toks[i]} {toks[i+1]}" for i in range(len(toks)-1)]
+        DF.update(set(unis)); DF.update(set(bis))
+        CF_uni.update(unis);  CF_bi.update(bis)
+    return DF, CF_uni, CF_bi
+
+def _shards(texts, n):
+    size = max(1, math.ceil(len(texts) / n))
+    return [texts[i:i + size] for i in range(0, len(texts), size)]
+
+def count_ngrams(texts, workers=None):
+    """
+    Kiwi 토큰화를 워커 프로세스로 샤딩하고, 샤드별 Counter를 합친다.
+    workers <= 1 이면 현재 프로세스에서 순차 처리.
+    """
+    workers = workers or os.cpu_count() or 1
+    DF = Counter(); CF_uni = Counter(); CF_bi = Counter()
+    if workers <= 1 or len(texts) < 2:
+        parts = [_count_shard(texts)]
+    else:
+        # 샤드를 워커 수보다 잘게 나눠 긴 설명이 몰린 샤드의 꼬리 지연을 줄인다
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            parts = ex.map(_count_shard, _shards(texts, workers * 4))
+    for df, cu, cb in parts:
+        DF.update(df); CF_uni.update(cu); CF_bi.update(cb)
+    return DF, CF_uni, CF_bi
+
+# ─────────────────────────────────────────────────────────────
+# 저장 포맷 (pickle 없음)
+#   vocab_blob      uint8   : 어휘를 UTF-8로 이어붙인 바이트
+#   vocab_offsets   int64   : (V+1,) i번째 어휘 = blob[off[i]:off[i+1]]
+#   idf             float32 : (V,)
+#   vectors         float16 : (V, dim) 정규화 임베딩
+#   generic_centroid float32: (dim,)
+# np.savez(무압축) → zip 멤버가 그대로 .npy 이므로 파일 오프셋에서 바로 mmap 가능
+# ─────────────────────────────────────────────────────────────
+def _encode_vocab(vocab):
+    encoded = [g.encode("utf-8") for g in vocab]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return blob, offsets
+
+def decode_vocab(blob, offsets):
+    raw = bytes(blob)
+    return [raw[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+def save_ngram_table(path, vocab, idf, vectors, generic_centroid):
+    blob, offsets = _encode_vocab(vocab)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.savez(path,
+             vocab_blob=blob,
+             vocab_offsets=offsets,
+             idf=np.asarray(idf, dtype="float32"),
+             vectors=np.asarray(vectors, dtype="float16"),
+             generic_centroid=np.asarray(generic_centroid, dtype="float32"))
+
+def _mmap_npz_member(path, info):
+    # 무압축 멤버만 mmap 가능 (로컬 헤더 30바이트 + 파일명 + extra 뒤가 .npy 본문)
+    with open(path, "rb") as f:
+        f.seek(info.header_offset + 26)
+        name_len, extra_len = np.frombuffer(f.read(4), dtype="<u2")
+        npy_start = info.header_offset + 30 + int(name_len) + int(extra_len)
+        f.seek(npy_start)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        data_start = f.tell()
+    if dtype.hasobject:
+        raise ValueError(f"object 배열은 지원하지 않습니다: {info.filename}")
+    if int(np.prod(shape)) == 0:
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=data_start,
+                     shape=shape, order="F" if fortran else "C")
+
+def load_ngram_table(path=OUT_NPZ, mmap=True):
+    """
+    ngram_table.npz 로드 → dict(vocab, idf, vectors, generic_centroid).
+    - mmap=True: 무압축 멤버를 np.memmap으로 매핑(복사/역직렬화 없음)
+    - 구버전(object vocab) 파일은 pickle 없이 읽을 수 없으므로 명시적으로 실패
+    """
+    with zipfile.ZipFile(path) as zf:
+        infos = {i.filename[:-4]: i for i in zf.infolist() if i.filename.endswith(".npy")}
+        if "vocab_blob" not in infos:
+            raise ValueError(f"{path}: 구버전 포맷입니다. 'manage.py ngram_db'로 다시 생성하세요.")
+        if mmap and all(i.compress_type == zipfile.ZIP_STORED for i in infos.values()):
+            arrays = {k: _mmap_npz_member(path, i) for k, i in infos.items()}
+        else:
+            with np.load(path, allow_pickle=False) as npz:
+                arrays = {k: npz[k] for k in npz.files}
+
+    return {
+        "vocab": decode_vocab(arrays["vocab_blob"], arrays["vocab_offsets"]),
+        "idf": arrays["idf"],
+        "vectors": arrays["vectors"],
+        "generic_centroid": arrays["generic_centroid"],
+    }
+
+def build_ngram_table(db_path, out_path=OUT_NPZ, workers=None):
+    from sentence_transformers import SentenceTransformer
+
+    min_df=2
+    max_df_ratio=0.30
+    min_pmi=3.0
+
+    texts = fetch_texts(db_path)
+    N = len(texts)
+    max_df = int(N * max_df_ratio)
+    print(f"조회된 텍스트 개수: {N}")
+
+    # 1) DF/CF (명사 uni/bi-gram) — 프로세스 샤딩 후 병합
+    DF, CF_uni, CF_bi = count_ngrams(texts, workers)
+
+    # 2) PMI (bi-gram 결속도)
+    total_uni = sum(CF_uni.values()) + 1e-9
+    PMI = {}
+    for b, cb in CF_bi.items():
+        if cb < 2: continue
+        w1, w2 = b.split()
+        PMI[b] = math.log2((cb * total_uni) / (CF_uni[w1] * CF_uni[w2] + 1e-9))
+
+    # 3) 후보 필터 + IDF (DF 내림차순·사전순으로 고정해 재생성 시 결과가 같도록)
+    vocab, idf = [], []
+    def _idf(df): return math.log((N+1)/(df+1)) + 1.0
+    for g, df in sorted(DF.items(), key=lambda x: (-x[1], x[0])):
+        if df < min_df or df > max_df: continue
+        if " " in g and PMI.get(g, 0.0) < min_pmi: continue
+        vocab.append(g); idf.append(_idf(df))
+
+    # 4) n-gram 임베딩 + generic centroid (DF 상위 800개 중 vocab에 남은 항목; 재인코딩 없이 V 재사용)
+    enc = SentenceTransformer(MODEL)
+    V = enc.encode(vocab, normalize_embeddings=True, batch_size=64,
+                   show_progress_bar=True).astype("float32")
+    top_df = {g for g, _ in sorted(DF.items(), key=lambda x: -x[1])[:800]}
+    base_idx = [i for i, g in enumerate(vocab) if g in top_df]
+    if base_idx:
+        v_generic = V[base_idx].mean(axis=0); v_generic /= (np.linalg.norm(v_generic)+1e-9)
+    else:
+        v_generic = np.zeros(enc.get_sentence_embedding_dimension(), dtype="float32")
+
+    save_ngram_table(out_path, vocab, idf, V, v_generic)
+    print(f"[OK] n-gram table saved → {out_path} (vocab={len(vocab)})")
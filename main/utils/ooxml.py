@@ -0,0 +1,141 @@
+"""
+DOCX(OOXML) 읽기 공통 코어 — 합의서/성적서/검토 리포트/유사도 요약 파서가 공유
+
+- zip 열기 + word/document.xml 스트리밍 파싱(iterparse): iter_body()가 본문 블록(w:p / w:tbl)을
+  하나씩 넘기고, 다음 블록으로 넘어갈 때 처리가 끝난 블록을 비워 메모리를 돌려준다
+- 자주 쓰는 질의는 모듈 로드 시 1회 컴파일한 etree.XPath 객체(XP_*)로 제공
+- 표 셀은 텍스트 + 병합 정보(gridSpan / vMerge)를 셀마다 1번만 계산(table_rows)
+
+주의: iter_body()가 넘긴 블록(과 그 자손)은 다음 블록에서 비워지므로, 필요한 값은 그 자리에서 뽑아 둔다.
+"""
+
+import io
+import os
+import re
+from collections import namedtuple
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Tuple
+from zipfile import ZipFile
+
+from lxml import etree
+
+DOCUMENT_PART = "word/document.xml"
+
+NS = {
+    "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
+    "m": "http://schemas.openxmlformats.org/officeDocument/2006/math",
+    "mc": "http://schemas.openxmlformats.org/markup-compatibility/2006",
+}
+W = "{%s}" % NS["w"]
+M = "{%s}" % NS["m"]
+
+W_BODY, W_P, W_T, W_BR, W_TBL, W_TR, W_TC = (W + t for t in ("body", "p", "t", "br", "tbl", "tr", "tc"))
+W_SDT, W_CUSTOM_XML = W + "sdt", W + "customXml"
+W_VAL = W + "val"
+
+# iter_body()가 넘기는 본문 블록 종류 (표/문단을 담을 수 있는 body 자식)
+BLOCK_TAGS = (W_P, W_TBL, W_SDT, W_CUSTOM_XML)
+
+# ─────────────────────────────────────────────────────────────
+# 미리 컴파일한 XPath (문자열 결과는 smart_strings=False: 원본 노드를 붙잡지 않게)
+# ─────────────────────────────────────────────────────────────
+XP_W_TEXT = etree.XPath(".//w:t/text()", namespaces=NS, smart_strings=False)
+XP_M_TEXT = etree.XPath(".//m:t/text()", namespaces=NS, smart_strings=False)
+XP_ANY_TEXT = etree.XPath(".//m:t/text()|.//w:t/text()", namespaces=NS, smart_strings=False)
+XP_MATH = etree.XPath(".//m:oMath|.//m:oMathPara", namespaces=NS)
+XP_PARAGRAPHS = etree.XPath(".//w:p", namespaces=NS)
+XP_ROWS = etree.XPath("./w:tr", namespaces=NS)
+XP_CELLS = etree.XPath("./w:tc", namespaces=NS)
+XP_GRID_SPAN = etree.XPath("./w:tcPr/w:gridSpan/@w:val", namespaces=NS, smart_strings=False)
+XP_VMERGE = etree.XPath("./w:tcPr/w:vMerge", namespaces=NS)
+# mc:AlternateContent(대체 표현) 안쪽을 뺀 w:t: 기준 노드의 AlternateContent 깊이($depth)와 같은 것만
+XP_AC_DEPTH = etree.XPath("count(ancestor-or-self::mc:AlternateContent)", namespaces=NS)
+XP_W_TEXT_AT_AC_DEPTH = etree.XPath(
+    ".//w:t[count(ancestor::mc:AlternateContent) = $depth]/text()", namespaces=NS, smart_strings=False
+)
+
+
+# ─────────────────────────────────────────────────────────────
+# zip 파트 열기 / 본문 스트리밍
+# ─────────────────────────────────────────────────────────────
+@contextmanager
+def open_part(source, part: str = DOCUMENT_PART):
+    """source(bytes / 경로 / 파일 객체)의 zip 파트를 스트림으로 연다"""
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    elif isinstance(source, os.PathLike):
+        source = os.fspath(source)
+    with ZipFile(source) as zf:
+        with zf.open(part) as f:
+            yield f
+
+
+def iter_body(source, part: str = DOCUMENT_PART) -> Iterator[etree._Element]:
+    """
+    w:body의 자식 블록(BLOCK_TAGS)을 문서 순서대로 넘긴다 (iterparse: 전체 트리를 만들지 않음)
+    - 블록은 닫는 태그까지 파싱된 완전한 요소
+    - 다음 블록으로 넘어가면 이전 블록(과 그 사이의 책갈피/구역 설정 등)은 비우고 body에서 떼어낸다
+    - 이벤트는 블록 태그로만 받는다(C 수준 필터): 셀 안 문단 등 중첩된 같은 태그는 부모 확인으로 거른다
+    """
+    with open_part(source, part) as f:
+        for _event, el in etree.iterparse(f, events=("end",), tag=BLOCK_TAGS, huge_tree=True):
+            body = el.getparent()
+            if body is None or body.tag != W_BODY:
+                continue
+            yield el
+            el.clear()
+            while el.getprevious() is not None:
+                del body[0]
+
+
+# ─────────────────────────────────────────────────────────────
+# 텍스트 / 표 셀
+# ─────────────────────────────────────────────────────────────
+_SPACES_RE = re.compile(r"[ \t]+")
+
+
+def paragraph_text(p) -> str:
+    """문단 텍스트: w:t + w:br(줄바꿈)"""
+    return "".join([(node.text or "") if node.tag == W_T else "\n" for node in p.iter(W_T, W_BR)])
+
+
+def cell_text(tc) -> str:
+    """표 셀 텍스트: 문단/줄바꿈 유지, 연속 공백·탭은 1칸으로"""
+    parts = [paragraph_text(p) for p in tc.iter(W_P)]
+    if not parts:
+        parts = ["".join(XP_W_TEXT(tc))]
+    return _SPACES_RE.sub(" ", "\n".join(parts)).strip()
+
+
+def text_outside_alternate_content(node) -> str:
+    """node 아래 w:t 텍스트(AlternateContent 대체 표현 안쪽은 제외)"""
+    return "".join(XP_W_TEXT_AT_AC_DEPTH(node, depth=XP_AC_DEPTH(node)))
+
+
+# 셀 1개: 텍스트 + 병합 정보
+#   grid_span: 가로 병합 칸 수, vmerge: None(병합 아님) | "restart"(세로 병합 시작) | "continue"(위 셀에 이어짐)
+Cell = namedtuple("Cell", "text grid_span vmerge")
+
+
+def cell_span(tc) -> Tuple[int, Optional[str]]:
+    """셀 자신의 tcPr 기준 (gridSpan, vMerge) — 셀 안 중첩 표의 병합 정보는 섞이지 않는다"""
+    grid_span = 1
+    gs = XP_GRID_SPAN(tc)
+    if gs:
+        try:
+            grid_span = int(gs[0])
+        except ValueError:
+            grid_span = 1
+    vm = XP_VMERGE(tc)
+    vmerge = (vm[0].get(W_VAL) or "continue") if vm else None
+    return grid_span, vmerge
+
+
+def table_text_rows(tbl) -> List[List[str]]:
+    """표의 직계 행/셀 텍스트 행렬 (병합 정보가 필요 없을 때)"""
+    return [[cell_text(tc) for tc in XP_CELLS(tr)] for tr in XP_ROWS(tbl)]
+
+
+def table_rows(tbl, text: Callable = cell_text) -> List[List[Cell]]:
+    """표의 직계 행/셀 → [[Cell, ...], ...] (text: 셀 텍스트 함수, 파서마다 규칙이 다를 수 있음)"""
+    return [[Cell(text(tc), *cell_span(tc)) for tc in XP_CELLS(tr)] for tr in XP_ROWS(tbl)]
@@ -0,0 +1,15 @@
+"""
+reference.db(sw_data) 조회용 인덱스 SQL — 적재(csv_to_sqlite)와 조회 뷰(prdinfo_db)가 공유
+
+- 시험번호 중복 행이 있어 UNIQUE는 걸 수 없다 → 중복이면 일련번호가 가장 작은 행을 쓴다
+- 일련번호를 두 번째 키로 둬서 "WHERE 시험번호 IN (...) ORDER BY 시험번호, 일련번호"를
+  인덱스만 읽고 정렬용 임시 B-tree 없이 처리 (인증번호/제품/총WD까지 담은 커버링 인덱스)
+"""
+
+LOOKUP_INDEX_SQL = (
+    'CREATE INDEX IF NOT EXISTS idx_sw_data_시험번호_일련번호 '
+    'ON sw_data(시험번호, 일련번호, 인증번호, 제품, 총WD)'
+)
+
+# 이전에 만든 DB의 일련번호 없는 인덱스 (새 인덱스로 대체)
+DROP_OLD_LOOKUP_INDEX_SQL = 'DROP INDEX IF EXISTS idx_sw_data_시험번호'
@@ -0,0 +1,93 @@
+"""
+무거운 런타임 리소스(모델/인덱스/클라이언트/엑셀 테이블)의 지연 초기화 레지스트리.
+
+- 모듈 import 시점에는 아무것도 만들지 않고, 첫 get_resource(name) 호출에서 1회 생성
+- 생성은 이름별 락으로 보호(동시 첫 요청이 와도 한 번만 로드)
+- factory 안에서만 무거운 패키지(openai, faiss, sentence_transformers, pandas)를 import
+"""
+
+import os
+import threading
+
+FAISS_INDEX_PATH = "main/data/faiss_bge_m3_ko.idmap.index"
+ENCODER_MODEL = "upskyy/bge-m3-korean"
+SECURITY_XLSX_PATH = "main/data/security.xlsx"
+
+_FACTORIES = {}
+_INSTANCES = {}
+_LOCKS = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def register(name):
+    """factory 등록 데코레이터: @register("encoder") def _make(): ..."""
+    def deco(factory):
+        with _REGISTRY_LOCK:
+            _FACTORIES[name] = factory
+            _LOCKS[name] = threading.Lock()
+        return factory
+    return deco
+
+
+def get_resource(name):
+    try:
+        return _INSTANCES[name]
+    except KeyError:
+        pass
+    if name not in _FACTORIES:
+        raise KeyError(f"등록되지 않은 리소스: {name}")
+    with _LOCKS[name]:
+        if name not in _INSTANCES:
+            _INSTANCES[name] = _FACTORIES[name]()
+    return _INSTANCES[name]
+
+
+def is_loaded(name) -> bool:
+    return name in _INSTANCES
+
+
+def reset_resource(name=None):
+    """캐시된 인스턴스 제거(파일 갱신 후 재로딩용). name=None이면 전체."""
+    with _REGISTRY_LOCK:
+        if name is None:
+            _INSTANCES.clear()
+        else:
+            _INSTANCES.pop(name, None)
+
+
+# ─────────────────────────────────────────────────────────────
+# 리소스 정의
+# ─────────────────────────────────────────────────────────────
+@register("openai")
+def _make_openai_client():
+    from openai import OpenAI
+    return OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+
+
+@register("openai_async")
+def _make_openai_async_client():
+    # 비동기 호출(일괄 추천/스트리밍)용: 커넥션 풀을 가진 클라이언트 1개를 공유
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+
+
+@register("encoder")
+def _make_encoder():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(ENCODER_MODEL)
+
+
+@register("faiss_index")
+def _make_faiss_index():
+    import faiss
+    return faiss.read_index(FAISS_INDEX_PATH)
+
+
+@register("security_map")
+def _make_security_map():
+    import pandas as pd
+    try:
+        return pd.read_excel(SECURITY_XLSX_PATH, sheet_name="Sheet1")
+    except FileNotFoundError:
+        print("오류: security.xlsx 파일을 찾을 수 없습니다. main/data 경로에 위치시켜주세요.")
+        return pd.DataFrame()
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
-import os, json, re
-from openai import OpenAI
+import json, os, re
+from main.utils.resources import get_resource
 
-# 환경변수 OPENAI_API_KEY 필요
-_client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+# 환경변수 OPENAI_API_KEY 필요 (클라이언트는 첫 호출 시 레지스트리에서 생성)
+
+# 요청 1회 제한 시간(초)과 재시도 횟수: 재시도까지 합쳐도 prdinfo 작업 제한 시간(PRDINFO_TASK_TIMEOUT, 기본 60초) 안에 끝나도록
+GPT_TIMEOUT = float(os.environ.get("PRDINFO_GPT_TIMEOUT", 25))
+GPT_MAX_RETRIES = 1
 
 _PROMPT_TEMPLATE = """너는 SW 프로그램을 분류하고 핵심 키워드를 추천하는 전문가야.
 {INPUT}
@@ -31,7 +34,8 @@ def _extract_json(s: str):
 def classify_sw_and_keywords(input_text: str):
     print("[STEP 1] GPT 요청 시작")
     prompt = _PROMPT_TEMPLATE.replace("{INPUT}", input_text)
-    resp = _client.responses.create(
+    client = get_resource("openai").with_options(timeout=GPT_TIMEOUT, max_retries=GPT_MAX_RETRIES)
+    resp = client.responses.create(
         model="gpt-5-nano",
         input=prompt
     )
@@ -1,7 +1,12 @@
 from django.http import FileResponse, Http404, HttpResponse
 from django.conf import settings
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
+from datetime import datetime, timezone
 import os
 
+from .prdinfo_lucky import get_lucky_json, negotiate_encoding
+
 # 원본 엑셀의 서버 내부 경로(공개하지 않음)
 ORIGIN_XLSX_PATH = os.path.join(settings.BASE_DIR, "main/data/prdinfo.xlsx")
 
@@ -19,3 +24,35 @@ def source_excel_view(request):
     # 다운로드용 파일명 힌트
     resp["Content-Disposition"] = 'inline; filename="prdinfo.xlsx"'
     return resp
+
+
+# ─────────────────────────────────────────────────────────────
+# 서버 변환 Luckysheet JSON (압축본 + ETag/Last-Modified → 재방문은 304)
+# ─────────────────────────────────────────────────────────────
+def _lucky_etag(request):
+    entry = get_lucky_json()
+    if entry is None:
+        return None
+    # 인코딩마다 본문 바이트가 다르므로 ETag도 구분
+    return f"{entry.etag}-{negotiate_encoding(request.headers.get('Accept-Encoding', '')) or 'identity'}"
+
+
+def _lucky_last_modified(request):
+    entry = get_lucky_json()
+    return datetime.fromtimestamp(entry.last_modified, tz=timezone.utc) if entry else None
+
+
+@require_GET
+@cache_control(private=True, no_cache=True)  # 매번 재검증 → 변경 없으면 304
+@condition(etag_func=_lucky_etag, last_modified_func=_lucky_last_modified)
+def source_lucky_view(request):
+    entry = get_lucky_json()
+    if entry is None:
+        raise Http404()
+    encoding = negotiate_encoding(request.headers.get("Accept-Encoding", ""))
+    resp = HttpResponse(entry.body(encoding), content_type="application/json; charset=utf-8")
+    if encoding:
+        resp["Content-Encoding"] = encoding
+    resp["Vary"] = "Accept-Encoding"
+    resp["X-Content-Type-Options"] = "nosniff"
+    return resp
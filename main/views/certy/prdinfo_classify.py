@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+FAISS 최근접 이웃 기반 로컬 S/W분류 분류기 (GPT 호출 대체)
+- 설명문 임베딩 → 기존 인덱스(faiss_bge_m3_ko.idmap.index)에서 top-k 인증 제품 검색
+- 이웃들의 SW분류 라벨을 유사도 가중 투표 → (라벨, 신뢰도)
+- 인덱스 라벨 = DB 일련번호(IndexIDMap2) 이므로 DB에서 id → 분류 맵만 1회 로드
+"""
+
+import sqlite3
+from collections import defaultdict
+
+import numpy as np
+
+from main.utils.resources import get_resource, register
+
+DB_PATH = "main/data/reference.db"
+
+TOP_K = 15
+WEIGHT_POWER = 4        # 유사도^p 가중: 가까운 이웃일수록 표가 무거움
+MIN_CONFIDENCE = 0.35   # 미만이면 분류를 채우지 않음
+
+
+def _load_labels(db_path):
+    """인증번호가 있는(인증 완료) 제품의 일련번호 → SW분류"""
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("""
+            SELECT 일련번호, SW분류
+            FROM sw_data
+            WHERE SW분류 IS NOT NULL AND TRIM(SW분류) != ''
+              AND 인증번호 IS NOT NULL AND TRIM(인증번호) != ''
+        """).fetchall()
+    finally:
+        conn.close()
+    return {int(i): str(label).strip() for i, label in rows}
+
+
+class SWClassifier:
+    def __init__(self, index, labels):
+        self.index = index
+        self.labels = labels
+
+    def encode(self, text: str) -> np.ndarray:
+        # 인코더는 텍스트 분류 때만 필요(오프라인 평가는 인덱스 벡터만 사용)
+        encoder = get_resource("encoder")
+        return np.asarray(encoder.encode([text], normalize_embeddings=True), dtype="float32")
+
+    def vote(self, sims, ids, k=TOP_K, exclude_ids=()):
+        scores = defaultdict(float)
+        neighbors = []
+        for sim, i in zip(sims, ids):
+            i = int(i)
+            if i < 0 or i in exclude_ids or i not in self.labels:
+                continue
+            label = self.labels[i]
+            scores[label] += max(float(sim), 0.0) ** WEIGHT_POWER
+            neighbors.append({"id": i, "label": label, "similarity": float(sim)})
+            if len(neighbors) >= k:
+                break
+        total = sum(scores.values())
+        if not total:
+            return {"label": "", "confidence": 0.0, "neighbors": neighbors}
+        label, best = max(scores.items(), key=lambda x: x[1])
+        return {"label": label, "confidence": best / total, "neighbors": neighbors}
+
+    def classify_vector(self, qvec: np.ndarray, k=TOP_K, exclude_ids=()):
+        # 라벨 없는/미인증 행과 제외할 id를 걸러낼 여유분까지 넉넉히 검색
+        D, L = self.index.search(qvec.reshape(1, -1), k * 3 + len(exclude_ids) + 1)
+        return self.vote(D[0], L[0], k=k, exclude_ids=exclude_ids)
+
+    def classify(self, text: str, k=TOP_K):
+        text = (text or "").strip()
+        if not text:
+            return {"label": "", "confidence": 0.0, "neighbors": []}
+        return self.classify_vector(self.encode(text), k=k)
+
+
+@register("sw_classifier")
+def _make_sw_classifier():
+    return SWClassifier(get_resource("faiss_index"), _load_labels(DB_PATH))
+
+
+def classify_sw(text: str):
+    """로컬 SW분류. 신뢰도 미달이거나 인덱스/모델을 쓸 수 없으면 None."""
+    try:
+        res = get_resource("sw_classifier").classify(text)
+    except Exception as e:
+        print(f"SW분류 분류기 실패: {e}")
+        return None
+    if not res["label"] or res["confidence"] < MIN_CONFIDENCE:
+        return None
+    return res
@@ -1,7 +1,69 @@
+import re
 import sqlite3
+import threading
+
 from django.http import JsonResponse
-from pathlib import Path
-import os
+from django.views.decorators.http import require_GET
+
+from main.utils.reference_db import DROP_OLD_LOOKUP_INDEX_SQL, LOOKUP_INDEX_SQL
+
+DB_PATH = 'main/data/reference.db'
+
+MAX_BATCH = 200       # 한 번에 조회할 수 있는 번호 수
+_SQL_CHUNK = 500      # IN (...) 자리표시자 수 (SQLite 변수 개수 제한 아래로)
+_SPLIT_RE = re.compile(r'[\s,;]+')
+
+_local = threading.local()
+_index_lock = threading.Lock()
+_index_ready = False
+
+
+def _ensure_index(conn):
+    global _index_ready
+    if _index_ready:
+        return
+    with _index_lock:
+        if not _index_ready:
+            # csv_to_sqlite 적재 시 생성되지만, 이전에 만든 DB는 첫 조회 때 생성(옛 인덱스는 삭제)
+            try:
+                conn.execute(LOOKUP_INDEX_SQL)
+                conn.execute(DROP_OLD_LOOKUP_INDEX_SQL)
+                conn.commit()
+            except sqlite3.OperationalError:
+                pass  # 읽기 전용 DB 등: 인덱스 없이도 조회는 된다
+            _index_ready = True
+
+
+def _get_conn():
+    # 요청마다 열고 닫지 않고 스레드별 연결 1개를 재사용
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH)
+        _local.conn = conn
+    _ensure_index(conn)
+    return conn
+
+
+def find_cert_info(cert_nos):
+    """시험번호 목록 → {시험번호: {'cert_id', 'product_name', 'total_wd'}} (없는 번호는 빠짐)"""
+    nos = list(dict.fromkeys(cert_nos))
+    found = {}
+    conn = _get_conn()
+    for i in range(0, len(nos), _SQL_CHUNK):
+        chunk = nos[i:i + _SQL_CHUNK]
+        query = (
+            'SELECT 시험번호, 인증번호, 제품, 총WD FROM sw_data '
+            f'WHERE 시험번호 IN ({",".join("?" * len(chunk))}) ORDER BY 시험번호, 일련번호'
+        )
+        # 번호마다 일련번호가 가장 작은 행(기존 단건 조회와 같은 행)이 먼저 온다
+        for no, cert_id, product_name, total_wd in conn.execute(query, chunk):
+            found.setdefault(no, {
+                'cert_id': cert_id,
+                'product_name': product_name,
+                'total_wd': total_wd,
+            })
+    return found
+
 
 def lookup_cert_info(request):
     cert_no = request.GET.get('cert_no')
@@ -10,24 +72,42 @@ def lookup_cert_info(request):
         return JsonResponse({'success': False, 'message': '제품 번호가 필요합니다.'}, status=400)
 
     try:
-        db_path = 'main/data/reference.db'
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        query = "SELECT 인증번호, 제품, 총WD FROM sw_data WHERE 시험번호 = ?"
-        cursor.execute(query, (cert_no,))
-        
-        result = cursor.fetchone()
-        conn.close()
-
-        if result:
-            data = {
-                'cert_id': result[0],
-                'product_name': result[1],
-                'total_wd': result[2]
-            }
-            return JsonResponse({'success': True, 'data': data})
-        else:
-            return JsonResponse({'success': False, 'message': '해당 번호의 제품을 찾을 수 없습니다.'})
+        data = find_cert_info([cert_no]).get(cert_no)
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': f'데이터베이스 조회 중 오류 발생: {e}'}, status=500)
+
+    if data:
+        return JsonResponse({'success': True, 'data': data})
+    return JsonResponse({'success': False, 'message': '해당 번호의 제품을 찾을 수 없습니다.'})
+
 
+@require_GET
+def lookup_cert_info_batch(request):
+    """
+    여러 시험번호를 한 번에 조회
+    - ?cert_no=A&cert_no=B 또는 ?cert_no=A,B (공백/쉼표/세미콜론 구분)
+    - 응답: {'success': True, 'data': {번호: {...}}, 'missing': [못 찾은 번호]}
+    """
+    nos = [
+        no.upper()
+        for value in request.GET.getlist('cert_no')
+        for no in _SPLIT_RE.split(value)
+        if no
+    ]
+    nos = list(dict.fromkeys(nos))
+
+    if not nos:
+        return JsonResponse({'success': False, 'message': '제품 번호가 필요합니다.'}, status=400)
+    if len(nos) > MAX_BATCH:
+        return JsonResponse({'success': False, 'message': f'한 번에 최대 {MAX_BATCH}개까지 조회할 수 있습니다.'}, status=400)
+
+    try:
+        data = find_cert_info(nos)
     except Exception as e:
         return JsonResponse({'success': False, 'message': f'데이터베이스 조회 중 오류 발생: {e}'}, status=500)
+
+    return JsonResponse({
+        'success': True,
+        'data': data,
+        'missing': [no for no in nos if no not in data],
+    })
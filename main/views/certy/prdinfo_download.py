@@ -11,9 +11,29 @@ from openpyxl import load_workbook
 from openpyxl.styles import Alignment
 from openpyxl.utils import coordinate_to_tuple, get_column_letter
 
+from .prdinfo_xlsx_patch import PrdinfoTemplatePatcher
+
 # 원본 템플릿 경로 (기존과 동일)
 ORIGIN_XLSX_PATH = os.path.join(settings.BASE_DIR, "main/data/prdinfo.xlsx")
 
+# 템플릿 XML 패치 경로 사용 여부 ("0"이면 항상 openpyxl load/save)
+FAST_DOWNLOAD = os.environ.get("PRDINFO_FAST_DOWNLOAD", "1") != "0"
+
+SHEET_PRD = "제품 정보 요청"
+SHEET_DEF = "결함정보"
+PRD_SINGLE_CELLS = ["B9", "D9", "F9", "G9", "H9", "J9", "L9"]
+
+
+def _row_addrs(row: int, col_start: str, col_end: str):
+    return [f"{chr(c)}{row}" for c in range(ord(col_start), ord(col_end) + 1)]
+
+
+# 값 기록 + wrap 적용 대상 셀
+WRAP_CELLS = {
+    SHEET_PRD: _row_addrs(5, "B", "N") + _row_addrs(7, "B", "N") + PRD_SINGLE_CELLS,
+    SHEET_DEF: _row_addrs(4, "B", "O"),
+}
+
 # ── 템플릿 바이트 캐시 (디스크 I/O 병목 제거)
 _TEMPLATE_BYTES = None
 _TEMPLATE_LOCK = threading.Lock()
@@ -28,13 +48,25 @@ def _get_template_bytes() -> bytes:
                 _TEMPLATE_BYTES = f.read()
     return _TEMPLATE_BYTES
 
-def _write_row(ws, start_cell: str, values):
+# ── 템플릿 패처 캐시 (zip 엔트리/시트 XML/wrap 서식을 프로세스당 1회 준비)
+_PATCHER = None
+
+def _get_patcher() -> PrdinfoTemplatePatcher:
+    global _PATCHER
+    if _PATCHER is not None:
+        return _PATCHER
+    tpl_bytes = _get_template_bytes()
+    with _TEMPLATE_LOCK:
+        if _PATCHER is None:
+            _PATCHER = PrdinfoTemplatePatcher(tpl_bytes, WRAP_CELLS)
+    return _PATCHER
+
+def _row_values(start_cell: str, values):
     """
-    start_cell부터 오른쪽으로 values를 순서대로 기록(B5 -> C5 -> ...).
+    start_cell부터 오른쪽으로 values를 순서대로 배치(B5 -> C5 -> ...) → {주소: 값}
     """
     row, col = coordinate_to_tuple(start_cell)
-    for i, v in enumerate(values):
-        ws[f"{get_column_letter(col + i)}{row}"] = "" if v is None else v
+    return {f"{get_column_letter(col + i)}{row}": ("" if v is None else v) for i, v in enumerate(values)}
 
 def _enable_wrap(ws, addr: str):
     """
@@ -48,15 +80,65 @@ def _enable_wrap(ws, addr: str):
         wrap_text=True
     )
 
-def _enable_wrap_row(ws, row: int, col_start_letter: str, col_end_letter: str):
+def _cell_values(payload) -> dict:
+    """
+    요청 페이로드 → {시트명: {주소: 값}}
+
+    기대 페이로드:
+    {
+      "prdinfo": {
+          "row_B5_N5": [...13],
+          "row_B7_N7": [...13],
+          "B9": str, "D9": str, "F9": str, "G9": str, "H9": str, "J9": str, "L9": str
+      },
+      "defect": {
+          "row_B4_O4": [...14]    # ← (신규) B..O
+          # (하위호환) "row_B4_N4": [...13]
+      }
+    }
+    """
+    prdinfo = payload.get("prdinfo", {})
+    defect  = payload.get("defect", {})
+
+    prd = {}
+    prd.update(_row_values("B5", prdinfo.get("row_B5_N5", [])))   # B5 ~ N5
+    prd.update(_row_values("B7", prdinfo.get("row_B7_N7", [])))   # B7 ~ N7
+    for addr in PRD_SINGLE_CELLS:
+        prd[addr] = prdinfo.get(addr, "")
+
+    # 결함정보: O열까지 우선 사용, 없으면 N열까지 하위호환
+    vals_B4_O4 = defect.get("row_B4_O4")
+    if vals_B4_O4 is None:
+        vals_B4_O4 = defect.get("row_B4_N4", [])
+    dfc = _row_values("B4", vals_B4_O4) if vals_B4_O4 is not None else {}
+
+    return {SHEET_PRD: prd, SHEET_DEF: dfc}
+
+def _fill_with_openpyxl(values: dict) -> bytes:
+    """템플릿 전체를 openpyxl로 load → 값/wrap 기록 → save (패치 경로로 처리할 수 없을 때)"""
+    wb = load_workbook(BytesIO(_get_template_bytes()))
+    for sheet, cells in values.items():
+        ws = wb[sheet]
+        # 멀티라인은 문자열에 '\n' 포함 그대로 기록
+        for addr, v in cells.items():
+            ws[addr] = v
+    # 랩 텍스트(wrap) 적용: 엑셀에서 \n 줄바꿈이 보이도록
+    for sheet, addrs in WRAP_CELLS.items():
+        for addr in addrs:
+            _enable_wrap(wb[sheet], addr)
+    out = BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+def render_filled_xlsx(values: dict) -> bytes:
     """
-    같은 행의 연속 범위(B..N 같은) 모든 셀에 wrap 적용.
+    {시트명: {주소: 값}} → 채워진 템플릿 xlsx 바이트 (다운로드 뷰/일괄 생성 명령 공용)
+    - 패치 경로 우선, 불가하면 openpyxl (템플릿에 시트가 없으면 KeyError)
     """
-    start_col = ord(col_start_letter.upper())
-    end_col = ord(col_end_letter.upper())
-    for c in range(start_col, end_col + 1):
-        addr = f"{chr(c)}{row}"
-        _enable_wrap(ws, addr)
+    data = _get_patcher().render(values) if FAST_DOWNLOAD else None
+    if data is None:
+        data = _fill_with_openpyxl(values)
+    return data
 
 @require_POST
 @csrf_protect
@@ -64,6 +146,7 @@ def download_filled_prdinfo(request):
     """
     Luckysheet에서 지정된 범위의 값을 받아 템플릿 사본에 채워서 즉시 다운로드 응답.
     서버 파일에는 저장하지 않음.
+    - 기본: 템플릿 시트 XML의 대상 셀만 패치(prdinfo_xlsx_patch), 불가하면 openpyxl 경로
     """
     # ── JSON 파싱
     try:
@@ -71,72 +154,18 @@ def download_filled_prdinfo(request):
     except Exception:
         return HttpResponseBadRequest("Invalid JSON")
 
-    # 기대 페이로드:
-    # {
-    #   "prdinfo": {
-    #       "row_B5_N5": [...13],
-    #       "row_B7_N7": [...13],
-    #       "B9": str, "D9": str, "F9": str, "G9": str, "H9": str, "J9": str, "L9": str
-    #   },
-    #   "defect": {
-    #       "row_B4_O4": [...14]    # ← (신규) B..O
-    #       # (하위호환) "row_B4_N4": [...13]
-    #   }
-    # }
     try:
-        prdinfo = payload.get("prdinfo", {})
-        defect  = payload.get("defect", {})
-
-        vals_B5_N5 = prdinfo.get("row_B5_N5", [])
-        vals_B7_N7 = prdinfo.get("row_B7_N7", [])
-        B9 = prdinfo.get("B9", ""); D9 = prdinfo.get("D9", "")
-        F9 = prdinfo.get("F9", ""); G9 = prdinfo.get("G9", "")
-        H9 = prdinfo.get("H9", ""); J9 = prdinfo.get("J9", "")
-        L9 = prdinfo.get("L9", "")
-
-        # 결함정보: O열까지 우선 사용, 없으면 N열까지 하위호환
-        vals_B4_O4 = defect.get("row_B4_O4")
-        if vals_B4_O4 is None:
-            vals_B4_O4 = defect.get("row_B4_N4", [])
+        values = _cell_values(payload)
     except Exception:
         return HttpResponseBadRequest("Missing fields")
 
-    # ── 템플릿 메모리 사본 로드
-    tpl_bytes = _get_template_bytes()
-    wb = load_workbook(BytesIO(tpl_bytes))
     try:
-        ws_prd = wb["제품 정보 요청"]
-        ws_def = wb["결함정보"]
+        data = render_filled_xlsx(values)
     except KeyError:
         return HttpResponseBadRequest("템플릿에 필요한 시트가 없습니다. (제품 정보 요청 / 결함정보)")
 
-    # ── 값 채우기(멀티라인은 문자열에 '\n' 포함 그대로 기록)
-    # 제품 정보 요청
-    _write_row(ws_prd, "B5", vals_B5_N5)   # B5 ~ N5
-    _write_row(ws_prd, "B7", vals_B7_N7)   # B7 ~ N7
-    ws_prd["B9"] = B9; ws_prd["D9"] = D9; ws_prd["F9"] = F9
-    ws_prd["G9"] = G9; ws_prd["H9"] = H9; ws_prd["J9"] = J9; ws_prd["L9"] = L9
-
-    # 결함정보 (B4 ~ O4)
-    if vals_B4_O4 is not None:
-        _write_row(ws_def, "B4", vals_B4_O4)
-
-    # ── 랩 텍스트(wrap) 적용: 엑셀에서 \n 줄바꿈이 보이도록
-    _enable_wrap_row(ws_prd, 5, "B", "N")
-    _enable_wrap_row(ws_prd, 7, "B", "N")
-    for addr in ["B9", "D9", "F9", "G9", "H9", "J9", "L9"]:
-        _enable_wrap(ws_prd, addr)
-
-    # 결함정보 B..O (O까지)
-    _enable_wrap_row(ws_def, 4, "B", "O")
-
-    # ── 메모리에 저장 후 즉시 다운로드
-    out = BytesIO()
-    wb.save(out)
-    out.seek(0)
-
     resp = HttpResponse(
-        out.getvalue(),
+        data,
         content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     )
     resp["Content-Disposition"] = 'attachment; filename="prdinfo_filled.xlsx"'
@@ -1,13 +1,61 @@
 from django.http import JsonResponse, HttpResponseBadRequest
 from django.views.decorators.http import require_POST
-import io
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import os
+import threading
+import time
 
+from main.utils.resources import get_resource, register
 from .prdinfo_parse_agreement import extract_process1_docx_basic
-from .prdinfo_parse_report import extract_process2_docx_overview
+from .prdinfo_parse_report import extract_process2_docx_overview, enrich_process2
 from .prdinfo_parse_defects import extract_process3_xlsx_defects
 from .prdinfo_fillmap import build_fill_map
 
 ALLOWED_MAX_FILES = 3
+# 작업(합의서/성적서/SW분류·키워드/결함리포트)별 제한 시간(초, 작업이 실행을 시작한 시각부터)
+TASK_TIMEOUT = float(os.environ.get("PRDINFO_TASK_TIMEOUT", 60))
+# 공유 스레드 수: 요청 1건이 작업을 최대 4개 쓰므로 동시 요청 4건분 (GPT 대기는 I/O라 스레드가 많아도 된다)
+PRDINFO_WORKERS = int(os.environ.get("PRDINFO_WORKERS", 16))
+
+@register("prdinfo_executor")
+def _make_prdinfo_executor():
+    # 파싱(lxml/openpyxl)과 GPT 대기를 겹쳐 실행: 응답 시간 ≈ 가장 느린 작업
+    return ThreadPoolExecutor(max_workers=max(1, PRDINFO_WORKERS), thread_name_prefix="prdinfo")
+
+def _timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, round((time.perf_counter() - t0) * 1000)
+
+class _Task:
+    """
+    실행 시작 시각 기준 제한 시간으로 결과를 기다리는 작업 1개
+    - 공유 풀이 다른 요청으로 차 있으면 대기열에서 기다린 시간은 제한 시간에 넣지 않고 queue_ms로 따로 보고
+    - 대기열에서도 TASK_TIMEOUT 넘게 시작하지 못하면 취소하고 시간 초과로 본다
+    """
+
+    def __init__(self, executor, fn, *args, **kwargs):
+        self.submitted = time.monotonic()
+        self.started_at = None
+        self._started = threading.Event()
+        self.future = executor.submit(self._run, fn, *args, **kwargs)
+
+    def _run(self, fn, *args, **kwargs):
+        self.started_at = time.monotonic()
+        self._started.set()
+        return _timed(fn, *args, **kwargs)
+
+    @property
+    def queue_ms(self):
+        end = self.started_at if self.started_at is not None else time.monotonic()
+        return round((end - self.submitted) * 1000)
+
+    def result(self):
+        """(결과, 소요 ms). 제한 시간 초과 시 FutureTimeoutError (실행 중인 스레드는 중단되지 않음)"""
+        if not self._started.wait(TASK_TIMEOUT) and self.future.cancel():
+            raise FutureTimeoutError()
+        self._started.wait()  # cancel()이 실패했다면 방금 시작한 것
+        return self.future.result(timeout=max(0.0, self.started_at + TASK_TIMEOUT - time.monotonic()))
 
 def _classify_files(files):
     p1, p2, p3 = [], [], []
@@ -32,27 +80,56 @@ def generate_prdinfo(request):
     p1_files, p2_files, p3_files = _classify_files(files)
 
     list1, list2, list3 = [], [], []
+    timings = {}
+    t_start = time.perf_counter()
+    executor = get_resource("prdinfo_executor")
 
-    for f in p1_files[:1]:
-        try:
-            result = extract_process1_docx_basic(f.read(), f.name)
-            list1.append(result)
-        except Exception as e:
-            list1.append(f"({f.name}) 내용에 문제가 있습니다: {e}")
+    # 세 입력을 동시에 파싱 (업로드 파일은 요청 스레드에서 읽어 둔다)
+    jobs = []
+    for group, fn, out, key in (
+        (p1_files, extract_process1_docx_basic, list1, "agreement_ms"),
+        (p2_files, extract_process2_docx_overview, list2, "report_ms"),
+        (p3_files, extract_process3_xlsx_defects, list3, "defects_ms"),
+    ):
+        for f in group[:1]:
+            kwargs = {"enrich": False} if fn is extract_process2_docx_overview else {}
+            jobs.append((f, out, key, _Task(executor, fn, f.read(), f.name, **kwargs)))
 
-    for f in p2_files[:1]:
+    def collect(f, out, key, task):
         try:
-            result = extract_process2_docx_overview(f.read(), f.name)
-            list2.append(result)
+            result, timings[key] = task.result()
+            out.append(result)
+            return result
+        except FutureTimeoutError:
+            timings[key] = None
+            out.append(f"({f.name}) 처리 시간이 초과되었습니다. ({TASK_TIMEOUT:g}초)")
         except Exception as e:
-            list2.append(f"({f.name}) 내용에 문제가 있습니다: {e}")
+            out.append(f"({f.name}) 내용에 문제가 있습니다: {e}")
+        finally:
+            timings[key.replace("_ms", "_queue_ms")] = task.queue_ms
+        return None
 
-    for f in p3_files[:1]:
-        try:
-            result = extract_process3_xlsx_defects(f.read(), f.name)
-            list3.append(result)
-        except Exception as e:
-            list3.append(f"({f.name}) 내용에 문제가 있습니다: {e}")
+    # 성적서가 끝나는 대로 SW분류/키워드(로컬 엔진 또는 GPT)를 시작 → 합의서/결함 파싱과 겹친다
+    report_job = next((j for j in jobs if j[1] is list2), None)
+    if report_job is not None:
+        jobs.remove(report_job)
+        parsed = collect(*report_job)
+        if isinstance(parsed, dict):
+            # 사본으로 실행: 시간 초과 후에도 스레드가 응답 객체를 건드리지 않게
+            classify = _Task(executor, enrich_process2, dict(parsed))
+            try:
+                list2[-1], timings["classify_ms"] = classify.result()
+            except FutureTimeoutError:
+                # 분류/키워드 없이 파싱 결과만 사용
+                timings["classify_ms"] = None
+            except Exception as e:
+                print(f"키워드 추출 실패: {e}")
+            timings["classify_queue_ms"] = classify.queue_ms
+
+    for job in jobs:
+        collect(*job)
+
+    timings["total_ms"] = round((time.perf_counter() - t_start) * 1000)
 
     obj1 = next((x for x in list1 if isinstance(x, dict)), None) or {}
     obj2 = next((x for x in list2 if isinstance(x, dict)), None) or {}
@@ -66,5 +143,6 @@ def generate_prdinfo(request):
         "list2": list2,
         "list3": list3,
         "fillMap": fill_map,
-        "gsNumber": gs_number or ""
+        "gsNumber": gs_number or "",
+        "timings": timings,
     })
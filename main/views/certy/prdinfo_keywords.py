@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+ngram_table.npz 기반 로컬 키워드 추출 (GPT 호출 대체)
+- 설명문을 1회 임베딩 → 모든 n-gram 벡터와 행렬곱 1번으로 유사도 계산
+- 점수 = 유사도 × IDF(정규화) − GENERIC_PENALTY × (generic centroid 유사도)
+- 설명문에 실제 등장하는 n-gram을 우선, 부족하면 전체 vocab에서 보충
+"""
+
+import os
+
+import numpy as np
+
+from main.utils.ngram_to_faiss import load_ngram_table, OUT_NPZ
+from main.utils.resources import get_resource, register
+
+GENERIC_PENALTY = 0.35
+TOP_K = 2
+
+
+class KeywordEngine:
+    def __init__(self, table, encoder):
+        self.vocab = table["vocab"]
+        self._compact = [w.replace(" ", "") for w in self.vocab]
+        # 디스크는 float16(mmap), 연산은 BLAS가 타는 float32로 1회 변환해 상주
+        self.vectors = np.asarray(table["vectors"], dtype="float32")
+        idf = np.asarray(table["idf"], dtype="float32")
+        self.idf_weight = idf / (idf.max() if idf.size else 1.0)
+        # generic 유사도는 질의와 무관하므로 로드 시 1회만 계산
+        g = np.asarray(table["generic_centroid"], dtype="float32")
+        self.generic_sim = self.vectors @ g
+        self.encoder = encoder
+
+    def _encode(self, text: str) -> np.ndarray:
+        q = self.encoder.encode([text], normalize_embeddings=True)[0]
+        return np.asarray(q, dtype="float32")
+
+    def scores(self, text: str) -> np.ndarray:
+        sim = self.vectors @ self._encode(text)
+        return sim * self.idf_weight - GENERIC_PENALTY * self.generic_sim
+
+    def extract(self, text: str, k: int = TOP_K):
+        text = (text or "").strip()
+        if not text or not self.vocab:
+            return []
+        scores = self.scores(text)
+        order = np.argsort(-scores)
+
+        compact = text.replace(" ", "")
+        in_text = [i for i in order if self._compact[i] in compact]
+        seen = set(in_text)
+        ranked = in_text + [i for i in order[: k * 20] if i not in seen]
+
+        # 이미 고른 키워드에 포함되거나 포함하는 n-gram은 건너뜀(중복 표현 방지)
+        out = []
+        for i in ranked:
+            w = self.vocab[i]
+            if any(w in o or o in w for o in out):
+                continue
+            out.append(w)
+            if len(out) >= k:
+                break
+        return out
+
+
+@register("keyword_engine")
+def _make_keyword_engine():
+    """테이블 mmap + 인코더. 테이블이 없으면 None(재생성 후 reset_resource로 다시 로드)."""
+    if not os.path.exists(OUT_NPZ):
+        return None
+    return KeywordEngine(load_ngram_table(OUT_NPZ), get_resource("encoder"))
+
+
+def extract_keywords(text: str, k: int = TOP_K):
+    """로컬 키워드 top-k. 엔진을 쓸 수 없으면 빈 리스트."""
+    try:
+        engine = get_resource("keyword_engine")
+    except Exception as e:
+        print(f"키워드 엔진 로드 실패: {e}")
+        return []
+    if engine is None:
+        return []
+    return engine.extract(text, k)
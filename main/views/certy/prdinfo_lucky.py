@@ -0,0 +1,451 @@
+"""
+prdinfo 템플릿(xlsx) → Luckysheet 시트 JSON 서버 변환
+- 브라우저가 매번 xlsx를 받아 LuckyExcel로 변환하던 것을 서버에서 1회 변환
+- 원본 파일의 (mtime, 크기)가 바뀔 때만 다시 변환하고, gzip(+brotli 설치 시 br) 압축본을 메모리에 보관
+- 변환 결과는 원본 내용 해시로 디스크에도 저장 → 프로세스 재시작 시 재변환 없음
+"""
+
+import colorsys
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zipfile
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, Optional
+from xml.etree import ElementTree as ET
+
+from django.conf import settings
+from openpyxl import load_workbook
+from openpyxl.styles.colors import COLOR_INDEX
+from openpyxl.worksheet.cell_range import MultiCellRange
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 gzip만 제공
+    brotli = None
+
+ORIGIN_XLSX_PATH = os.path.join(settings.BASE_DIR, "main/data/prdinfo.xlsx")
+CACHE_DIR = Path(settings.BASE_DIR) / "main/data/prdinfo_lucky"
+
+# 변환 규칙이 바뀌면 올려서 디스크 캐시를 무효화
+CONVERTER_VERSION = 3
+
+# Luckysheet 기본 시트 크기(행/열) — 템플릿이 더 작아도 편집 여유를 둔다
+MIN_ROWS, MIN_COLS = 84, 60
+
+_A_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+_S_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_R_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_X14_NS = "{http://schemas.microsoft.com/office/spreadsheetml/2009/9/main}"
+_XM_NS = "{http://schemas.microsoft.com/office/excel/2006/main}"
+_THEME_ORDER = ("lt1", "dk1", "lt2", "dk2", "accent1", "accent2", "accent3",
+                "accent4", "accent5", "accent6", "hlink", "folHlink")
+
+# Excel 테두리 스타일 → Luckysheet 번호
+_BORDER_STYLES = {
+    "thin": 1, "hair": 2, "dotted": 3, "dashed": 4, "dashDot": 5, "dashDotDot": 6,
+    "double": 7, "medium": 8, "mediumDashed": 9, "mediumDashDot": 10,
+    "mediumDashDotDot": 11, "slantDashDot": 12, "thick": 13,
+}
+_H_ALIGN = {"center": "0", "centerContinuous": "0", "left": "1", "right": "2"}
+_V_ALIGN = {"center": "0", "top": "1", "bottom": "2"}
+_ROTATION = {45: "1", 135: "2", 255: "3", 90: "4", 180: "5"}
+
+
+# ─────────────────────────────────────────────────────────────
+# 색상
+# ─────────────────────────────────────────────────────────────
+def _theme_palette(theme_xml: Optional[bytes]):
+    if not theme_xml:
+        return []
+    try:
+        root = ET.fromstring(theme_xml)
+    except ET.ParseError:
+        return []
+    scheme = root.find(f".//{_A_NS}clrScheme")
+    if scheme is None:
+        return []
+    colors = {}
+    for slot in scheme:
+        name = slot.tag.replace(_A_NS, "")
+        for child in slot:
+            value = child.get("lastClr") or child.get("val")
+            if value and len(value) == 6:
+                colors[name] = value.upper()
+    return [colors.get(name) for name in _THEME_ORDER]
+
+
+def _apply_tint(rgb: str, tint: float) -> str:
+    if not tint:
+        return rgb
+    r, g, b = (int(rgb[i:i + 2], 16) / 255 for i in (0, 2, 4))
+    h, l, s = colorsys.rgb_to_hls(r, g, b)
+    l = l * (1 + tint) if tint < 0 else l * (1 - tint) + tint
+    r, g, b = colorsys.hls_to_rgb(h, min(max(l, 0.0), 1.0), s)
+    return "".join(f"{round(v * 255):02X}" for v in (r, g, b))
+
+
+def _color(color, palette) -> Optional[str]:
+    """openpyxl Color → '#rrggbb' (자동/시스템색은 None)"""
+    if color is None:
+        return None
+    rgb = None
+    if color.type == "rgb" and isinstance(color.rgb, str):
+        rgb = color.rgb[-6:]
+    elif color.type == "indexed" and isinstance(color.indexed, int):
+        if color.indexed < len(COLOR_INDEX):
+            rgb = COLOR_INDEX[color.indexed][-6:]
+    elif color.type == "theme" and isinstance(color.theme, int):
+        if color.theme < len(palette):
+            rgb = palette[color.theme]
+    if not rgb:
+        return None
+    return "#" + _apply_tint(rgb.upper(), color.tint or 0).lower()
+
+
+# ─────────────────────────────────────────────────────────────
+# 셀/시트 변환
+# ─────────────────────────────────────────────────────────────
+def _cell_value(cell) -> Dict[str, Any]:
+    value = cell.value
+    if value is None:
+        return {}
+    if isinstance(value, str) and value.startswith("=") and cell.data_type == "f":
+        return {"f": value, "ct": {"fa": "General", "t": "g"}}
+    if isinstance(value, bool):
+        return {"v": value, "m": str(value).upper(), "ct": {"fa": "General", "t": "b"}}
+    if isinstance(value, (int, float)):
+        fmt = cell.number_format or "General"
+        return {"v": value, "m": str(value), "ct": {"fa": fmt, "t": "n"}}
+    if hasattr(value, "isoformat"):
+        text = value.isoformat(sep=" ") if hasattr(value, "hour") and hasattr(value, "day") else value.isoformat()
+        return {"v": text, "m": text, "ct": {"fa": "@", "t": "s"}}
+    text = str(value)
+    return {"v": text, "m": text, "ct": {"fa": "General", "t": "g"}}
+
+
+def _cell_style(cell, palette) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    font = cell.font
+    if font is not None:
+        if font.name:
+            out["ff"] = font.name
+        if font.sz:
+            out["fs"] = int(font.sz) if float(font.sz).is_integer() else float(font.sz)
+        fc = _color(font.color, palette)
+        if fc:
+            out["fc"] = fc
+        if font.b:
+            out["bl"] = 1
+        if font.i:
+            out["it"] = 1
+        if font.strike:
+            out["cl"] = 1
+        if font.u:
+            out["un"] = 1
+    fill = cell.fill
+    if fill is not None and getattr(fill, "patternType", None) == "solid":
+        bg = _color(fill.fgColor, palette)
+        if bg:
+            out["bg"] = bg
+    align = cell.alignment
+    if align is not None:
+        if align.horizontal in _H_ALIGN:
+            out["ht"] = _H_ALIGN[align.horizontal]
+        out["vt"] = _V_ALIGN.get(align.vertical, "2")  # Excel 기본 수직 정렬은 아래
+        if align.wrap_text:
+            out["tb"] = "2"
+        rotation = _ROTATION.get(int(align.textRotation or 0))
+        if rotation:
+            out["tr"] = rotation
+    return out
+
+
+def _cell_border(cell, palette) -> Optional[Dict[str, Any]]:
+    border = cell.border
+    if border is None:
+        return None
+    sides = {}
+    for key, side in (("l", border.left), ("r", border.right), ("t", border.top), ("b", border.bottom)):
+        style = _BORDER_STYLES.get(getattr(side, "style", None))
+        if style:
+            sides[key] = {"style": style, "color": _color(side.color, palette) or "#000000"}
+    return sides or None
+
+
+def _col_px(width: float) -> int:
+    # 글자 폭(기본 글꼴 최대 자폭 7px) → 픽셀
+    return int(round(width * 7 + 5))
+
+
+def _row_px(height_pt: float) -> int:
+    return int(round(height_pt * 4 / 3))
+
+
+def _list_items(wb, ws, formula: str) -> Optional[str]:
+    """목록 유효성 검사 수식 → 쉼표로 이은 항목 (직접 입력 목록/같은 시트·다른 시트 범위/이름 정의)"""
+    formula = (formula or "").strip().lstrip("=")
+    if formula.startswith('"') and formula.endswith('"'):
+        return formula[1:-1]
+    defined = wb.defined_names.get(formula)
+    if defined is not None:
+        formula = defined.attr_text
+    target = ws
+    if "!" in formula:
+        sheet_name, formula = formula.rsplit("!", 1)
+        sheet_name = sheet_name.strip("'").replace("''", "'")
+        if sheet_name not in wb.sheetnames:
+            return None
+        target = wb[sheet_name]
+    if not formula:
+        return None
+    try:
+        cells = target[formula.replace("$", "")]
+    except (ValueError, KeyError):
+        return None
+    rows = cells if isinstance(cells, tuple) else ((cells,),)
+    flat = [c for row in rows for c in (row if isinstance(row, tuple) else (row,))]
+    return ",".join(str(c.value) for c in flat if c.value not in (None, ""))
+
+
+def _dropdown(items: str) -> Dict[str, Any]:
+    return {
+        "type": "dropdown", "type2": None, "value1": items, "value2": "",
+        "checked": False, "remote": False, "prohibitInput": False,
+        "hintShow": False, "hintText": "",
+    }
+
+
+def _x14_list_validations(raw: bytes) -> Dict[str, list]:
+    """
+    시트 XML의 x14 확장 목록 유효성 검사 → {시트 이름: [(수식, sqref)]}
+    - 다른 시트 범위를 참조하는 목록(예: SW분류!C2:C124)은 Excel이 extLst의 x14:dataValidation에 저장하고, openpyxl은 읽지 않는다
+    """
+    found: Dict[str, list] = {}
+    try:
+        with zipfile.ZipFile(BytesIO(raw)) as zf:
+            rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+            targets = {rel.get("Id"): rel.get("Target", "") for rel in rels}
+            workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+            for sheet in workbook.iter(f"{_S_NS}sheet"):
+                target = targets.get(sheet.get(f"{_R_NS}id"), "")
+                part = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+                if part not in zf.namelist():
+                    continue
+                root = ET.fromstring(zf.read(part))
+                for dv in root.iter(f"{_X14_NS}dataValidation"):
+                    formula = dv.find(f"{_X14_NS}formula1/{_XM_NS}f")
+                    sqref = dv.find(f"{_XM_NS}sqref")
+                    if dv.get("type") == "list" and formula is not None and sqref is not None:
+                        found.setdefault(sheet.get("name"), []).append((formula.text or "", sqref.text or ""))
+    except (zipfile.BadZipFile, KeyError, ET.ParseError):
+        return {}
+    return found
+
+
+def _sheet_json(ws, order: int, active: bool, palette, x14_lists=()) -> Dict[str, Any]:
+    merge, mc_of = {}, {}
+    for rng in ws.merged_cells.ranges:
+        r0, c0 = rng.min_row - 1, rng.min_col - 1
+        rs, cs = rng.max_row - rng.min_row + 1, rng.max_col - rng.min_col + 1
+        merge[f"{r0}_{c0}"] = {"r": r0, "c": c0, "rs": rs, "cs": cs}
+        for r in range(r0, r0 + rs):
+            for c in range(c0, c0 + cs):
+                mc_of[(r, c)] = {"r": r0, "c": c0, "rs": rs, "cs": cs} if (r, c) == (r0, c0) else {"r": r0, "c": c0}
+
+    celldata, border_info, seen = [], [], set()
+    for row in ws.iter_rows():
+        for cell in row:
+            if not hasattr(cell, "column"):
+                continue
+            r, c = cell.row - 1, cell.column - 1
+            v = _cell_value(cell)
+            if cell.has_style:
+                v.update(_cell_style(cell, palette))
+                sides = _cell_border(cell, palette)
+                if sides:
+                    border_info.append({"rangeType": "cell", "value": {"row_index": r, "col_index": c, **sides}})
+            if (r, c) in mc_of:
+                v["mc"] = mc_of[(r, c)]
+            if cell.comment is not None:
+                # 셀 메모 → Luckysheet 주석(ps), 마우스를 올렸을 때만 표시
+                v["ps"] = {"left": None, "top": None, "width": None, "height": None,
+                           "value": cell.comment.text, "isshow": False}
+            if v:
+                celldata.append({"r": r, "c": c, "v": v})
+                seen.add((r, c))
+    # 병합 범위의 빈 셀도 mc 정보가 있어야 Luckysheet가 병합을 그린다
+    for (r, c), mc in mc_of.items():
+        if (r, c) not in seen:
+            celldata.append({"r": r, "c": c, "v": {"mc": mc}})
+
+    columnlen, colhidden = {}, {}
+    for dim in ws.column_dimensions.values():
+        if dim.min is None:
+            continue
+        for c in range(dim.min - 1, (dim.max or dim.min)):
+            if dim.width:
+                columnlen[str(c)] = _col_px(dim.width)
+            if dim.hidden:
+                colhidden[str(c)] = 0
+    rowlen, rowhidden = {}, {}
+    for idx, dim in ws.row_dimensions.items():
+        if dim.ht:
+            rowlen[str(idx - 1)] = _row_px(dim.ht)
+        if dim.hidden:
+            rowhidden[str(idx - 1)] = 0
+
+    lists = [(dv.formula1, dv.sqref) for dv in getattr(ws.data_validations, "dataValidation", []) if dv.type == "list"]
+    lists += [(formula, MultiCellRange(sqref)) for formula, sqref in x14_lists]
+    validations = {}
+    for formula, sqref in lists:
+        items = _list_items(ws.parent, ws, formula)
+        if items is None:
+            continue
+        rule = _dropdown(items)
+        for rng in sqref.ranges:
+            for r in range(rng.min_row - 1, rng.max_row):
+                for c in range(rng.min_col - 1, rng.max_col):
+                    validations[f"{r}_{c}"] = rule
+
+    fmt = ws.sheet_format
+    sheet = {
+        "name": ws.title,
+        "index": str(order),
+        "order": order,
+        "status": 1 if active else 0,
+        "hide": 0 if ws.sheet_state == "visible" else 1,
+        "row": max(ws.max_row, MIN_ROWS),
+        "column": max(ws.max_column, MIN_COLS),
+        "defaultRowHeight": _row_px(fmt.defaultRowHeight or 15),
+        "defaultColWidth": _col_px(fmt.defaultColWidth or (fmt.baseColWidth or 8) + 0.71),
+        "celldata": celldata,
+        "config": {
+            "merge": merge,
+            "borderInfo": border_info,
+            "columnlen": columnlen,
+            "rowlen": rowlen,
+            "colhidden": colhidden,
+            "rowhidden": rowhidden,
+        },
+        "dataVerification": validations,
+    }
+    if ws.sheet_view.showGridLines is False:
+        sheet["showGridLines"] = 0
+    if ws.freeze_panes:
+        r, c = ws[ws.freeze_panes].row - 1, ws[ws.freeze_panes].column - 1
+        sheet["frozen"] = {"type": "rangeBoth", "range": {"row_focus": r - 1, "column_focus": c - 1}}
+    return sheet
+
+
+def workbook_to_luckysheet(source) -> Dict[str, Any]:
+    """xlsx(경로/파일 객체) → {"info": {...}, "sheets": [...]} (LuckyExcel 변환 결과와 같은 모양)"""
+    if hasattr(source, "read"):
+        raw = source.read()
+    else:
+        with open(source, "rb") as f:
+            raw = f.read()
+    wb = load_workbook(BytesIO(raw))
+    palette = _theme_palette(wb.loaded_theme)
+    x14 = _x14_list_validations(raw)
+    active = wb.active.title if wb.active is not None else None
+    sheets = [
+        _sheet_json(ws, i, ws.title == active, palette, x14.get(ws.title, ()))
+        for i, ws in enumerate(wb.worksheets)
+    ]
+    props = wb.properties
+    return {
+        "info": {"name": props.title or Path(getattr(source, "name", str(source))).stem, "creator": props.creator or ""},
+        "sheets": sheets,
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# 압축본 캐시 (mtime 변경 시 재생성)
+# ─────────────────────────────────────────────────────────────
+class LuckyJson:
+    """변환 결과 1벌: ETag/Last-Modified와 인코딩별 본문"""
+
+    def __init__(self, gz: bytes, etag: str, last_modified: float):
+        self.gz = gz
+        self.br = brotli.compress(gzip.decompress(gz)) if brotli is not None else None
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def body(self, encoding: Optional[str]) -> bytes:
+        if encoding == "br":
+            return self.br
+        if encoding == "gzip":
+            return self.gz
+        return gzip.decompress(self.gz)
+
+
+_CACHE: Dict[str, Any] = {"key": None, "entry": None}
+_CACHE_LOCK = threading.Lock()
+
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _build(path: str, mtime: float) -> LuckyJson:
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw + f"v{CONVERTER_VERSION}".encode()).hexdigest()[:32]
+    cached = CACHE_DIR / f"{digest}.json.gz"
+    try:
+        gz = cached.read_bytes()
+    except FileNotFoundError:
+        data = json.dumps(workbook_to_luckysheet(path), ensure_ascii=False, separators=(",", ":"))
+        # mtime=0: 같은 입력 → 같은 압축 바이트
+        gz = gzip.compress(data.encode("utf-8"), compresslevel=9, mtime=0)
+        _write_atomic(cached, gz)
+    return LuckyJson(gz, digest, mtime)
+
+
+def get_lucky_json(path: str = ORIGIN_XLSX_PATH) -> Optional[LuckyJson]:
+    """현재 템플릿의 변환 결과 (파일이 없으면 None)"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    key = (path, st.st_mtime_ns, st.st_size)
+    if _CACHE["key"] == key:
+        return _CACHE["entry"]
+    with _CACHE_LOCK:
+        if _CACHE["key"] != key:
+            _CACHE["entry"] = _build(path, st.st_mtime)
+            _CACHE["key"] = key
+    return _CACHE["entry"]
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.strip().lower()] = q
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
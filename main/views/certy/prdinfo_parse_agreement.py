@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """
-DOCX 바이트(byts) → word/document.xml 파싱 후 '시험합의서' 21개 항목 추출
+DOCX 바이트(byts) → word/document.xml 스트리밍 파싱(main.utils.ooxml) 후 '시험합의서' 21개 항목 추출
 - 형식 불변(본 대화의 양식) 가정
 - 대표자/담당자 E-mail 충돌 방지:
   · 대표자: 라벨에 '대표자' 포함된 E-mail 라벨만 허용
@@ -9,12 +9,9 @@ DOCX 바이트(byts) → word/document.xml 파싱 후 '시험합의서' 21개 
            그리고 '대표자' 토큰이 보이면 즉시 제외
 """
 
-from io import BytesIO
-from zipfile import ZipFile
-from lxml import etree
 import re
 
-NS = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
+from main.utils.ooxml import W_TBL, iter_body, table_text_rows
 
 # ─────────────────────────────────────────────────────────────
 # 0) 빈 결과 템플릿
@@ -45,39 +42,14 @@ def _empty_process1():
     }
 
 # ─────────────────────────────────────────────────────────────
-# 1) DOCX → word/document.xml 로드
+# 1) 2) DOCX → 모든 표의 행(셀 텍스트: 줄바꿈/문단 보존)
+#    본문을 블록 단위로 스트리밍하며 블록 안의 표(중첩 표 포함, 문서 순서)를 읽는다
 # ─────────────────────────────────────────────────────────────
-def _read_document_xml_from_docx_bytes(byts: bytes):
-    with ZipFile(BytesIO(byts)) as zf:
-        with zf.open("word/document.xml") as f:
-            return etree.parse(f).getroot()
-
-# ─────────────────────────────────────────────────────────────
-# 2) 셀 텍스트 추출(줄바꿈/문단 보존)
-# ─────────────────────────────────────────────────────────────
-def _tc_text_with_newlines(tc) -> str:
-    parts = []
-    for p in tc.findall(".//w:p", namespaces=NS):
-        buf = []
-        for node in p.iter():
-            if node.tag == "{%s}t" % NS["w"]:
-                buf.append(node.text or "")
-            elif node.tag == "{%s}br" % NS["w"]:
-                buf.append("\n")
-        parts.append("".join(buf))
-    if not parts:
-        parts = ["".join(t.text or "" for t in tc.findall(".//w:t", namespaces=NS))]
-    text = "\n".join(parts)
-    # 공백 정리(줄바꿈은 유지)
-    text = re.sub(r"[ \t]+", " ", text)
-    return text.strip()
-
-def _all_table_rows(doc_root):
+def _all_table_rows(byts: bytes):
     rows = []
-    for tbl in doc_root.findall(".//w:tbl", namespaces=NS):
-        for tr in tbl.findall("./w:tr", namespaces=NS):
-            cells = tr.findall("./w:tc", namespaces=NS)
-            rows.append([_tc_text_with_newlines(tc) for tc in cells])
+    for block in iter_body(byts):
+        for tbl in block.iter(W_TBL):
+            rows.extend(table_text_rows(tbl))
     return rows
 
 # ─────────────────────────────────────────────────────────────
@@ -261,12 +233,10 @@ def extract_process1_docx_basic(byts: bytes, filename: str):
     out = _empty_process1()
 
     try:
-        doc_root = _read_document_xml_from_docx_bytes(byts)
+        rows = _all_table_rows(byts)
     except Exception:
         return out  # 손상 파일 등 예외 시 빈 결과
 
-    rows = _all_table_rows(doc_root)
-
     # 1) 시험신청번호
     out["시험신청번호"] = _find_value_by_label(rows, ["시험신청번호"])
 
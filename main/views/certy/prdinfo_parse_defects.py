@@ -34,13 +34,55 @@ QUAL_ORDER = [
 ]
 DEG_ORDER = ["High", "Medium", "Low", "합계",]
 
+# (키워드, 제목 행에서 E열 시작 오프셋, 읽을 개수)
+_BLOCKS = (
+    ("품질특성별 결함내역", 2, len(QUAL_ORDER)),
+    ("결함정도별 결함내역", 2, len(DEG_ORDER)),
+)
+
+
+class _BlockScan:
+    """
+    D열 제목 행을 찾고 그 아래 E열 값을 모으는 상태(행 단위 스트리밍용)
+    - 정확 매칭이 우선, 없으면 첫 포함 매칭(안전망) — 전체 행을 모아 두고 찾던 방식과 같은 결과
+    - 정확 매칭 블록을 다 읽으면 done
+    """
+
+    def __init__(self, keyword, offset, count):
+        self.target = _flat(keyword)
+        self.offset, self.count = offset, count
+        self.exact = None      # (제목 행, E값 목록)
+        self.contains = None
+
+    @property
+    def done(self):
+        return self.exact is not None and len(self.exact[1]) >= self.count
+
+    def feed(self, r, d, e):
+        for hit in (self.exact, self.contains):
+            if hit is not None and hit[0] + self.offset <= r and len(hit[1]) < self.count:
+                hit[1].append(_to_int(_normalize_spaces(e)))
+        if self.exact is not None:
+            return
+        d_flat = _flat(_normalize_spaces(d))
+        if d_flat == self.target:
+            self.exact = (r, [])
+        elif self.contains is None and self.target in d_flat:
+            self.contains = (r, [])
+
+    def values(self):
+        hit = self.exact or self.contains
+        if hit is None:
+            return None
+        return (hit[1] + [0] * self.count)[:self.count]
+
+
 def extract_process3_xlsx_defects(byts_or_io, filename):
     # bytes/BytesIO 모두 허용
     if hasattr(byts_or_io, "read"):
         data = byts_or_io.read()
     else:
         data = byts_or_io
-    wb = load_workbook(BytesIO(data), data_only=True)
 
     out = {"결함차수": _defect_round_from_filename(filename)}
     for k in QUAL_ORDER:
@@ -48,57 +90,35 @@ def extract_process3_xlsx_defects(byts_or_io, filename):
     for k in DEG_ORDER:
         out[k] = {"수정전": 0, "최종": 0}
 
-    # 시트 찾기
-    sheet = None
-    for name in wb.sheetnames:
-        if _flat(name) == _flat("시험분석자료"):
-            sheet = wb[name]
-            break
-    if sheet is None:
-        return out  # 시트 없으면 초기값 리턴
-
-    # values[r][c] (0-based)
-    values = [[(cell.value if cell.value is not None else "") for cell in row] for row in sheet.iter_rows()]
-    H = len(values)
-
-    def txt(r, c):
-        try:
-            return _normalize_spaces(values[r][c])
-        except Exception:
-            return ""
-
-    def find_row_in_col_d(keyword: str):
-        target = _flat(keyword)
-        for r in range(H):
-            if _flat(txt(r, 3)) == target:  # D열(3)에서 정확 매칭
-                return r
-        # 정확 매칭 실패 시 포함 매칭으로 한 번 더 탐색(안전망)
-        for r in range(H):
-            if target in _flat(txt(r, 3)):
-                return r
-        return None
-
-    def pick_e_series(start_r: int, end_r: int):
-        # E열(index 4) start_r..end_r inclusive
-        res = []
-        for r in range(max(0, start_r), min(H, end_r + 1)):
-            res.append(_to_int(txt(r, 4)))
-        return res
+    # read_only: 대상 시트의 D/E열만 행 단위로 읽고, 두 블록을 다 읽으면 중단
+    wb = load_workbook(BytesIO(data), read_only=True, data_only=True)
+    try:
+        # 시트 찾기
+        sheet = None
+        for name in wb.sheetnames:
+            if _flat(name) == _flat("시험분석자료"):
+                sheet = wb[name]
+                break
+        if sheet is None:
+            return out  # 시트 없으면 초기값 리턴
 
-    # 1) 품질특성별 결함내역: D에서 찾고 E열 r+2..r+10 → 9개
-    rA = find_row_in_col_d("품질특성별 결함내역")
-    if rA is not None:
-        vals = pick_e_series(rA + 2, rA + 10)
-        vals = (vals + [0] * 9)[:9]
-        for i, key in enumerate(QUAL_ORDER):
-            out[key]["수정전"] = vals[i]
+        scans = [_BlockScan(*block) for block in _BLOCKS]
+        for r, row in enumerate(sheet.iter_rows(min_col=4, max_col=5, values_only=True)):
+            d, e = (tuple(row) + (None, None))[:2]
+            for scan in scans:
+                scan.feed(r, d, e)
+            if all(scan.done for scan in scans):
+                break
+    finally:
+        wb.close()
 
+    # 1) 품질특성별 결함내역: D에서 찾고 E열 r+2..r+10 → 9개
     # 2) 결함정도별 결함내역: D에서 찾고 E열 r+2..r+5 → 4개 (High, Medium, Low, 합계)
-    rB = find_row_in_col_d("결함정도별 결함내역")
-    if rB is not None:
-        vals = pick_e_series(rB + 2, rB + 5)
-        vals = (vals + [0] * 4)[:4]
-        for i, key in enumerate(DEG_ORDER):
+    for scan, keys in zip(scans, (QUAL_ORDER, DEG_ORDER)):
+        vals = scan.values()
+        if vals is None:
+            continue
+        for i, key in enumerate(keys):
             out[key]["수정전"] = vals[i]
 
     return out
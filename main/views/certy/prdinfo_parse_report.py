@@ -8,13 +8,15 @@ extract_process2_docx_overview(byts, filename) :
   4) 소요일수 합계(모든 표의 '소요일수/소요 일수' 열 숫자 합)
 """
 
-from io import BytesIO
-from zipfile import ZipFile
-from lxml import etree
+from main.utils.ooxml import W_P, W_TBL, XP_W_TEXT, iter_body, table_text_rows
 from .prdinfo_GPT import classify_sw_and_keywords
+from .prdinfo_keywords import extract_keywords
+from .prdinfo_classify import classify_sw
+import os
 import re
 
-NS = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
+# 로컬 키워드 추출이 비었을 때 GPT로 보완할지 여부 ("0"이면 GPT 호출 안 함)
+GPT_FALLBACK = os.environ.get("PRDINFO_GPT_FALLBACK", "1") != "0"
 
 # 결과 템플릿
 def _empty_process2():
@@ -25,56 +27,44 @@ def _empty_process2():
         "소요일수 합계": 0,            # int
     }
 
-# DOCX → word/document.xml 로드
-def _read_document_xml_from_docx_bytes(byts: bytes):
-    with ZipFile(BytesIO(byts)) as zf:
-        with zf.open("word/document.xml") as f:
-            return etree.parse(f).getroot()
-
 # 텍스트 유틸
-def _tc_text(tc) -> str:
-    """표 셀 텍스트: 줄바꿈/문단 유지"""
-    parts = []
-    for p in tc.findall(".//w:p", namespaces=NS):
-        buf = []
-        for node in p.iter():
-            if node.tag == "{%s}t" % NS["w"]:
-                buf.append(node.text or "")
-            elif node.tag == "{%s}br" % NS["w"]:
-                buf.append("\n")
-        parts.append("".join(buf))
-    if not parts:
-        parts = ["".join(t.text or "" for t in tc.findall(".//w:t", namespaces=NS))]
-    text = "\n".join(parts)
-    # 공백 정리(줄바꿈은 유지)
-    text = re.sub(r"[ \t]+", " ", text)
-    return text.strip()
-
-def _paragraph_text(p):
-    return "".join(t.text or "" for t in p.findall(".//w:t", namespaces=NS)).strip()
-
 def _normalize_ws(s: str) -> str:
     return re.sub(r"\s+", " ", (s or "").strip())
 
-# 문서 바디를 순서대로 직렬화: (kind, text) -> kind: 'p' | 'tbl_cell'
-def _iterate_body_as_lines(doc_root):
-    body = doc_root.find(".//w:body", namespaces=NS)
-    for child in body:
-        tag = etree.QName(child.tag).localname
-        if tag == "p":
-            txt = _paragraph_text(child)
+class ReportDocument:
+    """
+    본문 1회 순회 결과(추출기 4개가 공유)
+    - lines : 본문 순서로 직렬화한 (kind, text) 목록, kind: 'p' | 'tbl_cell'  → 시험기간/설명/주요 기능
+    - blob  : lines 텍스트를 줄바꿈으로 이은 문자열                            → 설명/주요 기능 정규식
+    - tables: 문서 내 모든 표(중첩 표 포함, 문서 순서)의 셀 텍스트 행렬       → 소요일수 합계
+    blocks는 본문 블록(w:p / w:tbl) iterable(ooxml.iter_body). 블록마다 필요한 텍스트만 뽑고 요소는 붙잡지 않는다.
+    """
+
+    def __init__(self, blocks):
+        self.tables, self.lines = [], []
+        for block in blocks:
+            self._read_block(block)
+        self.blob = "\n".join(text for _, text in self.lines)
+
+    @classmethod
+    def from_docx(cls, byts: bytes) -> "ReportDocument":
+        return cls(iter_body(byts))
+
+    def _read_block(self, block):
+        if block.tag == W_P:
+            txt = "".join(XP_W_TEXT(block)).strip()
             if txt:
-                yield ("p", txt)
-        elif tag == "tbl":
-            for tr in child.findall("./w:tr", namespaces=NS):
-                cells = tr.findall("./w:tc", namespaces=NS)
-                for tc in cells:
-                    t = _tc_text(tc)
-                    if t:
-                        for line in t.splitlines():
-                            line = line.strip()
-                            if line:
-                                yield ("tbl_cell", line)
+                self.lines.append(("p", txt))
+        # 블록 안의 모든 표(자기 자신 포함, 중첩 표는 바깥 표 다음) — 셀 텍스트는 셀마다 1번만
+        for tbl in block.iter(W_TBL):
+            rows = table_text_rows(tbl)
+            self.tables.append(rows)
+            if tbl is block:
+                self.lines.extend(
+                    ("tbl_cell", line.strip())
+                    for row in rows for t in row if t
+                    for line in t.splitlines() if line.strip()
+                )
 
 # 1) 시험기간 : 날짜 포함 라인 수집 (상단~첫 '7. 시험방법' 전)
 # 날짜 탐지 패턴(여러 형식 지원)
@@ -102,9 +92,9 @@ def _contains_date_like(s: str) -> bool:
             return True
     return False
 
-def _extract_period_lines(doc_root):
+def _extract_period_lines(doc: ReportDocument):
     lines = []
-    for kind, text in _iterate_body_as_lines(doc_root):
+    for kind, text in doc.lines:
         if "7. 시험방법" in text:
             break
         if _contains_date_like(text):
@@ -120,8 +110,8 @@ def _extract_period_lines(doc_root):
     return out
 
 # 2) 개요 및 특성(설명) : "본 제품은" ~ "으로 주요 기능은 다음과 같다" 직전
-def _extract_description(doc_root):
-    blob = "\n".join([text for _, text in _iterate_body_as_lines(doc_root)])
+def _extract_description(doc: ReportDocument):
+    blob = doc.blob
     # 엄격 → 완화 순으로 시도
     m = re.search(r"본\s*제품은\s*(?P<desc>.+?)\s*으로\s*주요\s*기능은\s*다음과\s*같다", blob, re.DOTALL)
     if not m:
@@ -129,11 +119,10 @@ def _extract_description(doc_root):
     return _normalize_ws(m.group("desc")) if m else ""
 
 # 3) 개요 및 특성(주요 기능) : "다음과 같다" 이후 ~ "※ 상세기능은" 직전
-def _extract_features(doc_root):
-    blob = "\n".join([text for _, text in _iterate_body_as_lines(doc_root)])
+def _extract_features(doc: ReportDocument):
     m = re.search(
         r"다음과\s*같다(?::|\.|\s)*\s*(?P<section>.*?)\s*(?:※\s*상세기능은|상세\s*기능은)",
-        blob, re.DOTALL
+        doc.blob, re.DOTALL
     )
     if not m:
         return []
@@ -161,26 +150,15 @@ def _extract_features(doc_root):
 # ─────────────────────────────────────────────────────────────
 # 4) 소요일수 합계 : 모든 표에서 '소요일수' 헤더 열의 숫자 합계
 # ─────────────────────────────────────────────────────────────
-def _extract_tables(doc_root):
-    return doc_root.findall(".//w:tbl", namespaces=NS)
-
-def _table_to_rows(tbl):
-    rows = []
-    for tr in tbl.findall("./w:tr", namespaces=NS):
-        cells = tr.findall("./w:tc", namespaces=NS)
-        rows.append([_tc_text(tc) for tc in cells])
-    return rows
-
 def _parse_int_like(s: str):
     if s is None:
         return None
     s2 = re.sub(r"[,\s]", "", s)
     return int(s2) if re.fullmatch(r"\d+", s2) else None
 
-def _sum_days(doc_root) -> int:
+def _sum_days(doc: ReportDocument) -> int:
     total = 0
-    for tbl in _extract_tables(doc_root):
-        rows = _table_to_rows(tbl)
+    for rows in doc.tables:
         if not rows:
             continue
         # 헤더에서 '소요일수/소요 일수' 위치 찾기
@@ -209,12 +187,13 @@ def _sum_days(doc_root) -> int:
 # ─────────────────────────────────────────────────────────────
 # 메인: byts, filename → out
 # ─────────────────────────────────────────────────────────────
-def extract_process2_docx_overview(byts: bytes, filename: str):
+def extract_process2_docx_overview(byts: bytes, filename: str, enrich: bool = True):
     """
     Parameters
     ----------
     byts : bytes   # .docx 파일 바이트
     filename : str # 파일명(로그용; 파싱엔 미사용)
+    enrich : bool  # False면 SW분류/키워드(enrich_process2)는 건너뜀 (호출 측에서 따로 실행)
 
     Returns
     -------
@@ -228,32 +207,48 @@ def extract_process2_docx_overview(byts: bytes, filename: str):
     """
     out = _empty_process2()
 
-    # 문서 파싱
+    # 문서 파싱(1회, 스트리밍) → 공유 문서 모델
     try:
-        doc_root = _read_document_xml_from_docx_bytes(byts)
+        doc = ReportDocument.from_docx(byts)
     except Exception as e:
-        print("결과보고서 파싱 실패:\n " + e)
+        print(f"결과보고서 파싱 실패:\n {e}")
         return out
 
     # 1) 시험기간
-    out["시험기간"] = _extract_period_lines(doc_root)
+    out["시험기간"] = _extract_period_lines(doc)
 
     # 2) 개요 및 특성(설명)
-    out["개요 및 특성(설명)"] = _extract_description(doc_root)
+    out["개요 및 특성(설명)"] = _extract_description(doc)
 
     # 3) 개요 및 특성(주요 기능)
-    out["개요 및 특성(주요 기능)"] = _extract_features(doc_root)
+    out["개요 및 특성(주요 기능)"] = _extract_features(doc)
 
     # 4) 소요일수 합계
-    out["소요일수 합계"] = _sum_days(doc_root)
+    out["소요일수 합계"] = _sum_days(doc)
 
+    return enrich_process2(out) if enrich else out
+
+def enrich_process2(out: dict):
+    """설명/주요 기능으로 SW분류·키워드를 채운다(로컬 우선, 필요 시 GPT). out을 갱신해 반환"""
     try:
         desc = out.get("개요 및 특성(설명)", "") or ""
         feats = out.get("개요 및 특성(주요 기능)", []) or []
         feats_text = "\n".join(feats) if isinstance(feats, list) else str(feats or "")
         payload = (desc + ("\n" if desc and feats_text else "") + feats_text).strip()
 
-        if payload:
+        # SW분류: FAISS 최근접 인증 제품의 분류 가중 투표 (원격 호출 전에 로컬로)
+        sw_local = classify_sw(payload) if payload else None
+        if sw_local:
+            out["SW분류"] = sw_local["label"]
+            out["SW분류 신뢰도"] = round(sw_local["confidence"], 3)
+
+        # 키워드: 로컬 n-gram 엔진 우선
+        local_keywords = extract_keywords(desc or payload) if payload else []
+        if local_keywords:
+            out["키워드"] = ", ".join(local_keywords)
+
+        # 로컬에서 못 채운 필드(SW분류 또는 키워드)가 있으면 GPT로 그 필드만 채운다
+        if payload and GPT_FALLBACK and ("SW분류" not in out or not local_keywords):
             res = classify_sw_and_keywords(payload)  # ~GPT.py: (SW분류, 키워드1, 키워드2) 리턴
 
             sw, k1, k2 = "", "", ""
@@ -268,15 +263,14 @@ def extract_process2_docx_overview(byts: bytes, filename: str):
                 k1 = str(res.get("keyword1") or res.get("키워드1") or "")
                 k2 = str(res.get("keyword2") or res.get("키워드2") or "")
 
-            # 결과 저장
-            if sw:
+            # 결과 저장 (로컬 결과는 덮어쓰지 않음)
+            if sw and "SW분류" not in out:
                 out["SW분류"] = sw
             keywords_joined = ", ".join([k for k in (k1, k2) if k])
-            if keywords_joined:
+            if keywords_joined and not local_keywords:
                 out["키워드"] = keywords_joined
 
     except Exception as e:
-        print("GPT 호출 실패: "+e)
-        pass
+        print(f"키워드 추출 실패: {e}")
 
     return out
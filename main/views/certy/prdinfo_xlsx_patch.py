@@ -0,0 +1,276 @@
+"""
+prdinfo.xlsx 템플릿 패치(openpyxl 전체 load/save 없이 다운로드 파일 생성)
+
+- 프로세스당 1회: 템플릿 zip 엔트리(압축 상태 그대로)와 두 시트 XML을 메모리에 올리고,
+  wrap 정렬용 셀 서식(xf)을 styles.xml에 추가한 사본을 미리 압축해 둔다.
+- 다운로드마다: 두 시트 XML에서 대상 셀(<c>)만 인라인 문자열/숫자 + wrap 서식으로 바꿔 압축하고,
+  나머지 엔트리는 압축된 바이트를 그대로 복사해 zip을 조립한다.
+- openpyxl 경로와 같은 결과(값/정렬)를 내며, 처리할 수 없는 값(수식 문자열, 제어문자, 템플릿에 없는 셀 등)은
+  None을 반환 → 호출 측이 openpyxl 경로로 처리한다.
+- openpyxl 저장과 마찬가지로 calcChain.xml은 제외한다(값으로 덮어쓴 수식 셀이 남지 않게).
+"""
+
+import math
+import re
+import struct
+import zipfile
+import zlib
+from io import BytesIO
+from typing import Dict, Iterable, Optional
+from xml.sax.saxutils import escape
+
+from openpyxl.utils import column_index_from_string
+
+_CALC_CHAIN = "xl/calcChain.xml"
+
+_CELL_RE = re.compile(r'<c r="([A-Z]+[0-9]+)"([^>]*?)(/>|>(.*?)</c>)', re.S)
+_S_ATTR_RE = re.compile(r'\ss="(\d+)"')
+_T_ATTR_RE = re.compile(r'\st="[^"]*"')
+_ALIGN_RE = re.compile(r"<alignment\b([^>]*)/>")
+_ATTR_RE = re.compile(r'([\w:]+)="([^"]*)"')
+# XML 1.0에서 허용되지 않는 제어문자(openpyxl은 IllegalCharacterError)
+_ILLEGAL_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _cell_sort_key(addr: str):
+    m = re.match(r"([A-Z]+)(\d+)", addr)
+    return int(m.group(2)), column_index_from_string(m.group(1))
+
+
+def _tag_attrs(xml: str, tag: str):
+    for m in re.finditer(rf"<{tag}\s([^>]*?)/?>", xml):
+        yield {k: _unescape_attr(v) for k, v in _ATTR_RE.findall(m.group(1))}
+
+
+def _sheet_paths(zf: zipfile.ZipFile) -> Dict[str, str]:
+    """시트 이름 → zip 내 XML 경로"""
+    rels = zf.read("xl/_rels/workbook.xml.rels").decode("utf-8")
+    targets = {a["Id"]: a["Target"] for a in _tag_attrs(rels, "Relationship")}
+    out = {}
+    for a in _tag_attrs(zf.read("xl/workbook.xml").decode("utf-8"), "sheet"):
+        target = targets[a["r:id"]].lstrip("/")
+        out[a["name"]] = target if target.startswith("xl/") else f"xl/{target}"
+    return out
+
+
+def _unescape_attr(value: str) -> str:
+    return value.replace("&lt;", "<").replace("&gt;", ">").replace("&quot;", '"').replace("&apos;", "'").replace("&amp;", "&")
+
+
+def _deflate(data: bytes) -> bytes:
+    c = zlib.compressobj(6, zlib.DEFLATED, -15)
+    return c.compress(data) + c.flush()
+
+
+class _Entry:
+    """zip 엔트리 1개(압축 데이터 + 메타). 변경 없는 엔트리는 템플릿의 압축 바이트를 그대로 쓴다."""
+
+    __slots__ = ("name", "data", "crc", "size", "method", "date_time")
+
+    def __init__(self, name, data, crc, size, method, date_time):
+        self.name, self.data, self.crc, self.size = name, data, crc, size
+        self.method, self.date_time = method, date_time
+
+    @classmethod
+    def from_bytes(cls, name, raw: bytes, date_time):
+        return cls(name, _deflate(raw), zlib.crc32(raw), len(raw), zipfile.ZIP_DEFLATED, date_time)
+
+
+def _raw_entries(tpl_bytes: bytes, zf: zipfile.ZipFile):
+    """템플릿의 각 엔트리를 압축 해제 없이 꺼낸다"""
+    entries = {}
+    for info in zf.infolist():
+        off = info.header_offset
+        name_len, extra_len = struct.unpack("<HH", tpl_bytes[off + 26:off + 30])
+        start = off + 30 + name_len + extra_len
+        data = tpl_bytes[start:start + info.compress_size]
+        entries[info.filename] = _Entry(
+            info.filename, data, info.CRC, info.file_size, info.compress_type, info.date_time
+        )
+    return entries
+
+
+def _write_zip(entries: Iterable[_Entry]) -> bytes:
+    out = BytesIO()
+    central = []
+    for e in entries:
+        name = e.name.encode("utf-8")
+        y, mo, d, h, mi, s = e.date_time
+        dos_time = (h << 11) | (mi << 5) | (s // 2)
+        dos_date = ((max(y, 1980) - 1980) << 9) | (mo << 5) | d
+        flags = 0x800  # UTF-8 파일명
+        offset = out.tell()
+        out.write(struct.pack(
+            "<IHHHHHIIIHH", 0x04034B50, 20, flags, e.method, dos_time, dos_date,
+            e.crc, len(e.data), e.size, len(name), 0,
+        ))
+        out.write(name)
+        out.write(e.data)
+        central.append(struct.pack(
+            "<IHHHHHHIIIHHHHHII", 0x02014B50, 20, 20, flags, e.method, dos_time, dos_date,
+            e.crc, len(e.data), e.size, len(name), 0, 0, 0, 0, 0, offset,
+        ) + name)
+    cd_offset = out.tell()
+    for rec in central:
+        out.write(rec)
+    cd_size = out.tell() - cd_offset
+    out.write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, len(central), len(central), cd_size, cd_offset, 0))
+    return out.getvalue()
+
+
+def _wrap_alignment_attrs(xf: str) -> Dict[str, str]:
+    """openpyxl _enable_wrap과 같은 규칙: 가로 정렬 유지, 세로는 기존값 또는 top, wrapText=1"""
+    m = _ALIGN_RE.search(xf)
+    old = dict(_ATTR_RE.findall(m.group(1))) if m else {}
+    attrs = {}
+    if "horizontal" in old:
+        attrs["horizontal"] = old["horizontal"]
+    attrs["vertical"] = old.get("vertical", "top")
+    attrs["wrapText"] = "1"
+    return attrs
+
+
+def _with_wrap(xf: str) -> Optional[str]:
+    """xf에 wrap 정렬을 적용한 사본. 이미 같은 정렬이면 None(기존 서식 그대로 사용)"""
+    attrs = _wrap_alignment_attrs(xf)
+    m = _ALIGN_RE.search(xf)
+    old = dict(_ATTR_RE.findall(m.group(1))) if m else {}
+    if old == attrs:
+        return None
+    alignment = "<alignment " + " ".join(f'{k}="{v}"' for k, v in attrs.items()) + "/>"
+    if m:
+        xf = xf[:m.start()] + alignment + xf[m.end():]
+    elif xf.endswith("/>"):
+        xf = xf[:-2] + ">" + alignment + "</xf>"
+    else:
+        xf = xf.replace(">", ">" + alignment, 1)
+    if 'applyAlignment="' in xf:
+        xf = re.sub(r'applyAlignment="\d"', 'applyAlignment="1"', xf, count=1)
+    else:
+        xf = xf.replace("<xf ", '<xf applyAlignment="1" ', 1)
+    return xf
+
+
+class _SheetTemplate:
+    """시트 XML을 대상 셀 기준으로 나눠 둔 것: chunks[0] cell[0] chunks[1] cell[1] ..."""
+
+    def __init__(self, xml: str, addrs: Iterable[str]):
+        wanted = set(addrs)
+        self.chunks, self.cells = [], []  # cells: (addr, 속성 문자열(s/t 제외), 원래 s, 원래 셀 XML의 나머지)
+        pos = 0
+        for m in _CELL_RE.finditer(xml):
+            addr = m.group(1)
+            if addr not in wanted:
+                continue
+            attrs = m.group(2)
+            s_match = _S_ATTR_RE.search(attrs)
+            style = int(s_match.group(1)) if s_match else 0
+            self.chunks.append(xml[pos:m.start()])
+            self.cells.append((addr, _S_ATTR_RE.sub("", attrs), style, m.group(3)))
+            pos = m.end()
+        self.chunks.append(xml[pos:])
+        self.addrs = {c[0] for c in self.cells}
+
+    def render(self, values: Dict[str, object], wrap_styles: Dict[int, int]) -> str:
+        parts = []
+        for chunk, (addr, attrs, style, body) in zip(self.chunks, self.cells):
+            parts.append(chunk)
+            new_style = wrap_styles.get(style, style)
+            if addr in values:
+                parts.append(_cell_xml(addr, _T_ATTR_RE.sub("", attrs), new_style, values[addr]))
+            else:
+                # 값은 그대로 두고 서식만 wrap 버전으로
+                parts.append(f'<c r="{addr}"{attrs} s="{new_style}"{body}')
+        parts.append(self.chunks[-1])
+        return "".join(parts)
+
+
+def _cell_xml(addr: str, rest: str, style: int, value) -> str:
+    head = f'<c r="{addr}"{rest} s="{style}"'
+    if value is None or value == "":
+        return head + "/>"
+    if isinstance(value, bool):
+        return head + f' t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, int):
+        return head + f' t="n"><v>{value}</v></c>'
+    if isinstance(value, float):
+        return head + f' t="n"><v>{repr(value)}</v></c>'
+    return head + f' t="inlineStr"><is><t xml:space="preserve">{escape(value)}</t></is></c>'
+
+
+def _supported(value) -> bool:
+    if value is None or isinstance(value, (bool, int)):
+        return True
+    if isinstance(value, float):
+        return math.isfinite(value)
+    if isinstance(value, str):
+        # '='로 시작하면 openpyxl은 수식으로 기록 → openpyxl 경로
+        return not (len(value) > 1 and value.startswith("=")) and not _ILLEGAL_XML_CHARS.search(value)
+    return False
+
+
+class PrdinfoTemplatePatcher:
+    """
+    템플릿 1개에 대한 패처. wrap_cells: {시트명: [주소...]} — 값 기록 가능 + wrap 적용 대상 셀
+    """
+
+    def __init__(self, tpl_bytes: bytes, wrap_cells: Dict[str, Iterable[str]]):
+        zf = zipfile.ZipFile(BytesIO(tpl_bytes))
+        self._entries = _raw_entries(tpl_bytes, zf)
+        self._order = [i.filename for i in zf.infolist() if i.filename != _CALC_CHAIN]
+        paths = _sheet_paths(zf)
+
+        self._sheets = {}
+        styles_needed = set()
+        for sheet, addrs in wrap_cells.items():
+            path = paths[sheet]
+            tpl = _SheetTemplate(zf.read(path).decode("utf-8"), addrs)
+            missing = set(addrs) - tpl.addrs
+            if missing:
+                raise ValueError(f"템플릿 {sheet} 시트에 셀이 없습니다: {sorted(missing, key=_cell_sort_key)}")
+            self._sheets[sheet] = (path, tpl)
+            styles_needed.update(style for _, _, style, _ in tpl.cells)
+
+        # wrap 서식 추가(styles.xml은 크므로 1회만 수정·압축)
+        styles = zf.read("xl/styles.xml").decode("utf-8")
+        start = styles.index("<cellXfs")
+        end = styles.index("</cellXfs>")
+        xfs = re.findall(r"<xf\b[^>]*?(?:/>|>.*?</xf>)", styles[start:end], re.S)
+        self._wrap_styles, added = {}, []
+        for style in sorted(styles_needed):
+            wrapped = _with_wrap(xfs[style])
+            if wrapped is not None:
+                self._wrap_styles[style] = len(xfs) + len(added)
+                added.append(wrapped)
+        if added:
+            head = re.sub(r'count="\d+"', f'count="{len(xfs) + len(added)}"', styles[start:styles.index(">", start) + 1], count=1)
+            styles = styles[:start] + head + styles[styles.index(">", start) + 1:end] + "".join(added) + styles[end:]
+            info = zf.getinfo("xl/styles.xml")
+            self._entries["xl/styles.xml"] = _Entry.from_bytes("xl/styles.xml", styles.encode("utf-8"), info.date_time)
+
+        # calcChain 제외 → [Content_Types].xml / workbook.xml.rels에서도 참조 제거
+        if _CALC_CHAIN in self._entries:
+            for name, pattern in (
+                ("[Content_Types].xml", r'<Override PartName="/xl/calcChain.xml"[^>]*/>'),
+                ("xl/_rels/workbook.xml.rels", r'<Relationship [^>]*?Target="calcChain.xml"[^>]*/>'),
+            ):
+                info = zf.getinfo(name)
+                text = re.sub(pattern, "", zf.read(name).decode("utf-8"))
+                self._entries[name] = _Entry.from_bytes(name, text.encode("utf-8"), info.date_time)
+
+    def render(self, values: Dict[str, Dict[str, object]]) -> Optional[bytes]:
+        """values: {시트명: {주소: 값}}. 패치로 만들 수 없으면 None"""
+        for sheet, cells in values.items():
+            if sheet not in self._sheets:
+                return None
+            _, tpl = self._sheets[sheet]
+            for addr, value in cells.items():
+                if addr not in tpl.addrs or not _supported(value):
+                    return None
+
+        patched = {}
+        for sheet, (path, tpl) in self._sheets.items():
+            xml = tpl.render(values.get(sheet, {}), self._wrap_styles)
+            patched[path] = _Entry.from_bytes(path, xml.encode("utf-8"), self._entries[path].date_time)
+        return _write_zip(patched.get(name) or self._entries[name] for name in self._order)
+
@@ -3,20 +3,40 @@
 from django.http import JsonResponse, HttpRequest
 from django.views.decorators.csrf import csrf_exempt
 import os
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 
+from main.utils.resources import get_resource, reset_resource
 from .report_docx_parser import parse_docx   # 실제 파서 사용
-from .report_pdf_parser  import parse_pdf    # 실제 파서 사용
+from .report_pdf_parser  import parse_pdf    # 실제 파서 사용 (checkreport_parse_pool 등록)
 from .checkreport_GPT import run_checkreport_gpt
 
+DOCX_PARSE_TIMEOUT = float(os.environ.get("CHECKREPORT_DOCX_TIMEOUT", 60))  # 초
+PDF_PARSE_TIMEOUT = float(os.environ.get("CHECKREPORT_PDF_TIMEOUT", 60))    # 초
+
+
+def _read_upload(f) -> bytes:
+    if hasattr(f, "seek"):
+        f.seek(0)
+    return f.read()
+
+
+def _elapsed_ms(t0: float) -> int:
+    return round((time.perf_counter() - t0) * 1000)
+
+
 @csrf_exempt
 def parse_view(request: HttpRequest):
     """
     단일 엔드포인트(A안): 업로드(docx+pdf) → 파싱 → (합쳐진 JSON 전체) → GPT → 테이블 스키마 JSON
     - 디버그: 'X-Debug-GPT: 1' 헤더 또는 '?debug=1' 쿼리/POST가 있으면,
       응답에 '_debug': {
+        'parse_ms': {'docx', 'pdf', 'total'} 파싱 소요(ms),
         'gpt_input': <합쳐진 원본 전체 JSON>,
         'gpt_request': <OpenAI에 실제로 보낸 요청 본문 전체>,
-        'gpt_response_meta': <id/model/usage 등 요약>
+        'gpt_response_meta': <id/model/usage 등 요약>,
+        'gpt_chunks': <분할 검토 시 청크별 라벨/페이지/소요 시간/usage>
       } 를 포함하여 브라우저 개발자도구에서 확인 가능.
     """
     if request.method != "POST":
@@ -46,23 +66,37 @@ def parse_view(request: HttpRequest):
     if docx_file is None or pdf_file is None:
         return JsonResponse({"version": "1", "total": 0, "items": []})
 
-    # 안전: 스트림 포인터 초기화
-    try:
-        if hasattr(docx_file, "seek"): docx_file.seek(0)
-        if hasattr(pdf_file, "seek"):  pdf_file.seek(0)
-    except Exception:
-        pass
-
-    # 1) 파싱 (각 파서가 반환하는 전체 JSON을 그대로 받음)
+    # 업로드 파일 → bytes (프로세스 풀 작업으로 넘기기 위해)
     try:
-        docx_json = parse_docx(docx_file)
+        docx_bytes = _read_upload(docx_file)
+        pdf_bytes = _read_upload(pdf_file)
     except Exception as e:
-        return JsonResponse({"error": f"DOCX parse failed: {e}"}, status=500)
+        return JsonResponse({"error": f"Upload read failed: {e}"}, status=400)
 
+    # 1) 파싱: DOCX/PDF를 프로세스 풀에서 동시에 (각 파서가 반환하는 전체 JSON을 그대로 받음)
+    #    - DOCX는 작업 1개, PDF는 페이지 구간 작업들로 같은 풀에 들어간다 → 전처리 지연 ≈ max(DOCX, PDF)
+    pool = get_resource("checkreport_parse_pool")
+    parse_ms = {}
+    t0 = time.perf_counter()
+    docx_future = pool.submit(parse_docx, docx_bytes)
+    docx_future.add_done_callback(lambda _f: parse_ms.setdefault("docx", _elapsed_ms(t0)))
+    stage, timeout = "PDF", PDF_PARSE_TIMEOUT
     try:
-        pdf_json = parse_pdf(pdf_file)
+        pdf_json = parse_pdf(pdf_bytes, executor=pool, timeout=PDF_PARSE_TIMEOUT)
+        parse_ms["pdf"] = _elapsed_ms(t0)
+        stage, timeout = "DOCX", DOCX_PARSE_TIMEOUT
+        docx_json = docx_future.result(timeout=max(0.0, DOCX_PARSE_TIMEOUT - (time.perf_counter() - t0)))
+    except FutureTimeoutError:
+        return JsonResponse({"error": f"{stage} parse timed out ({timeout:g}s)"}, status=504)
+    except BrokenProcessPool:
+        # 워커가 비정상 종료되면 다음 요청에서 풀을 새로 만든다
+        reset_resource("checkreport_parse_pool")
+        return JsonResponse({"error": f"{stage} parse failed: parser worker terminated abruptly."}, status=500)
     except Exception as e:
-        return JsonResponse({"error": f"PDF parse failed: {e}"}, status=500)
+        return JsonResponse({"error": f"{stage} parse failed: {e}"}, status=500)
+    finally:
+        docx_future.cancel()
+    parse_ms["total"] = _elapsed_ms(t0)
 
     # 2) 합쳐진 JSON (원본 전체) — 축약/발췌 없이 그대로
     combined = {
@@ -86,6 +120,7 @@ def parse_view(request: HttpRequest):
     if debug_flag:
         result = dict(result)  # shallow copy
         result["_debug"] = {
+            "parse_ms": parse_ms,           # 파서별 소요(제출 시점부터 완료까지), total = 둘 다 끝난 시점
             "gpt_input": combined,          # 우리가 GPT에 전달한 합쳐진 원본 전체 JSON
             **gpt_debug                     # gpt_request, gpt_response_meta (있으면 병합)
         }
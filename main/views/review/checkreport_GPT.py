@@ -1,214 +1,234 @@
 import os
 import json
-from typing import Tuple, Dict, Any
-from django.http import JsonResponse, HttpRequest
-from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Dict, Any, List, Optional
 from textwrap import dedent
-from openai import OpenAI
+from main.utils.resources import get_resource
 
 PARSED_START = "<<PARSED_PAYLOAD_JSON_START>>"
 PARSED_END   = "<<PARSED_PAYLOAD_JSON_END>>"
 
-# ---------- 내부 호출용 핵심 로직 ----------
-def run_checkreport_gpt(parsed_payload: dict, debug: bool = False) -> Tuple[dict, Dict[str, Any]]:
-    """
-    합쳐진 원본 전체 JSON(parsed_payload)을 그대로 GPT에 전달하여
-    테이블 렌더링용 스키마(JSON)로 변환.
+# instruction 원문 및 스키마(여러 줄 그대로)
+INSTRUCTION_TEXT = dedent("""\
+    <<PARSED_PAYLOAD_JSON_START>> ~ <<PARSED_PAYLOAD_JSON_END>> 사이에 제공되는 json 값(이하 '원본')은 시험결과서 파일(.docx)를 파싱해 하나의 JSON으로 합친 데이터입니다.
+    아래 구조를 참고하여 원본을 하나의 word 문서로 만들어 '판단 지침'에 따라 결과를 제공해줘.
 
-    반환:
-      - result: {"version":"1","total":N,"items":[...]}
-      - debug_payload:
-          {
-            "gpt_request": {...},          # 실제 보낼 전체 파라미터 (오류 시에도 채움)
-            "gpt_response_meta": {...},    # 호출 성공 시 메타
-            "instruction_text": "...",     # 사람이 읽기 쉽게 원문 노출
-            "error": "..."                 # 호출 실패 시 오류 메시지
-          }
-    """
-    debug_payload: Dict[str, Any] = {}
+    ### 원본 구조 설명 ###
+    ## 1) 최상위 구조
+    {
+      "v": "1",
+      "docx": {
+        "v": "1",
+        "content": [ /* 노드 배열(원문 순서 보존) */ ]
+      },
+      "pdf": {
+        "v": "1",
+        "total_pages": 0,
+        "pages": [
+          { "page": 1, "header": ["상단 1줄"], "footer": ["하단 1줄"] }
+        ]
+      }
+    }
+    요소 설명
+    - v: 스키마 버전(문자열, 임의 값)
+    - docx: DOCX 본문 파싱 결과
+    - pdf: PDF 각 페이지 상단/하단 1줄 텍스트 결과
+    ---
+    ## 2) DOCX
+    ### 2.1 content 노드 타입
+    1) 문장 노드
+    { "sen": "문단/자유 텍스트(OMML 수식 선형 포함)" }
+    2) 라벨(섹션) 노드
+    { "label": "제목/번호/첨부", "content": [ /* 하위 노드들 */ ] }
+    - 라벨 패턴 예: 숫자 섹션(^\\d+(\\.\\d+)*\\s+), 첨부(^<\\s*첨부\\s*\\d+\\s*>)
+    3) 표 노드
+    {
+      "table": [
+        [row, col, row_span, col_span, "셀 텍스트"],
+        ...
+      ]
+    }
+    - 좌표 1-based
+    - 병합 정보 유지(루트 셀만 기록)
+    - "셀 텍스트"는 여러 문단을 \\n 로 연결
+    - 표 내부 수식 역시 선형화된 텍스트로 포함
+    ### 2.2 목차(TOC)
+    - "목 차" 구간: 전부 sen만 생성(라벨/표 없음)
+    ### 2.3 OMML 수식 선형화 규칙(문장/표 텍스트에 포함)
+    - 분수: (분자)/(분모)
+    - 아랫/윗첨자: x_{i}, x^{2}, x_{i}^{n}
+    - 시그마/파이: ∑_{하한}^{상한} (...), 상·하한이 비어있으면 생략(예: ∑ (...))
+    - 예시(기대 표현):
+      X(%) = ∑_{i=1}^{n} (A_{i}+B_{i})/(n)
+      Y(%) = ∑_{i=1}^{n} (C_{i}-(D_{i}+E_{i}+F_{i}))/(C_{i})*(1)/(n)*(1)/(1024)*100
+    ---
+    ## 3) PDF
+    구조
+    "pdf": {
+      "v": "1",
+      "total_pages": 15,
+      "pages": [
+        { "page": 1, "header": ["상단 1줄"], "footer": ["하단 1줄"] },
+        ...
+      ]
+    }
+    설명
+    - 각 페이지 상단 1줄 → header([] 문자열 배열)
+    - 각 페이지 하단 1줄 → footer([] 문자열 배열)
+    - 예:
+      header: "1/12 소프트웨어시험인증연구소"
+      footer: "TPG-1016-5(02)  Copyright 2025 TTA  페이지 : (7)/(총15)"
+    ---
+    ### 원본 구조 설명 끝 ###
 
-    # 0) instruction 원문 및 스키마(여러 줄 그대로)
-    instruction_text = dedent("""\
-        <<PARSED_PAYLOAD_JSON_START>> ~ <<PARSED_PAYLOAD_JSON_END>> 사이에 제공되는 json 값(이하 '원본')은 시험결과서 파일(.docx)를 파싱해 하나의 JSON으로 합친 데이터입니다.
-        아래 구조를 참고하여 원본을 하나의 word 문서로 만들어 '판단 지침'에 따라 결과를 제공해줘.
-
-        ### 원본 구조 설명 ###
-        ## 1) 최상위 구조
-        {
-          "v": "1",
-          "docx": {
-            "v": "1",
-            "content": [ /* 노드 배열(원문 순서 보존) */ ]
-          },
-          "pdf": {
-            "v": "1",
-            "total_pages": 0,
-            "pages": [
-              { "page": 1, "header": ["상단 1줄"], "footer": ["하단 1줄"] }
-            ]
-          }
-        }
-        요소 설명
-        - v: 스키마 버전(문자열, 임의 값)
-        - docx: DOCX 본문 파싱 결과
-        - pdf: PDF 각 페이지 상단/하단 1줄 텍스트 결과
-        ---
-        ## 2) DOCX
-        ### 2.1 content 노드 타입
-        1) 문장 노드
-        { "sen": "문단/자유 텍스트(OMML 수식 선형 포함)" }
-        2) 라벨(섹션) 노드
-        { "label": "제목/번호/첨부", "content": [ /* 하위 노드들 */ ] }
-        - 라벨 패턴 예: 숫자 섹션(^\\d+(\\.\\d+)*\\s+), 첨부(^<\\s*첨부\\s*\\d+\\s*>)
-        3) 표 노드
-        {
-          "table": [
-            [row, col, row_span, col_span, "셀 텍스트"],
-            ...
-          ]
-        }
-        - 좌표 1-based
-        - 병합 정보 유지(루트 셀만 기록)
-        - "셀 텍스트"는 여러 문단을 \\n 로 연결
-        - 표 내부 수식 역시 선형화된 텍스트로 포함
-        ### 2.2 목차(TOC)
-        - "목 차" 구간: 전부 sen만 생성(라벨/표 없음)
-        ### 2.3 OMML 수식 선형화 규칙(문장/표 텍스트에 포함)
-        - 분수: (분자)/(분모)
-        - 아랫/윗첨자: x_{i}, x^{2}, x_{i}^{n}
-        - 시그마/파이: ∑_{하한}^{상한} (...), 상·하한이 비어있으면 생략(예: ∑ (...))
-        - 예시(기대 표현):
-          X(%) = ∑_{i=1}^{n} (A_{i}+B_{i})/(n)
-          Y(%) = ∑_{i=1}^{n} (C_{i}-(D_{i}+E_{i}+F_{i}))/(C_{i})*(1)/(n)*(1)/(1024)*100
-        ---
-        ## 3) PDF
-        구조
-        "pdf": {
-          "v": "1",
-          "total_pages": 15,
-          "pages": [
-            { "page": 1, "header": ["상단 1줄"], "footer": ["하단 1줄"] },
-            ...
-          ]
-        }
-        설명
-        - 각 페이지 상단 1줄 → header([] 문자열 배열)
-        - 각 페이지 하단 1줄 → footer([] 문자열 배열)
-        - 예:
-          header: "1/12 소프트웨어시험인증연구소"
-          footer: "TPG-1016-5(02)  Copyright 2025 TTA  페이지 : (7)/(총15)"
-        ---
-        ### 원본 구조 설명 끝 ###
-
-        ### 판단 지침 시작 ###
-        Let's think step by step
-        ## 역할
-        - 당신은 **시험 합의서/시험결과서 기술책임자**입니다.
-        - **문서에 존재하는 근거로만** 판단하세요. 문서에 없는 사실·수치·페이지·그림·표는 **추정/생성 금지**. 불확실하면 **“검증불가(근거 없음)”**으로 표기.
-
-        ## 보고 원칙
-        - 최우선: **수식/산식 오류 검증 및 재계산**.
-        - **대소문자·사소한 띄어쓰기·경미한 문체**는 보고하지 않음(의미·계산 영향 시만 보고).
-        - 가능하면 **페이지·위치(표/절/문장)**를 함께 명시(불명확 시 “페이지 불명”).
-
-        ## 심각도(아이콘)
-        - 🟥 **심각**: 산식오류로 결과 왜곡, 시험환경/사양 중대 불일치, 안전·규제/버전/의뢰자/번호/기간 불일치
-        - 🟧 **중요**: 핵심 기술 불일치, 단위·치수 오류, 결론에 영향 주는 필수 항목 누락
-        - 🟨 **보통**: 비논리·불명확 서술, 문맥 유사도 기준 미달
-        - 🟦 **경미**: 용어 비표준/표현 개선(의미 동일)
-
-        ## 필수 점검항목
-        1. **오타(의미 변형)**
-        2. **기술 오류**: 요구사항·사양·결과 상충, 단위/치수/범위 오류
-        3. **용어·수치 일관성**
-        4. **비논리 문장**(근거 없는 단정 포함)
-        5. **수식/산식 오류**: 기호·단위·반올림·%↔소수 혼동·대입값 불일치
-        6. **기능리스트 가독성**(CRUDSM 관점)
-        7. **<첨부1> 기능리스트 규칙 준수**
-        8. **결말 문자열**: 문서 마지막에 “- 끝 -” 또는 “-끝-” 존재
-        9. **단어 유사도(5.1 기능적합성 ↔ <첨부1>)**: 유사도 ≤ 30%면 오류(보통)
-        10. **시험환경 일치(4.2)**: **<시험환경구성도> ↔ <세부사양> 표** 동일
-        11. **목차 페이지 일치(3페이지)**
-        12. **제조자 표기**: 4.1 제품구성의 제조자 ↔ 1.1 회사 개요의 회사명 일치
-        13. **설치 SW 표기 정확성(<세부사양>)**: 오픈소스/SW명 오류 여부
-        14. **제품 구성(4.1)**: 제품명(국문 또는 영문) 포함
-        15. **세부사양 표기 명확성**: OS, CPU 표기 오류 없음(예: Intel® Xeon… 형식 일관)
-        16. **Copyright 연도 = 6. 시험기간 종료연도(1페이지)**
-        17. **목차 번호 오류(3페이지)**
-        18. **단어 유사도(1.2 개요 및 특성 ↔ <첨부1>)**: 유사도 ≤ 30%면 오류(보통)
-        19. **목적격 조사 누락**(을/를 등)
-
-        ### BT로 시작하는 결과서 추가 점검
-        - 3. 시험항목 **측정지표 산식 검증**
-        - 3 ↔ 5(시험방법) ↔ 6(시험결과) **항목 일관성**
-        - 7. 시험기록 **숫자 계산 검증**
-
-        ## 문맥 유사도(재현 절차)
-        (a) 개요·기능리스트·5.1에서 **핵심 키워드 10~30개**씩 추출 →  
-        (b) **동등어만 병합**(예: IP 주소=IP Address, 포트 번호=Port Number) →  
-        (c) **유사도 = 교집합/합집합 × 100%** →  
-        (d) **50% 이하**는 보통으로 보고(겹치는/누락 키워드 예시 인용).
-
-        ## 산식/수치 검증 절차
-        1) **기호·변수·단위 정의 확인**  
-        2) **차원 일치**(MB/s vs Mb/s, °C vs K, ms vs s 등)  
-        3) **대입 재계산** + **반올림 규칙** 확인  
-        4) **%↔소수 변환 일관성**  
-        5) **상·하한/허용오차** 대비  
-        6) 데이터 부족 시 **“검증불가(수치/단위 부재)”**
-
-        ## <첨부1> 기능리스트 규칙(요약)
-        - **CRUDSM** 관점 기술(등록/조회/수정/삭제만도 허용).
-        - **금지**: 사람 행위 지시 단어(서비스/처리/내역 등), “설정(추가/수정/삭제)” 모호 표현.
-        - **개선 가이드**:
-          - “현황/기록/로그/이력” → **괄호로 구체화**(예: *이력(시각, 이름, 이벤트 등) 조회*).
-          - 형식 명시(예: *데이터 조회 REST API*, *엑셀 파일 다운로드*).
-          - **IP 주소**, **포트 번호**, **URL 주소**로 표준화.
-
-        ## 제외·무시(보고하지 않음)
-        - 템플릿·꼬리말 혼재, 5~7페이지 전면, 환경 모호 서술 등 **제외 리스트**에 해당하는 항목.
-        - **산정식 누락 자체**, Working Day 일반, 설치 SW 열의 HW 혼입 등은 **점검 제외 규정** 준수.
-
-        ## 1.2 개요 및 특성
-        - **주요 기능 설명 필수**.
-        - **주요 기능 아님**(제외): 사용자 관리/로그인 등 → 실제 핵심 기능으로 대체 권고.
-
-        ## 출력 형식(반드시 준수)
-        - **양호 항목은 출력 금지. 오류만 json으로 요약.**
-        - **페이지 불명** 시 위치에 “-” 표기.
-        - **수정안은 간결·구체·검증가능**하게.
-        - **오류가 전혀 없으면**: null 출력.
-        - **아래 스키마의 JSON 객체로만 응답하세요.
-        {{
-            "version": "1",
-            "total": "items 배열 길이",
-            "items": [{
-                "no": "1부터 시작하는 번호(정수)",
-                "category": "구분(점검항목)",
-                "severity": "심각도",
-                "location": "위치(표/절/문장)",
-                "summary": "문제 요약",
-                "evidence": "근거(원문 일부 인용, 10~30자)",
-                "recommendation": "권장 수정안"
-            }]
-        }}
-
-        ## 정렬·마감
-        - **중요도 순(🟥→🟧→🟨→🟦)** 정렬.
-        - 문서 끝 **결말 문자열**(“- 끝 -” 또는 “-끝-”) 존재 확인.
-        - **추가 가정 금지**, 수치·유사도·페이지는 **지어내지 말 것**. 부족하면 **검증불가**로.
-        ### 판단 지침 끝 ###
-    """).strip()
+    ### 판단 지침 시작 ###
+    Let's think step by step
+    ## 역할
+    - 당신은 **시험 합의서/시험결과서 기술책임자**입니다.
+    - **문서에 존재하는 근거로만** 판단하세요. 문서에 없는 사실·수치·페이지·그림·표는 **추정/생성 금지**. 불확실하면 **“검증불가(근거 없음)”**으로 표기.
 
-    # 1) 실제로 보낼 '요청 페이로드'를 선구성 (오류여도 디버그에 넣기 위함)
-    request_payload: Dict[str, Any] = {
-        "model": "gpt-5",
+    ## 보고 원칙
+    - 최우선: **수식/산식 오류 검증 및 재계산**.
+    - **대소문자·사소한 띄어쓰기·경미한 문체**는 보고하지 않음(의미·계산 영향 시만 보고).
+    - 가능하면 **페이지·위치(표/절/문장)**를 함께 명시(불명확 시 “페이지 불명”).
+
+    ## 심각도(아이콘)
+    - 🟥 **심각**: 산식오류로 결과 왜곡, 시험환경/사양 중대 불일치, 안전·규제/버전/의뢰자/번호/기간 불일치
+    - 🟧 **중요**: 핵심 기술 불일치, 단위·치수 오류, 결론에 영향 주는 필수 항목 누락
+    - 🟨 **보통**: 비논리·불명확 서술, 문맥 유사도 기준 미달
+    - 🟦 **경미**: 용어 비표준/표현 개선(의미 동일)
+
+    ## 필수 점검항목
+    1. **오타(의미 변형)**
+    2. **기술 오류**: 요구사항·사양·결과 상충, 단위/치수/범위 오류
+    3. **용어·수치 일관성**
+    4. **비논리 문장**(근거 없는 단정 포함)
+    5. **수식/산식 오류**: 기호·단위·반올림·%↔소수 혼동·대입값 불일치
+    6. **기능리스트 가독성**(CRUDSM 관점)
+    7. **<첨부1> 기능리스트 규칙 준수**
+    8. **결말 문자열**: 문서 마지막에 “- 끝 -” 또는 “-끝-” 존재
+    9. **단어 유사도(5.1 기능적합성 ↔ <첨부1>)**: 유사도 ≤ 30%면 오류(보통)
+    10. **시험환경 일치(4.2)**: **<시험환경구성도> ↔ <세부사양> 표** 동일
+    11. **목차 페이지 일치(3페이지)**
+    12. **제조자 표기**: 4.1 제품구성의 제조자 ↔ 1.1 회사 개요의 회사명 일치
+    13. **설치 SW 표기 정확성(<세부사양>)**: 오픈소스/SW명 오류 여부
+    14. **제품 구성(4.1)**: 제품명(국문 또는 영문) 포함
+    15. **세부사양 표기 명확성**: OS, CPU 표기 오류 없음(예: Intel® Xeon… 형식 일관)
+    16. **Copyright 연도 = 6. 시험기간 종료연도(1페이지)**
+    17. **목차 번호 오류(3페이지)**
+    18. **단어 유사도(1.2 개요 및 특성 ↔ <첨부1>)**: 유사도 ≤ 30%면 오류(보통)
+    19. **목적격 조사 누락**(을/를 등)
+
+    ### BT로 시작하는 결과서 추가 점검
+    - 3. 시험항목 **측정지표 산식 검증**
+    - 3 ↔ 5(시험방법) ↔ 6(시험결과) **항목 일관성**
+    - 7. 시험기록 **숫자 계산 검증**
+
+    ## 문맥 유사도(재현 절차)
+    (a) 개요·기능리스트·5.1에서 **핵심 키워드 10~30개**씩 추출 →  
+    (b) **동등어만 병합**(예: IP 주소=IP Address, 포트 번호=Port Number) →  
+    (c) **유사도 = 교집합/합집합 × 100%** →  
+    (d) **50% 이하**는 보통으로 보고(겹치는/누락 키워드 예시 인용).
+
+    ## 산식/수치 검증 절차
+    1) **기호·변수·단위 정의 확인**  
+    2) **차원 일치**(MB/s vs Mb/s, °C vs K, ms vs s 등)  
+    3) **대입 재계산** + **반올림 규칙** 확인  
+    4) **%↔소수 변환 일관성**  
+    5) **상·하한/허용오차** 대비  
+    6) 데이터 부족 시 **“검증불가(수치/단위 부재)”**
+
+    ## <첨부1> 기능리스트 규칙(요약)
+    - **CRUDSM** 관점 기술(등록/조회/수정/삭제만도 허용).
+    - **금지**: 사람 행위 지시 단어(서비스/처리/내역 등), “설정(추가/수정/삭제)” 모호 표현.
+    - **개선 가이드**:
+      - “현황/기록/로그/이력” → **괄호로 구체화**(예: *이력(시각, 이름, 이벤트 등) 조회*).
+      - 형식 명시(예: *데이터 조회 REST API*, *엑셀 파일 다운로드*).
+      - **IP 주소**, **포트 번호**, **URL 주소**로 표준화.
+
+    ## 제외·무시(보고하지 않음)
+    - 템플릿·꼬리말 혼재, 5~7페이지 전면, 환경 모호 서술 등 **제외 리스트**에 해당하는 항목.
+    - **산정식 누락 자체**, Working Day 일반, 설치 SW 열의 HW 혼입 등은 **점검 제외 규정** 준수.
+
+    ## 1.2 개요 및 특성
+    - **주요 기능 설명 필수**.
+    - **주요 기능 아님**(제외): 사용자 관리/로그인 등 → 실제 핵심 기능으로 대체 권고.
+
+    ## 출력 형식(반드시 준수)
+    - **양호 항목은 출력 금지. 오류만 json으로 요약.**
+    - **페이지 불명** 시 위치에 “-” 표기.
+    - **수정안은 간결·구체·검증가능**하게.
+    - **오류가 전혀 없으면**: null 출력.
+    - **아래 스키마의 JSON 객체로만 응답하세요.
+    {{
+        "version": "1",
+        "total": "items 배열 길이",
+        "items": [{
+            "no": "1부터 시작하는 번호(정수)",
+            "category": "구분(점검항목)",
+            "severity": "심각도",
+            "location": "위치(표/절/문장)",
+            "summary": "문제 요약",
+            "evidence": "근거(원문 일부 인용, 10~30자)",
+            "recommendation": "권장 수정안"
+        }]
+    }}
+
+    ## 정렬·마감
+    - **중요도 순(🟥→🟧→🟨→🟦)** 정렬.
+    - 문서 끝 **결말 문자열**(“- 끝 -” 또는 “-끝-”) 존재 확인.
+    - **추가 가정 금지**, 수치·유사도·페이지는 **지어내지 말 것**. 부족하면 **검증불가**로.
+    ### 판단 지침 끝 ###
+""").strip()
+
+
+# ---------- 분할(청크) 검토 설정 ----------
+MODEL_NAME = "gpt-5"
+SYSTEM_PROMPT = "You are a strict technical reviewer. Return ONLY a JSON object in the required schema."
+
+# 분할 검토는 기본 끔: 청크마다 원본 일부만 보므로 절을 넘나드는 점검(9·10·12·18번 등)이 빠진다.
+# "1"이면 원본 전체 추정 토큰이 CHUNK_TOKEN_BUDGET을 넘을 때 분할 검토 (모델 컨텍스트를 넘는 대형 결과서용)
+CHUNKED_REVIEW = os.environ.get("CHECKREPORT_GPT_CHUNKED", "0") == "1"
+# 청크 1개에 담을 docx 본문의 추정 토큰 상한(해당 PDF 페이지 header/footer는 별도로 더해짐)
+CHUNK_TOKEN_BUDGET = int(os.environ.get("CHECKREPORT_GPT_CHUNK_TOKENS", 12000))
+# 분할 검토 동시 요청 수 (동기 클라이언트 1개를 스레드들이 공유)
+GPT_CONCURRENCY = int(os.environ.get("CHECKREPORT_GPT_CONCURRENCY", 4))
+# 청크에 붙일 PDF 페이지: 본문 위치 비례로 추정한 범위 앞뒤 여유 페이지 수 / 첫 청크에 항상 넣을 앞쪽 페이지(표지·목차)
+PAGE_MARGIN = 1
+FRONT_PAGES = 3
+
+# 단위를 이어 붙일 때 항목마다 더하는 여유(JSON 구분자 ", " 몫)
+_SEP_TOKENS = 1
+
+SEVERITY_ORDER = {"🟥": 0, "🟧": 1, "🟨": 2, "🟦": 3}
+
+CHUNK_NOTE = dedent("""\
+    ### 분할 검토 안내 ###
+    - 이번 원본은 전체 시험결과서를 최상위 라벨(절) 단위로 나눈 {total}개 부분 중 {index}번째 부분입니다.
+    - docx.content는 이 부분의 본문만, pdf.pages는 이 부분에 해당할 것으로 추정한 페이지(앞뒤 여유 포함)만 담고 있습니다.
+    - 이 부분에 근거가 있는 오류만 보고하세요. 다른 부분의 내용이 있어야 판단할 수 있는 항목은 추정하지 말고 생략하세요.
+    - 결말 문자열(“- 끝 -”) 점검은 마지막 부분에서만, 목차·1페이지 관련 점검은 첫 부분에서만 수행하세요.
+""").strip()
+
+
+def _empty_result() -> dict:
+    return {"version": "1", "total": 0, "items": []}
+
+
+def _estimate_tokens(obj) -> int:
+    # 토크나이저 없이 쓰는 대략치: UTF-8 바이트/3 (한글 ≈ 1토큰/글자, 영문·JSON 기호는 과대 추정 → 예산을 넘지 않는 쪽)
+    return len(json.dumps(obj, ensure_ascii=False).encode("utf-8")) // 3 + 1
+
+
+def _request_payload(instruction_text: str, parsed_payload: dict) -> Dict[str, Any]:
+    return {
+        "model": MODEL_NAME,
         "response_format": {"type": "json_object"},
         "messages": [
             {
                 "role": "system",
-                "content": "You are a strict technical reviewer. Return ONLY a JSON object in the required schema."
+                "content": SYSTEM_PROMPT
             },
             {
                 "role": "user",
@@ -221,6 +241,213 @@ def run_checkreport_gpt(parsed_payload: dict, debug: bool = False) -> Tuple[dict
         ],
     }
 
+
+def _normalize_items(data: dict) -> List[Dict[str, Any]]:
+    norm = []
+    for idx, it in enumerate(data.get("items") or [], start=1):
+        norm.append({
+            "no":              it.get("no", idx),
+            "category":        it.get("category", ""),
+            "severity":        it.get("severity", ""),
+            "location":        it.get("location", ""),
+            "summary":         it.get("summary", ""),
+            "evidence":        it.get("evidence", ""),
+            "recommendation":  it.get("recommendation", "")
+        })
+    return norm
+
+
+def _usage(completion) -> Dict[str, Optional[int]]:
+    usage = getattr(completion, "usage", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", None) if usage else None,
+        "completion_tokens": getattr(usage, "completion_tokens", None) if usage else None,
+        "total_tokens": getattr(usage, "total_tokens", None) if usage else None,
+    }
+
+
+def _call_review(client, request_payload: Dict[str, Any]):
+    """1회 호출 → (정규화된 items, completion)"""
+    completion = client.chat.completions.create(**request_payload)
+    content = completion.choices[0].message.content if completion.choices else None
+    data = json.loads(content) if content else {}
+    return _normalize_items(data or {}), completion
+
+
+# ---------- 원본 분할 ----------
+def _split_units(nodes: List[dict], budget: int) -> List[Tuple[List[dict], int]]:
+    """
+    docx.content 노드들 → 원문 순서의 검토 단위 [(노드 목록, 추정 토큰)] (이어 붙이기는 _pack)
+    - 문장/표/라벨 노드 하나가 한 단위
+    - 예산보다 큰 라벨은 하위 content를 예산 크기로 나눠 같은 라벨 이름의 조각들로 만든다
+    - 예산보다 큰 표는 행 단위로 나누고 조각마다 머리글 행을 반복한다
+    """
+    units: List[Tuple[List[dict], int]] = []
+    for node in nodes:
+        size = _estimate_tokens(node)
+        if size <= budget:
+            units.append(([node], size))
+        elif "label" in node and node.get("content"):
+            # 조각의 라벨 껍데기 크기만큼 하위 예산을 줄인다
+            inner = max(1, budget - _estimate_tokens({**node, "content": []}))
+            for part, _ in _pack(_split_units(node["content"], inner), inner):
+                piece = {**node, "content": part}
+                units.append(([piece], _estimate_tokens(piece)))
+        elif node.get("table"):
+            for cells in _split_table(node["table"], budget):
+                piece = {**node, "table": cells}
+                units.append(([piece], _estimate_tokens(piece)))
+        else:
+            units.append(([node], size))  # 한 문장이 예산보다 큰 경우는 그대로 단독 청크
+    return units
+
+
+def _split_table(cells: List[list], budget: int) -> List[List[list]]:
+    """
+    표 셀 [row, col, row_span, col_span, 텍스트] → 예산 크기의 셀 목록들 (좌표는 원본 그대로)
+    - 세로 병합 셀이 걸친 행들은 한 묶음으로 두고, 첫 묶음(머리글 행)은 모든 조각 앞에 반복
+    """
+    by_row: Dict[int, List[list]] = {}
+    for cell in cells:
+        by_row.setdefault(cell[0], []).append(cell)
+    groups: List[List[list]] = []
+    span_end = 0
+    for row in sorted(by_row):
+        if groups and row <= span_end:
+            groups[-1].extend(by_row[row])
+        else:
+            groups.append(list(by_row[row]))
+        span_end = max(span_end, max(c[0] + max(1, c[2]) - 1 for c in by_row[row]))
+    if len(groups) < 2:
+        return [cells]
+
+    header, body = groups[0], groups[1:]
+    header_size = _estimate_tokens(header)
+    pieces: List[List[list]] = []
+    cur: List[list] = []
+    cur_size = header_size
+    for group in body:
+        size = _estimate_tokens(group) + _SEP_TOKENS
+        if cur and cur_size + size > budget:
+            pieces.append(header + cur)
+            cur, cur_size = [], header_size
+        cur = cur + group
+        cur_size += size
+    if cur:
+        pieces.append(header + cur)
+    return pieces
+
+
+def _pack(units: List[Tuple[List[dict], int]], budget: int) -> List[Tuple[List[dict], int]]:
+    """원문 순서를 유지하며 예산 안에서 단위들을 이어 붙인다 (예산보다 큰 단위는 단독 청크)"""
+    chunks: List[Tuple[List[dict], int]] = []
+    cur: List[dict] = []
+    cur_size = 0
+    for nodes, size in units:
+        size += _SEP_TOKENS
+        if cur and cur_size + size > budget:
+            chunks.append((cur, cur_size))
+            cur, cur_size = [], 0
+        cur = cur + nodes
+        cur_size += size
+    if cur:
+        chunks.append((cur, cur_size))
+    return chunks
+
+
+def split_payload(parsed_payload: dict, budget: int = CHUNK_TOKEN_BUDGET) -> List[Dict[str, Any]]:
+    """
+    합쳐진 원본(parsed_payload)을 청크 목록으로 나눈다
+    - docx.content: 최상위 라벨 단위로 묶어 예산(추정 토큰) 안에서 원문 순서대로 채움
+      (예산보다 큰 라벨·표는 _split_units에서 예산 크기 조각으로 나눔 → 청크 본문은 한 문장이 예산보다 크지 않은 한 예산 이내)
+    - pdf.pages: 청크가 차지하는 본문 비율로 페이지 범위를 추정해 그 페이지의 header/footer만 (앞뒤 PAGE_MARGIN쪽 여유)
+      첫 청크에는 표지·목차 쪽(FRONT_PAGES)을 항상 포함
+    → [{"index", "total", "labels", "pages": [첫 쪽, 끝 쪽] | None, "est_tokens", "payload"}]
+    """
+    document = parsed_payload.get("document") or {}
+    docx = document.get("docx") or {}
+    pdf = document.get("pdf") or {}
+    pages = pdf.get("pages") or []
+
+    units = _split_units(docx.get("content") or [], max(1, budget))
+    chunks = _pack(units, max(1, budget)) or [([], 0)]
+    grand = sum(size for _, size in chunks) or 1
+
+    out = []
+    done = 0
+    for i, (nodes, size) in enumerate(chunks, start=1):
+        first = int(done / grand * len(pages)) + 1 - PAGE_MARGIN
+        done += size
+        last = -(-done * len(pages) // grand) + PAGE_MARGIN
+        if i == 1:
+            first = 1
+            last = max(last, FRONT_PAGES)
+        first, last = max(1, first), min(len(pages), last)
+        chunk_pages = [p for p in pages if first <= p.get("page", 0) <= last]
+        payload = {
+            "v": parsed_payload.get("v", "1"),
+            "document": {
+                "docx": {**docx, "content": nodes},
+                "pdf": {**pdf, "pages": chunk_pages},
+            },
+        }
+        out.append({
+            "index": i,
+            "total": len(chunks),
+            "labels": [n["label"] for n in nodes if "label" in n],
+            "pages": [first, last] if chunk_pages else None,
+            "est_tokens": _estimate_tokens(payload),
+            "payload": payload,
+        })
+    return out
+
+
+def merge_items(chunk_items: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """청크별 items → 중복 제거 + 중요도 순(🟥→🟧→🟨→🟦, 같으면 원문 순서) 정렬 + no 재부여"""
+    seen = set()
+    merged = []
+    for items in chunk_items:
+        for it in items:
+            key = tuple(" ".join(str(it.get(k, "")).split()) for k in ("category", "location", "summary", "evidence"))
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(it)
+    rank = lambda it: next((r for icon, r in SEVERITY_ORDER.items() if icon in str(it.get("severity", ""))), len(SEVERITY_ORDER))
+    merged.sort(key=rank)
+    return [{**it, "no": no} for no, it in enumerate(merged, start=1)]
+
+
+# ---------- 내부 호출용 핵심 로직 ----------
+def run_checkreport_gpt(parsed_payload: dict, debug: bool = False, chunked: Optional[bool] = None) -> Tuple[dict, Dict[str, Any]]:
+    """
+    합쳐진 원본 전체 JSON(parsed_payload)을 GPT에 전달하여
+    테이블 렌더링용 스키마(JSON)로 변환.
+    - chunked=None(기본): 1회 호출. CHECKREPORT_GPT_CHUNKED=1이고 원본 추정 토큰이 CHUNK_TOKEN_BUDGET을 넘을 때만 분할 검토
+    - chunked=True/False: 강제 지정
+
+    반환:
+      - result: {"version":"1","total":N,"items":[...]}
+      - debug_payload:
+          {
+            "gpt_request": {...},          # 실제 보낼 전체 파라미터 (오류 시에도 채움, 분할 검토면 "gpt_requests" 목록)
+            "gpt_response_meta": {...},    # 호출 성공 시 메타
+            "gpt_chunks": [...],           # 분할 검토: 청크별 라벨/페이지/추정 토큰/소요 시간/usage/오류
+            "instruction_text": "...",     # 사람이 읽기 쉽게 원문 노출
+            "error": "..."                 # 호출 실패 시 오류 메시지
+          }
+    """
+    if chunked is None:
+        chunked = CHUNKED_REVIEW and _estimate_tokens(parsed_payload) > CHUNK_TOKEN_BUDGET
+    if chunked:
+        return _run_chunked(parsed_payload, debug)
+
+    debug_payload: Dict[str, Any] = {}
+    instruction_text = INSTRUCTION_TEXT
+
+    # 1) 실제로 보낼 '요청 페이로드'를 선구성 (오류여도 디버그에 넣기 위함)
+    request_payload = _request_payload(instruction_text, parsed_payload)
+
     # 2) 디버그 켜진 경우, 호출 전부터 gpt_request/instruction_text를 채워둠
     if debug:
         debug_payload["gpt_request"] = request_payload
@@ -231,43 +458,21 @@ def run_checkreport_gpt(parsed_payload: dict, debug: bool = False) -> Tuple[dict
     if not api_key:
         if debug:
             debug_payload["error"] = "OPENAI_API_KEY is not set (모델 호출 생략)."
-        return {"version": "1", "total": 0, "items": []}, debug_payload
+        return _empty_result(), debug_payload
 
-    # 4) 실제 호출
+    # 4) 실제 호출 + 5) 스키마 정규화
     try:
-        client = OpenAI(api_key=api_key)
-        completion = client.chat.completions.create(**request_payload)
-
-        content = completion.choices[0].message.content if completion.choices else None
-        data = json.loads(content) if content else {"version": "1", "total": 0, "items": []}
-
-        # 5) 스키마 정규화
-        items = data.get("items", [])
-        norm = []
-        for idx, it in enumerate(items, start=1):
-            norm.append({
-                "no":              it.get("no", idx),
-                "category":        it.get("category", ""),
-                "severity":        it.get("severity", ""),
-                "location":        it.get("location", ""),
-                "summary":         it.get("summary", ""),
-                "evidence":        it.get("evidence", ""),
-                "recommendation":  it.get("recommendation", "")
-            })
+        client = get_resource("openai")
+        norm, completion = _call_review(client, request_payload)
         result = {"version": "1", "total": len(norm), "items": norm}
 
         # 6) 디버그 메타 (성공 시)
         if debug:
-            usage = getattr(completion, "usage", None)
             debug_payload["gpt_response_meta"] = {
                 "id": getattr(completion, "id", None),
                 "created": getattr(completion, "created", None),
                 "model": getattr(completion, "model", None),
-                "usage": {
-                    "prompt_tokens": getattr(usage, "prompt_tokens", None) if usage else None,
-                    "completion_tokens": getattr(usage, "completion_tokens", None) if usage else None,
-                    "total_tokens": getattr(usage, "total_tokens", None) if usage else None,
-                }
+                "usage": _usage(completion),
             }
 
         return result, debug_payload
@@ -276,5 +481,70 @@ def run_checkreport_gpt(parsed_payload: dict, debug: bool = False) -> Tuple[dict
         # 7) 실패 시에도 디버그에 오류를 남김
         if debug:
             debug_payload["error"] = f"OpenAI call failed: {e}"
-        return {"version": "1", "total": 0, "items": []}, debug_payload
-        
+        return _empty_result(), debug_payload
+
+
+def _run_chunked(parsed_payload: dict, debug: bool) -> Tuple[dict, Dict[str, Any]]:
+    """
+    분할 검토: 최상위 라벨 단위 청크를 동시에(GPT_CONCURRENCY개까지) 검토하고 items를 합친다
+    - 한 청크가 실패해도 나머지 결과는 반환(실패 청크는 gpt_chunks/error에 기록)
+    """
+    debug_payload: Dict[str, Any] = {}
+    chunks = split_payload(parsed_payload)
+    requests = []
+    for c in chunks:
+        note = CHUNK_NOTE.format(index=c["index"], total=c["total"])
+        requests.append(_request_payload(f"{INSTRUCTION_TEXT}\n\n{note}", c["payload"]))
+
+    records = [
+        {"index": c["index"], "labels": c["labels"], "pages": c["pages"], "est_tokens": c["est_tokens"]}
+        for c in chunks
+    ]
+    if debug:
+        debug_payload["gpt_requests"] = requests
+        debug_payload["instruction_text"] = INSTRUCTION_TEXT
+        debug_payload["gpt_chunks"] = records
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        if debug:
+            debug_payload["error"] = "OPENAI_API_KEY is not set (모델 호출 생략)."
+        return _empty_result(), debug_payload
+
+    client = get_resource("openai")
+
+    def review(i):
+        t0 = time.perf_counter()
+        try:
+            items, completion = _call_review(client, requests[i])
+            records[i].update(items=len(items), usage=_usage(completion), model=getattr(completion, "model", None))
+        except Exception as e:
+            items = []
+            records[i]["error"] = f"OpenAI call failed: {e}"
+        records[i]["elapsed_ms"] = round((time.perf_counter() - t0) * 1000)
+        return items
+
+    t_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(GPT_CONCURRENCY, len(chunks))), thread_name_prefix="checkreport-gpt") as pool:
+        chunk_items = list(pool.map(review, range(len(chunks))))
+    elapsed_ms = round((time.perf_counter() - t_start) * 1000)
+
+    items = merge_items(chunk_items)
+    result = {"version": "1", "total": len(items), "items": items}
+
+    if debug:
+        totals = {}
+        for r in records:
+            for k, v in (r.get("usage") or {}).items():
+                if v is not None:
+                    totals[k] = totals.get(k, 0) + v
+        debug_payload["gpt_response_meta"] = {
+            "mode": "chunked",
+            "chunks": len(chunks),
+            "elapsed_ms": elapsed_ms,
+            "usage": totals,
+        }
+        errors = [f"#{r['index']}: {r['error']}" for r in records if "error" in r]
+        if errors:
+            debug_payload["error"] = " / ".join(errors)
+    return result, debug_payload
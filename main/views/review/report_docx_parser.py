@@ -10,20 +10,26 @@ report_docx_parser.py
   * 라벨 탐지 규칙 유지 (숫자-목차/섹션, <첨부N> 등)
 """
 
-import io
 import re
-import zipfile
 from typing import List, Dict, Any, Optional, Tuple
 
 from lxml import etree
 
+from main.utils.ooxml import (
+    M, NS, XP_ANY_TEXT, XP_M_TEXT, XP_MATH, XP_PARAGRAPHS, XP_W_TEXT,
+    iter_body, table_rows, text_outside_alternate_content,
+)
 
-# ------------- Namespaces -------------
-NS = {
-    "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
-    "m": "http://schemas.openxmlformats.org/officeDocument/2006/math",
-    "mc": "http://schemas.openxmlformats.org/markup-compatibility/2006",
-}
+
+# ------------- OMML 자식 태그 / 미리 컴파일한 XPath -------------
+M_E, M_SUB, M_SUP, M_NUM, M_DEN, M_LIM_LOW, M_LIM_UPP = (
+    M + t for t in ("e", "sub", "sup", "num", "den", "limLow", "limUpp")
+)
+M_NARY_CHR = f"{M}naryPr/{M}chr"
+M_VAL = M + "val"
+_XP_MATH_PARA_INNER = etree.XPath(
+    "./m:oMath|./m:r|./m:f|./m:nary|./m:sSub|./m:sSup|./m:sSubSup|./m:d", namespaces=NS
+)
 
 
 # ------------- Utilities -------------
@@ -49,29 +55,28 @@ def _join(parts: List[str]) -> str:
 # ------------- OMML (Math) linearization -------------
 def _m_run_text(mr: etree._Element) -> str:
     # m:r 안의 m:t / w:t 둘 다 방어
-    ts = mr.xpath(".//m:t/text()", namespaces=NS)
+    ts = XP_M_TEXT(mr)
     if ts:
         return "".join(ts)
-    ts = mr.xpath(".//w:t/text()", namespaces=NS)
-    return "".join(ts)
+    return "".join(XP_W_TEXT(mr))
 
 
 def _m_sSub(node: etree._Element) -> str:
-    base = parse_any(node.find("m:e", NS))
-    sub  = parse_any(node.find("m:sub", NS))
+    base = parse_any(node.find(M_E))
+    sub  = parse_any(node.find(M_SUB))
     return f"{base}_{{{sub}}}" if sub else base
 
 
 def _m_sSup(node: etree._Element) -> str:
-    base = parse_any(node.find("m:e", NS))
-    sup  = parse_any(node.find("m:sup", NS))
+    base = parse_any(node.find(M_E))
+    sup  = parse_any(node.find(M_SUP))
     return f"{base}^{{{sup}}}" if sup else base
 
 
 def _m_sSubSup(node: etree._Element) -> str:
-    base = parse_any(node.find("m:e", NS))
-    sub  = parse_any(node.find("m:sub", NS))
-    sup  = parse_any(node.find("m:sup", NS))
+    base = parse_any(node.find(M_E))
+    sub  = parse_any(node.find(M_SUB))
+    sup  = parse_any(node.find(M_SUP))
     if sub and sup:
         return f"{base}_{{{sub}}}^{{{sup}}}"
     if sub:
@@ -82,13 +87,13 @@ def _m_sSubSup(node: etree._Element) -> str:
 
 
 def _m_d(node: etree._Element) -> str:
-    e = parse_any(node.find("m:e", NS))
+    e = parse_any(node.find(M_E))
     return f"({e})" if e else ""
 
 
 def _m_frac(node: etree._Element) -> str:
-    num = parse_any(node.find("m:num", NS))
-    den = parse_any(node.find("m:den", NS))
+    num = parse_any(node.find(M_NUM))
+    den = parse_any(node.find(M_DEN))
     if not num and not den:
         return ""
     if num and den:
@@ -98,16 +103,16 @@ def _m_frac(node: etree._Element) -> str:
 
 def _m_nary(node: etree._Element) -> str:
     # ∑, ∏ 등
-    chr_ = node.find("m:naryPr/m:chr", NS)
-    op = chr_.get(f"{{{NS['m']}}}val") if chr_ is not None else "∑"
+    chr_ = node.find(M_NARY_CHR)
+    op = chr_.get(M_VAL) if chr_ is not None else "∑"
 
     # 하한/상한: sub/sup 또는 limLow/limUpp 모두 지원
-    sub  = node.find("m:sub", NS)
-    sup  = node.find("m:sup", NS)
-    limL = node.find("m:limLow", NS)
-    limU = node.find("m:limUpp", NS)
+    sub  = node.find(M_SUB)
+    sup  = node.find(M_SUP)
+    limL = node.find(M_LIM_LOW)
+    limU = node.find(M_LIM_UPP)
 
-    body = parse_any(node.find("m:e", NS))
+    body = parse_any(node.find(M_E))
 
     lo = parse_any(sub) if sub is not None else (parse_any(limL) if limL is not None else "")
     up = parse_any(sup) if sup is not None else (parse_any(limU) if limU is not None else "")
@@ -144,8 +149,7 @@ def _m_oMath(node: etree._Element) -> str:
 
 
 def _m_oMathPara(node: etree._Element) -> str:
-    inner = node.xpath("./m:oMath|./m:r|./m:f|./m:nary|./m:sSub|./m:sSup|./m:sSubSup|./m:d",
-                       namespaces=NS)
+    inner = _XP_MATH_PARA_INNER(node)
     if not inner:
         return parse_any(node)
     parts = [parse_any(ch) for ch in inner]
@@ -157,8 +161,7 @@ def parse_any(node: Optional[etree._Element]) -> str:
         return ""
     q = etree.QName(node)
     if q.namespace != NS["m"]:
-        ts = node.xpath(".//m:t/text()|.//w:t/text()", namespaces=NS)
-        return "".join(ts)
+        return "".join(XP_ANY_TEXT(node))
 
     name = q.localname
     if   name == "oMathPara": return _m_oMathPara(node)
@@ -174,8 +177,7 @@ def parse_any(node: Optional[etree._Element]) -> str:
     parts = [parse_any(ch) for ch in node]
     if parts:
         return _join(parts)
-    ts = node.xpath(".//m:t/text()|.//w:t/text()", namespaces=NS)
-    return "".join(ts)
+    return "".join(XP_ANY_TEXT(node))
 
 
 def _paragraph_text_without_math(w_p: etree._Element) -> str:
@@ -189,19 +191,16 @@ def _paragraph_text_without_math(w_p: etree._Element) -> str:
             continue
 
         # 2) 자손 어딘가에 수식 있으면 → 수식만 모으고 평문 꼬리(대체 텍스트)는 버림
-        math_nodes = child.xpath(".//m:oMath|.//m:oMathPara", namespaces=NS)
+        math_nodes = XP_MATH(child)
         if math_nodes:
             for mn in math_nodes:
                 out.append(parse_any(mn))
             continue
 
-        # 3) 평문만 있으면 텍스트만 (AlternateContent는 통째 제거)
-        child_copy = etree.fromstring(etree.tostring(child))
-        for ac in child_copy.xpath(".//mc:AlternateContent", namespaces=NS):
-            ac.getparent().remove(ac)
-        wts = child_copy.xpath(".//w:t/text()", namespaces=NS)
+        # 3) 평문만 있으면 텍스트만 (AlternateContent 안쪽은 제외 — 사본을 만들지 않고 XPath로 거른다)
+        wts = text_outside_alternate_content(child)
         if wts:
-            out.append("".join(wts))
+            out.append(wts)
 
     return _norm_space(_join([s for s in out if s]))
 
@@ -209,7 +208,7 @@ def _paragraph_text_without_math(w_p: etree._Element) -> str:
 # ------------- Table extraction (with merges) -------------
 def _cell_text(w_tc: etree._Element) -> str:
     # 모든 문단을 수집 + 수식 선형화 적용
-    ps = w_tc.xpath(".//w:p", namespaces=NS)
+    ps = XP_PARAGRAPHS(w_tc)
     parts = [_paragraph_text_without_math(p) for p in ps]
     # 빈 줄 정리
     parts = [p for p in parts if p]
@@ -221,7 +220,8 @@ def _build_table_matrix(w_tbl: etree._Element) -> List[List[Optional[Dict[str, A
     표의 병합을 풀어 실좌표 행렬을 구성한다.
     각 실좌표에 {'rspan':1.., 'cspan':1.., 'text':...,'root':(r,c)} 저장.
     """
-    rows = w_tbl.xpath("./w:tr", namespaces=NS)
+    # 셀 텍스트(수식 선형화 포함)와 병합 정보는 셀마다 1번만 계산
+    rows = table_rows(w_tbl, text=_cell_text)
     matrix: List[List[Optional[Dict[str, Any]]]] = []
     # 각 행에서 column 포인터 이동하며 gridSpan, vMerge 처리
     # vMerge: 'restart' 시작점에서 아래로 같은 셀 확장
@@ -229,13 +229,12 @@ def _build_table_matrix(w_tbl: etree._Element) -> List[List[Optional[Dict[str, A
     # Word는 명시적으로 컬럼수 정의가 어려워, 행마다 채우며 확장
     merge_down: Dict[Tuple[int, int], int] = {}  # (r,c) -> 남은 rspan
 
-    for r_idx, tr in enumerate(rows, start=1):
+    for r_idx, cells in enumerate(rows, start=1):
         # ensure row exists
         if len(matrix) < r_idx:
             matrix.append([])
 
         c_ptr = 1
-        tcs = tr.xpath("./w:tc", namespaces=NS)
 
         # carry-over (위에서 내려온 vMerge 채움)
         # 먼저 이 행의 시작 단계에서 matrix[r_idx-1]를 필요한 만큼 확장
@@ -272,22 +271,8 @@ def _build_table_matrix(w_tbl: etree._Element) -> List[List[Optional[Dict[str, A
                 current_row.append({"root": (root_r, root_c)})
 
         # 이제 실제 tc들을 순서대로 배치
-        for tc in tcs:
-            # gridSpan
-            grid_span = 1
-            gs = tc.xpath(".//w:gridSpan/@w:val", namespaces=NS)
-            if gs:
-                try:
-                    grid_span = int(gs[0])
-                except Exception:
-                    grid_span = 1
-
-            # vMerge
-            vmerge_val = tc.xpath(".//w:vMerge/@w:val", namespaces=NS)
-            vmerge_val = vmerge_val[0] if vmerge_val else None  # 'restart' | None(continue)
-
-            # text
-            text = _cell_text(tc)
+        for text, grid_span, vmerge_val in cells:
+            # grid_span: gridSpan(가로 확장), vmerge_val: 'restart' | 'continue' | None
 
             # current_row에서 첫 빈칸 위치 찾기
             col = 1
@@ -314,7 +299,7 @@ def _build_table_matrix(w_tbl: etree._Element) -> List[List[Optional[Dict[str, A
                 # rspan은 아래 행에서 같은 root를 카운트하며 늘려준다.
                 # 일단 여기선 1로 두고, carry-down dict에 추가
                 pass
-            elif vmerge_val is None:
+            elif vmerge_val == "continue":
                 # vMerge 계속 (위에서 내려온 셀의 일부) → 이 tc는 보통 오지 않음
                 # 혹 오더라도 텍스트는 무시하고 root 참조만 두는 것이 자연스럽다.
                 pass
@@ -413,8 +398,9 @@ def _is_toc_item(text: str) -> bool:
 
 
 # ------------- Document walk (w:tbl/w:p in order) -------------
-def _walk_blocks(w_body: etree._Element):
-    for child in w_body:
+def _walk_blocks(blocks):
+    # blocks: w:body 자식 iterable (ooxml.iter_body — 스트리밍, 처리한 블록은 해제됨)
+    for child in blocks:
         q = etree.QName(child)
         if q.namespace != NS["w"]:
             continue
@@ -426,7 +412,7 @@ def _walk_blocks(w_body: etree._Element):
         # 그림 등 다른 블록은 스킵
 
 
-def _parse_blocks_to_content(w_body: etree._Element) -> List[Dict[str, Any]]:
+def _parse_blocks_to_content(blocks) -> List[Dict[str, Any]]:
     """
     문서의 블록(w:tbl/w:p)을 순회하여 content 리스트 생성.
     - TOC 모드: '목 차' 발견 ~ 비유사 항목까지 sen만 배출
@@ -439,7 +425,7 @@ def _parse_blocks_to_content(w_body: etree._Element) -> List[Dict[str, Any]]:
     toc_mode = False
     toc_cooldown = 0  # 목차 종료 판단용(연속해서 TOC 아닌 줄 만나면 종료)
 
-    for kind, node in _walk_blocks(w_body):
+    for kind, node in _walk_blocks(blocks):
         if kind == "tbl":
             matrix = _build_table_matrix(node)
             tbl_obj = _emit_table(matrix)
@@ -517,14 +503,6 @@ def _append_node(out: List[Dict[str, Any]],
         out.append(node_obj)
 
 
-# ------------- DOCX loader -------------
-def _load_document_xml(docx_bytes: bytes) -> etree._Element:
-    with zipfile.ZipFile(io.BytesIO(docx_bytes)) as zf:
-        with zf.open("word/document.xml") as f:
-            xml = f.read()
-    return etree.fromstring(xml)
-
-
 # ------------- Public API (keep function name) -------------
 def parse_docx(file_obj) -> Dict[str, Any]:
     """
@@ -545,19 +523,13 @@ def parse_docx(file_obj) -> Dict[str, Any]:
     elif isinstance(file_obj, (bytes, bytearray)):
         data = bytes(file_obj)
     elif isinstance(file_obj, str):
-        # path
-        with open(file_obj, "rb") as fp:
-            data = fp.read()
+        # path (zip에서 바로 스트리밍)
+        data = file_obj
     else:
         raise TypeError(f"Unsupported docx input type: {type(file_obj)}")
 
-    # parse document.xml
-    root = _load_document_xml(data)
-    body = root.find(".//w:body", NS)
-    if body is None:
-        return {"v": "1", "content": []}
-
-    content = _parse_blocks_to_content(body)
+    # parse document.xml (본문 블록 스트리밍; body가 없으면 빈 content)
+    content = _parse_blocks_to_content(iter_body(data))
 
     return {
         "v": "1",
@@ -3,7 +3,41 @@ from typing import Dict, Any, List, Tuple, Optional
 from io import BytesIO
 from pdfminer.high_level import extract_pages
 from pdfminer.layout import LTTextContainer, LTTextLine
+import multiprocessing
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+from main.utils.resources import get_resource, register, reset_resource
+
+# 빠른 경로(PyMuPDF): 페이지 위/아래 띠(높이 비율)만 읽는다
+BAND_RATIO = 0.2
+# 이 페이지 수 이상이면 페이지 구간을 나눠 프로세스 풀에서 병렬 처리
+PARALLEL_MIN_PAGES = 40
+# 위/아래 끝 차이가 이 값(pt) 이내인 줄은 같은 행으로 본다
+ROW_TOLERANCE = 2.0
+PARSE_WORKERS = max(1, int(os.environ.get("CHECKREPORT_PARSE_WORKERS", min(4, os.cpu_count() or 1))))
+
+
+@lru_cache(maxsize=None)
+def _pymupdf():
+    """PyMuPDF 모듈(없으면 None) — URLconf import가 느려지지 않도록 첫 PDF 파싱 때 import"""
+    try:
+        import pymupdf
+    except ImportError:
+        return None
+    return pymupdf
+
+
+@register("checkreport_parse_pool")
+def _make_parse_pool():
+    # 파싱은 CPU 바운드 → 프로세스 풀. 스레드가 도는 서버 프로세스에서 fork하지 않도록 spawn 사용
+    # checkreport는 DOCX 작업과 PDF 구간 작업을 같은 풀에 넣으므로 최소 2개(둘이 동시에 돌도록)
+    return ProcessPoolExecutor(max_workers=max(2, PARSE_WORKERS), mp_context=multiprocessing.get_context("spawn"))
+
 
 def _normalize_text(s: str) -> str:
     s = s.replace('\u00A0', ' ')
@@ -28,40 +62,136 @@ def _top_bottom_lines(layout_objects) -> Tuple[Optional[Tuple[float, float, str]
     bot_line = min(lines, key=lambda t: t[0])  # footer = 가장 아래(최소 y0)
     return top_line, bot_line
 
-def parse_pdf(file_like) -> Dict[str, Any]:
-    """
-    외부 시그니처 유지: Django InMemoryUploadedFile 등 file-like 객체를 받아 처리.
-    내부에서 bytes로 읽어 BytesIO로 감싸 pdfminer에 전달한다.
-    """
-    # file-like → bytes → BytesIO 로 표준화
+def _read_pdf_bytes(file_like) -> bytes:
+    # file-like(Django InMemoryUploadedFile 등) / bytes → bytes
+    if isinstance(file_like, (bytes, bytearray)):
+        return bytes(file_like)
     try:
         if hasattr(file_like, "seek"):
             file_like.seek(0)
         data = file_like.read()
         if isinstance(data, str):
             data = data.encode("utf-8")
-        bio = BytesIO(data)
-        bio.seek(0)
+        return data
     except Exception as e:
         raise RuntimeError(f"Failed to read PDF bytes: {e}")
 
-    pages_out: List[Dict[str, Any]] = []
-    page_index = 0
+def _result(pages: List[Tuple[Optional[str], Optional[str]]]) -> Dict[str, Any]:
+    return {
+        "v": "1",
+        "total_pages": len(pages),
+        "pages": [
+            {"page": i, "header": [top] if top else [], "footer": [bot] if bot else []}
+            for i, (top, bot) in enumerate(pages, start=1)
+        ],
+    }
 
+# ─────────────────────────────────────────────────────────────
+# 기준 경로: pdfminer 전체 레이아웃 분석
+# ─────────────────────────────────────────────────────────────
+def _parse_pdf_pdfminer(data: bytes) -> Dict[str, Any]:
+    pages: List[Tuple[Optional[str], Optional[str]]] = []
     # extract_pages는 파일 경로나 바이너리 스트림(파일 객체)을 받는다 → BytesIO 사용
-    for layout in extract_pages(bio):
-        page_index += 1
+    for layout in extract_pages(BytesIO(data)):
         top, bot = _top_bottom_lines(layout)
-        header_list = [top[2]] if top else []
-        footer_list = [bot[2]] if bot else []
-        pages_out.append({
-            "page": page_index,
-            "header": header_list,
-            "footer": footer_list,
-        })
+        pages.append((top[2] if top else None, bot[2] if bot else None))
+    return _result(pages)
 
-    return {
-        "v": "1",
-        "total_pages": page_index,
-        "pages": pages_out
-    }
+# ─────────────────────────────────────────────────────────────
+# 빠른 경로: PyMuPDF로 위/아래 띠(clip)의 텍스트 줄만 읽기
+# ─────────────────────────────────────────────────────────────
+def _text_lines(page, clip=None) -> List[Tuple[float, float, float, str]]:
+    """(y0, y1, x0, 정규화 텍스트) — PyMuPDF 좌표는 y가 아래로 커진다"""
+    lines = []
+    for block in page.get_text("dict", clip=clip, flags=_pymupdf().TEXTFLAGS_TEXT)["blocks"]:
+        for line in block.get("lines", ()):
+            txt = _normalize_text("".join(span["text"] for span in line["spans"]))
+            if txt:
+                x0, y0, _x1, y1 = line["bbox"]
+                lines.append((y0, y1, x0, txt))
+    return lines
+
+def _first_in_row(lines, edge):
+    # edge(줄의 위/아래 끝) 기준 가장 바깥 줄과 같은 행(ROW_TOLERANCE 이내)에 있는 줄 중 가장 왼쪽
+    # → 같은 행의 머리글 조각(예: 왼쪽 제목 / 오른쪽 번호)은 글꼴 높이 차이와 무관하게 왼쪽 것을 고른다
+    if not lines:
+        return None
+    best = min(edge(t) for t in lines)
+    return min((t for t in lines if edge(t) - best <= ROW_TOLERANCE), key=lambda t: t[2])
+
+def _topmost(lines):
+    return _first_in_row(lines, lambda t: t[0])     # 가장 위(최소 y0)
+
+def _bottommost(lines):
+    return _first_in_row(lines, lambda t: -t[1])    # 가장 아래(최대 y1)
+
+def _page_header_footer(page) -> Tuple[Optional[str], Optional[str]]:
+    """
+    위/아래 띠만 읽어 header/footer 줄을 고른다
+    - 고른 줄이 띠 경계에 걸치면(clip에서 글자가 잘렸을 수 있음) 또는 띠에 글자가 없으면 그 쪽만 페이지 전체를 읽는다
+    """
+    pymupdf = _pymupdf()
+    rect = page.rect
+    band = rect.height * BAND_RATIO
+    top_clip = pymupdf.Rect(rect.x0, rect.y0, rect.x1, rect.y0 + band)
+    bot_clip = pymupdf.Rect(rect.x0, rect.y1 - band, rect.x1, rect.y1)
+
+    top = _topmost(_text_lines(page, top_clip))
+    bot = _bottommost(_text_lines(page, bot_clip))
+    full = None
+    if top is None or top[1] > top_clip.y1:
+        full = _text_lines(page)
+        top = _topmost(full)
+    if bot is None or bot[0] < bot_clip.y0:
+        full = _text_lines(page) if full is None else full
+        bot = _bottommost(full)
+    return (top[3] if top else None), (bot[3] if bot else None)
+
+def _scan_pages(data: bytes, start: int, stop: int) -> List[Tuple[Optional[str], Optional[str]]]:
+    """페이지 구간 [start, stop) 처리 (프로세스 풀 작업 단위)"""
+    with _pymupdf().open(stream=data, filetype="pdf") as doc:
+        return [_page_header_footer(doc[i]) for i in range(start, stop)]
+
+def _parse_pdf_pymupdf(data: bytes, executor=None, timeout: Optional[float] = None) -> Dict[str, Any]:
+    with _pymupdf().open(stream=data, filetype="pdf") as doc:
+        n = doc.page_count
+        if n == 0 or (executor is None and (n < PARALLEL_MIN_PAGES or PARSE_WORKERS < 2)):
+            return _result([_page_header_footer(doc[i]) for i in range(n)])
+
+    shared = executor is None
+    executor = executor or get_resource("checkreport_parse_pool")
+    step = -(-n // PARSE_WORKERS)
+    # timeout은 구간마다가 아니라 전체에 한 번: 구간 결과를 기다릴 때마다 남은 시간만 준다
+    deadline = None if timeout is None else time.perf_counter() + timeout
+    futures = [executor.submit(_scan_pages, data, s, min(s + step, n)) for s in range(0, n, step)]
+    pages: List[Tuple[Optional[str], Optional[str]]] = []
+    try:
+        for f in futures:
+            pages.extend(f.result(timeout=None if deadline is None else max(0.0, deadline - time.perf_counter())))
+    except BrokenProcessPool:
+        # 워커가 비정상 종료되면 다음 요청에서 풀을 새로 만든다
+        if shared:
+            reset_resource("checkreport_parse_pool")
+        raise
+    finally:
+        for f in futures:
+            f.cancel()
+    return _result(pages)
+
+def parse_pdf(file_like, engine: str = "auto", executor=None, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    외부 시그니처 유지: Django InMemoryUploadedFile 등 file-like 객체(또는 bytes)를 받아 처리.
+    페이지마다 가장 위 텍스트 줄(header)과 가장 아래 줄(footer)만 뽑는다.
+    - engine="auto": PyMuPDF가 있으면 위/아래 띠만 읽는 빠른 경로(페이지가 많으면 구간 병렬), 없으면 pdfminer
+    - engine="pdfminer": 전체 레이아웃 분석(기준 구현)
+    - executor/timeout: 작업을 넘길 풀과 전체 대기 시간(초). executor를 주면 페이지 수와 관계없이 풀에서 처리
+      (없으면 페이지가 많을 때만 공용 풀 사용)
+    """
+    data = _read_pdf_bytes(file_like)
+    if engine == "pdfminer" or (engine == "auto" and _pymupdf() is None):
+        if executor is None:
+            return _parse_pdf_pdfminer(data)
+        return executor.submit(_parse_pdf_pdfminer, data).result(timeout=timeout)
+    if _pymupdf() is None:
+        raise RuntimeError("PyMuPDF(pymupdf)가 설치되어 있지 않습니다.")
+    return _parse_pdf_pymupdf(data, executor=executor, timeout=timeout)
@@ -1,6 +1,4 @@
-import json
 import sqlite3
-import pandas as pd
 from django.shortcuts import render
 
 def history(request):
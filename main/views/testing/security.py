@@ -1,34 +1,216 @@
-from django.http import JsonResponse
+import json
+import multiprocessing
+import os
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
-from .security_extractHTML import extract_vulnerability_sections
+from main.utils.resources import get_resource, register, reset_resource
+from .security_css import css_url
+from .security_extractHTML import stream_report_file
+from .security_session import new_session_id, save_details
+
+MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB 크기 제한
+PARSE_WORKERS = max(1, int(os.environ.get("INVICTI_PARSE_WORKERS", min(4, os.cpu_count() or 1))))
+PARSE_TIMEOUT = float(os.environ.get("INVICTI_PARSE_TIMEOUT", 60))  # 파일당 초 (워커가 그 파일을 시작한 시점부터)
+EVENT_POLL_INTERVAL = 0.2  # 워커 이벤트 큐 대기(초) → 그 사이 작업 실패/시간 초과 확인
+
+
+def _warm_worker():
+    # 워커마다 템플릿 매칭기를 미리 로드 (첫 파일 지연 방지)
+    get_resource("security_matcher")
+
+
+@register("invicti_parse_pool")
+def _make_parse_pool():
+    # 파싱은 CPU 바운드(lxml/bleach) → 프로세스 풀. 스레드가 도는 서버 프로세스에서 fork하지 않도록 spawn 사용
+    return ProcessPoolExecutor(
+        max_workers=PARSE_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_warm_worker,
+    )
+
+
+def _discard_parse_pool(pool):
+    # 시간 초과로 멈춘 워커는 취소할 수 없으므로 풀째 버리고 워커 프로세스를 종료 (다음 요청에서 새 풀 생성)
+    reset_resource("invicti_parse_pool")
+    processes = list((getattr(pool, "_processes", None) or {}).values())  # shutdown()이 목록을 비우므로 먼저 확보
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+@register("invicti_event_manager")
+def _make_event_manager():
+    # 풀 워커 → 요청 스레드로 블록 단위 행을 보내는 큐 (풀 작업 인자로 넘길 수 있는 건 Manager 큐뿐)
+    return multiprocessing.get_context("spawn").Manager()
+
+
+def _ndjson(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False) + "\n"
+
+
+def _css_line(css_hash) -> str:
+    return _ndjson({"type": "css", "css_hash": css_hash, "css_url": css_url(css_hash)})
+
+
+def _upload_source(uploaded_file):
+    # 디스크에 받은 업로드(TemporaryUploadedFile)는 경로만 넘겨 워커가 직접 청크로 읽게 하고,
+    # 메모리 업로드(FILE_UPLOAD_MAX_MEMORY_SIZE 이하)만 바이트로 넘긴다
+    if hasattr(uploaded_file, "temporary_file_path"):
+        return uploaded_file.temporary_file_path()
+    return uploaded_file.read()
+
+
+def _iter_parse_events(uploaded_files):
+    """
+    파일마다 풀 작업(stream_report_file)을 넣고, 워커가 큐로 보내는 이벤트를 도착 순서대로 산출
+    → (파일 순번, "css", css_hash) · (i, "rows", [행...]) · (i, "file", {"rows", "duration_ms"}) · (i, "error", {"error", "status"})
+    - 파일마다 워커가 시작한 시점부터 PARSE_TIMEOUT초 제한 → 넘으면 풀을 버리고 "error"
+    - "error"를 산출하면 거기서 끝난다 (남은 작업은 취소)
+    """
+    pool = get_resource("invicti_parse_pool")
+    events = get_resource("invicti_event_manager").Queue()
+    futures = {i: pool.submit(stream_report_file, _upload_source(f), events, i) for i, f in enumerate(uploaded_files)}
+    started, finished = {}, set()
+    try:
+        while len(finished) < len(futures):
+            try:
+                i, kind, payload = events.get(timeout=EVENT_POLL_INTERVAL)
+            except queue.Empty:
+                pass
+            else:
+                if kind == "start":
+                    started[i] = time.monotonic()
+                else:
+                    if kind == "file":
+                        finished.add(i)
+                    yield i, kind, payload
+
+            # 다른 파일의 행이 계속 도착하는 중에도 작업 실패/시간 초과는 매 반복 확인
+            for i, future in futures.items():
+                if i in finished or not future.done():
+                    continue
+                error = future.exception()
+                if isinstance(error, BrokenProcessPool):
+                    # 워커가 비정상 종료되면 다음 요청에서 풀을 새로 만든다
+                    reset_resource("invicti_parse_pool")
+                    yield i, "error", {"error": "파일 처리 중 오류 발생: 파싱 워커가 비정상 종료되었습니다.", "status": 500}
+                    return
+                if error is not None:
+                    yield i, "error", {"error": f"파일 처리 중 오류 발생: {uploaded_files[i].name}: {str(error)}", "status": 500}
+                    return
+
+            now = time.monotonic()
+            for i, t_start in started.items():
+                if i not in finished and now - t_start > PARSE_TIMEOUT:
+                    _discard_parse_pool(pool)
+                    yield i, "error", {"error": f"파일 처리 시간 초과 ({PARSE_TIMEOUT:g}초): {uploaded_files[i].name}", "status": 504}
+                    return
+    finally:
+        # 시간 초과/오류/클라이언트 연결 종료 시 아직 시작하지 않은 작업은 버린다
+        for future in futures.values():
+            future.cancel()
+
+
+def _iter_ndjson_lines(uploaded_files):
+    """
+    워커가 블록을 닫을 때마다 보내는 행을 받는 즉시 NDJSON 한 줄씩 산출
+    {"type": "session"} → {"type": "css"}(첫 파일) · {"type": "row", "file": 파일 순번}(요약)... · 파일마다 {"type": "file"} → {"type": "done"}
+    - 여러 파일의 행이 섞여 도착하므로 파일 순번(업로드 순서)으로 표 순서를 맞추는 것은 클라이언트 몫
+    """
+    session_id = new_session_id()
+    total = 0
+    yield _ndjson({"type": "session", "session": session_id})
+    try:
+        for i, kind, payload in _iter_parse_events(uploaded_files):
+            if kind == "css":
+                if i == 0:  # css는 첫 파일 것만 사용
+                    yield _css_line(payload)
+            elif kind == "rows":
+                rows = save_details(session_id, payload, start_no=total)
+                total += len(rows)
+                for row in rows:
+                    yield _ndjson({"type": "row", "file": i, "row": row})
+            elif kind == "file":
+                yield _ndjson({"type": "file", "file": i, "name": uploaded_files[i].name, **payload})
+            else:
+                yield _ndjson({"type": "error", "error": payload["error"]})
+                return
+    except Exception as e:
+        yield _ndjson({"type": "error", "error": f"파일 처리 중 오류 발생: {str(e)}"})
+        return
+    yield _ndjson({"type": "done"})
+
+
+async def _aiter_sync(iterator):
+    # ASGI에서 동기 이터레이터를 넘기면 전체를 버퍼링하므로, 한 줄씩 스레드에서 꺼내 비동기로 흘려보낸다
+    # (thread_sensitive 기본값: 제너레이터는 항상 같은 스레드에서 진행)
+    sentinel = object()
+    while True:
+        item = await sync_to_async(next)(iterator, sentinel)
+        if item is sentinel:
+            break
+        yield item
+
 
 @require_http_methods(["POST"])
 def invicti_parse_view(request):
-    if not request.FILES.getlist('file'):
+    uploaded_files = request.FILES.getlist('file')
+    if not uploaded_files:
         return JsonResponse({"error": "업로드된 파일이 없습니다."}, status=400)
 
-    all_rows, css_data = [], ""
-    
+    for uploaded_file in uploaded_files:
+        if not uploaded_file.name.lower().endswith(('.html', '.htm')):
+            return JsonResponse({"error": f"잘못된 파일 형식: {uploaded_file.name}"}, status=400)
+
+        if uploaded_file.size > MAX_FILE_SIZE:
+            return JsonResponse({"error": f"파일 크기 초과 (10MB 제한): {uploaded_file.name}"}, status=400)
+
+    # 스트리밍 모드: 워커가 블록을 닫을 때마다 그 행을 NDJSON으로 전송 (브라우저가 전체 완료 전부터 표를 채운다)
+    if "application/x-ndjson" in request.headers.get("Accept", ""):
+        return StreamingHttpResponse(
+            _aiter_sync(_iter_ndjson_lines(uploaded_files)),
+            content_type="application/x-ndjson; charset=utf-8",
+        )
+
+    rows_by_file = [[] for _ in uploaded_files]
+    files_info = [None] * len(uploaded_files)
+    css_hash = None
+
     try:
-        for i, uploaded_file in enumerate(request.FILES.getlist('file')):
-            if not uploaded_file.name.lower().endswith(('.html', '.htm')):
-                return JsonResponse({"error": f"잘못된 파일 형식: {uploaded_file.name}"}, status=400)
-            
-            if uploaded_file.size > 10 * 1024 * 1024: # 10MB 크기 제한
-                return JsonResponse({"error": f"파일 크기 초과 (10MB 제한): {uploaded_file.name}"}, status=400)
-
-            html_content = uploaded_file.read().decode('utf-8')
-            parsed_data = extract_vulnerability_sections(html_content)
-            
-            if i == 0:
-                css_data = parsed_data.get("css", "")
-            
-            all_rows.extend(parsed_data.get("rows", []))
-            
+        for i, kind, payload in _iter_parse_events(uploaded_files):
+            if kind == "css":
+                if i == 0:  # css는 첫 파일 것만 사용
+                    css_hash = payload
+            elif kind == "rows":
+                rows_by_file[i].extend(payload)
+            elif kind == "file":
+                files_info[i] = {"name": uploaded_files[i].name, **payload}
+            else:
+                return JsonResponse({"error": payload["error"]}, status=payload["status"])
     except Exception as e:
         return JsonResponse({"error": f"파일 처리 중 오류 발생: {str(e)}"}, status=500)
 
+    # 파일 순번대로 이어 붙임 → 병합된 rows의 순서는 업로드 순서와 같다
+    all_rows = [row for rows in rows_by_file for row in rows]
+
+    # 상세 필드(스니펫/상세 JSON/프롬프트)는 세션 저장소에 두고 요약 행만 응답
+    session_id = new_session_id()
+    try:
+        summaries = save_details(session_id, all_rows)
+    except Exception as e:
+        return JsonResponse({"error": f"파싱 결과 저장 중 오류 발생: {str(e)}"}, status=500)
+
+    # CSS 본문 대신 해시/URL만 전달 (브라우저가 캐시된 .css를 재사용)
     return JsonResponse({
-        "css": css_data,
-        "rows": all_rows,
+        "parse_session": session_id,
+        "css_hash": css_hash,
+        "css_url": css_url(css_hash),
+        "rows": summaries,
+        "files": files_info,
     })
@@ -1,9 +1,36 @@
+import asyncio
 import os
 import json
-from django.http import JsonResponse
+import re
+import time
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from openai import OpenAI
+from main.utils.resources import get_resource
+from .security_session import load_session_rows
+
+# 요청하신 GPT 모델명 사용
+MODEL_NAME = "gpt-5-nano"
+SYSTEM_PROMPT = "You are a professional security expert. Your answers should be clear, concise, and directly address the vulnerability described."
+
+# 일괄 추천 동시 요청 수 (하나의 비동기 클라이언트 커넥션 풀 공유)
+GPT_BATCH_CONCURRENCY = int(os.environ.get("SECURITY_GPT_CONCURRENCY", 4))
+
+
+def _messages(prompt):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _error_message(e):
+    error_message = str(e)
+    # 사용자가 존재하지 않는 모델명을 사용했을 경우 더 친절한 안내를 제공
+    if f"The model `{MODEL_NAME}` does not exist" in error_message:
+        error_message = f"GPT 모델('{MODEL_NAME}')을 찾을 수 없습니다. 모델명을 확인하거나 OpenAI API Plan을 확인하세요."
+    return error_message
+
 
 @csrf_exempt
 @require_http_methods(["POST"])
@@ -27,27 +54,127 @@ def get_gpt_recommendation_view(request):
 
     # 3. OpenAI API 호출
     try:
-        client = OpenAI(api_key=api_key)
-        
-        # 요청하신 GPT 모델명 사용
-        model_name = "gpt-5-nano"
+        client = get_resource("openai")
 
         completion = client.chat.completions.create(
-            model=model_name,
-            messages=[
-                {"role": "system", "content": "You are a professional security expert. Your answers should be clear, concise, and directly address the vulnerability described."},
-                {"role": "user", "content": prompt}
-            ]
+            model=MODEL_NAME,
+            messages=_messages(prompt)
         )
-        
+
         response_content = completion.choices[0].message.content
-        
+
         return JsonResponse({"response": response_content})
 
     except Exception as e:
-        error_message = str(e)
-        # 사용자가 존재하지 않는 모델명을 사용했을 경우 더 친절한 안내를 제공
-        if "The model `gpt-5-nano` does not exist" in error_message:
-            error_message = "GPT 모델('gpt-5-nano')을 찾을 수 없습니다. 모델명을 확인하거나 OpenAI API Plan을 확인하세요."
-        
-        return JsonResponse({"error": f"GPT API 호출 중 오류 발생: {error_message}"}, status=500)
+        return JsonResponse({"error": f"GPT API 호출 중 오류 발생: {_error_message(e)}"}, status=500)
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _stream_completion(prompt):
+    """
+    GPT 응답 조각(delta)을 도착하는 대로 SSE 이벤트로 내보낸다.
+    클라이언트가 연결을 끊으면 Django가 이 제너레이터를 취소하고, finally에서 업스트림 스트림을 닫아 생성을 중단시킨다.
+    """
+    stream = None
+    try:
+        client = get_resource("openai_async")
+        stream = await client.chat.completions.create(
+            model=MODEL_NAME,
+            messages=_messages(prompt),
+            stream=True,
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield _sse("delta", {"text": delta})
+        yield _sse("done", {})
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        yield _sse("error", {"error": f"GPT API 호출 중 오류 발생: {_error_message(e)}"})
+    finally:
+        if stream is not None:
+            await stream.close()
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+async def get_gpt_recommendation_stream_view(request):
+    """
+    get_gpt_recommendation_view의 스트리밍 버전 (text/event-stream)
+    - event: delta {"text"} → 여러 번, 마지막에 done 또는 error
+    """
+    if not os.getenv("OPENAI_API_KEY"):
+        return JsonResponse({"error": "OpenAI API 키가 설정되지 않았습니다. 환경 변수를 확인하세요."}, status=500)
+
+    try:
+        data = json.loads(request.body)
+        prompt = data.get('prompt')
+        if not prompt:
+            return JsonResponse({"error": "프롬프트 내용이 없습니다."}, status=400)
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "잘못된 요청 형식입니다."}, status=400)
+
+    response = StreamingHttpResponse(_stream_completion(prompt), content_type="text/event-stream; charset=utf-8")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # 리버스 프록시 버퍼링 방지
+    return response
+
+
+def vuln_type(title):
+    """'3. 오래된 버전 (jQuery)' → '오래된 버전 (jQuery)' (같은 유형의 행은 추천 1회로 공유)"""
+    return re.sub(r'^\d+\.\s*', '', title or '').strip()
+
+
+async def run_gpt_batch(session_id, send, row_nos=None, concurrency=GPT_BATCH_CONCURRENCY):
+    """
+    파싱 세션의 모든 행 프롬프트로 GPT 추천을 동시에 요청하고, 완료되는 대로 send(payload)로 전달.
+    - 같은 취약점 유형(번호 제외 제목)은 첫 행의 프롬프트로 1회만 요청하고 결과를 공유
+    - 동시 요청 수는 concurrency로 제한, 클라이언트는 레지스트리의 비동기 클라이언트 1개를 공유
+    """
+    rows = await asyncio.to_thread(load_session_rows, session_id)
+    if row_nos is not None:
+        wanted = set(row_nos)
+        rows = [r for r in rows if r["row_no"] in wanted]
+
+    groups = {}
+    for r in rows:
+        if not r.get("gpt_prompt"):
+            continue
+        groups.setdefault(vuln_type(r.get("title")) or f"#{r['row_no']}", []).append(r)
+
+    t_start = time.perf_counter()
+    await send({
+        "status": "start",
+        "total_rows": sum(len(members) for members in groups.values()),
+        "requests": len(groups),
+    })
+    if not groups:
+        await send({"status": "done", "elapsed_ms": 0})
+        return
+
+    client = get_resource("openai_async")
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def recommend(vtype, members):
+        async with semaphore:
+            t0 = time.perf_counter()
+            payload = {"vuln_type": vtype, "rows": [m["row_no"] for m in members]}
+            try:
+                completion = await client.chat.completions.create(
+                    model=MODEL_NAME,
+                    messages=_messages(members[0]["gpt_prompt"]),
+                )
+                payload.update(status="result", response=completion.choices[0].message.content)
+            except Exception as e:
+                payload.update(status="item_error", message=f"GPT API 호출 중 오류 발생: {_error_message(e)}")
+            payload["elapsed_ms"] = round((time.perf_counter() - t0) * 1000)
+        await send(payload)
+
+    await asyncio.gather(*(recommend(k, v) for k, v in groups.items()))
+    await send({"status": "done", "elapsed_ms": round((time.perf_counter() - t_start) * 1000)})
@@ -0,0 +1,75 @@
+"""
+Invicti 리포트 CSS를 내용 해시로 저장/제공
+- 파싱 시 CSS는 해시 파일로 1회 저장하고, 파싱 응답에는 해시/URL만 보낸다
+- 같은 Invicti 버전의 리포트는 같은 해시 → 브라우저 캐시(ETag + immutable)로 재전송 없음
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
+
+CSS_DIR = Path("main/data/invicti_css")
+CSS_MAX_AGE = 365 * 24 * 60 * 60  # 내용 해시 URL이므로 1년 + immutable
+
+_HASH_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+def css_hash(css: str) -> str:
+    return hashlib.sha256(css.encode("utf-8")).hexdigest()[:32]
+
+
+def _css_path(h: str) -> Path:
+    return CSS_DIR / f"{h}.css"
+
+
+def store_css(css: str) -> Optional[str]:
+    """CSS를 해시 파일로 저장(이미 있으면 건너뜀)하고 해시 반환. 여러 프로세스가 동시에 써도 안전."""
+    if not css:
+        return None
+    h = css_hash(css)
+    path = _css_path(h)
+    if path.exists():
+        return h
+    CSS_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=CSS_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(css)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return h
+
+
+def css_url(h: Optional[str]) -> str:
+    return reverse("invicti_css", args=[h]) if h else ""
+
+
+def _css_etag(request, css_hash):
+    if _HASH_RE.match(css_hash) and _css_path(css_hash).exists():
+        return css_hash
+    return None
+
+
+@require_GET
+@cache_control(public=True, max_age=CSS_MAX_AGE, immutable=True)
+@condition(etag_func=_css_etag)
+def invicti_css_view(request, css_hash):
+    # If-None-Match 일치 시 condition()이 304를 돌려준다
+    if not _HASH_RE.match(css_hash):
+        raise Http404
+    try:
+        content = _css_path(css_hash).read_bytes()
+    except FileNotFoundError:
+        raise Http404
+    return HttpResponse(content, content_type="text/css; charset=utf-8")
@@ -1,65 +1,286 @@
+import html
 import json
+import os
 import re
-from bs4 import BeautifulSoup, Tag
+import threading
+import time
+from functools import lru_cache
+from lxml import etree, html as lxml_html
 from typing import Optional, Dict, Any, List
-import pandas as pd
 import bleach
 from bleach.css_sanitizer import CSSSanitizer
-from fuzzywuzzy import fuzz
+from main.utils.resources import get_resource
+from . import security_matcher  # noqa: F401  ("security_matcher" 리소스 등록)
+from .security_css import store_css
 
-# --- 1. 엑셀 파일 로드 ---
-try:
-    df_security_map = pd.read_excel("main/data/security.xlsx", sheet_name="Sheet1")
-except FileNotFoundError:
-    print("오류: security.xlsx 파일을 찾을 수 없습니다. py 파일과 동일한 경로에 위치시켜주세요.")
-    df_security_map = pd.DataFrame()
+# --- 1. 템플릿 매칭기 ---
+# security.xlsx는 첫 파싱 요청 시 1회 로드·컴파일 (security_matcher.SecurityTemplateMatcher)
 
-# --- 2. 변수 추출 함수 정의 ---
-def _get_vuln_block_from_desc(vuln_desc_div):
-    vuln_elements = [vuln_desc_div]
-    for sibling in vuln_desc_div.find_next_siblings():
-        if sibling.name == 'div' and 'vuln-desc' in sibling.get('class', []):
+# --- 1-1. lxml 노드 헬퍼 ---
+# 문서는 lxml로 1회만(청크 단위 증분) 파싱하고, 취약점 블록은 [vuln-desc div, 다음 형제들...] 노드 목록으로 다룬다.
+# (블록을 문자열로 직렬화 → 재파싱하지 않음)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_TARGET_LEVELS = {"criticals", "highs", "mediums"}
+_TEXT_SKIP_TAGS = {"script", "style"}
+# libxml2가 열린 <pre>를 닫아 버리는 시작 태그
+_PRE_BREAKING_TAGS = {"table", "ul", "li", "dl", "dt", "dd", "form", "fieldset"}
+
+
+def _has_class(cls: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+# 블록 루트 자신 포함(descendant-or-self) / 자손만(descendant)
+_X_VULN_URL_DIVS = etree.XPath(f"descendant-or-self::*[{_has_class('vuln-url')}]//div")
+_X_WEAK_CIPHERS = etree.XPath("descendant-or-self::li[contains(@data-description, '지원되는 약한 암호 목록')]")
+_X_H4 = etree.XPath("descendant-or-self::h4")
+_X_HEADER_DIV = etree.XPath(f"descendant-or-self::div[{_has_class('vuln-desc-header')}]")
+_X_FIRST_VULN = etree.XPath(f"descendant-or-self::div[{_has_class('vuln')}]")
+_X_DETAIL = etree.XPath(f"descendant::div[{_has_class('vuln-detail')}][1]")
+_X_CPROMPT = etree.XPath(f"descendant::pre[{_has_class('cprompt')}][1]")
+_X_REQ_TAB = etree.XPath(f"descendant::*[{_has_class('vuln-tab')} and {_has_class('vuln-req1-tab')}][1]")
+_X_RESP_TAB = etree.XPath(f"descendant::*[{_has_class('vuln-tab')} and {_has_class('vuln-resp1-tab')}][1]")
+_X_TH_TD = etree.XPath("descendant::*[self::th or self::td]")
+
+
+def _classes(el) -> List[str]:
+    return (el.get("class") or "").split()
+
+
+def _is_element(node) -> bool:
+    return isinstance(node.tag, str)
+
+
+def _strings(el):
+    """BeautifulSoup 문자열 순회와 동일: 주석과 script/style 내용은 제외"""
+    if el.tag not in _TEXT_SKIP_TAGS and el.text:
+        yield el.text
+    for child in el:
+        if _is_element(child):
+            yield from _strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _text(el, sep: str = "", strip: bool = False) -> str:
+    """BeautifulSoup get_text(sep, strip) 대응"""
+    if strip:
+        return sep.join(s for s in (x.strip() for x in _strings(el)) if s)
+    return sep.join(_strings(el))
+
+
+def _first(block, xpath):
+    """블록(노드 목록)에서 문서 순서상 첫 매치"""
+    for node in block:
+        found = xpath(node)
+        if found:
+            return found[0]
+    return None
+
+
+def _select(block, xpath):
+    out = []
+    for node in block:
+        out.extend(xpath(node))
+    return out
+
+
+def _next_element_sibling(el):
+    for sib in el.itersiblings():
+        if _is_element(sib):
+            return sib
+    return None
+
+
+def _previous_sibling_named(el, tag):
+    for sib in el.itersiblings(preceding=True):
+        if sib.tag == tag:
+            return sib
+    return None
+
+
+def _single_string(el) -> Optional[str]:
+    """BeautifulSoup Tag.string 대응: 자식이 하나뿐일 때 그 문자열(자식이 태그면 재귀)"""
+    contents = [el.text] if el.text else []
+    for child in el:
+        contents.append(child)
+        if child.tail:
+            contents.append(child.tail)
+    if len(contents) != 1:
+        return None
+    only = contents[0]
+    if isinstance(only, str):
+        return only
+    return _single_string(only) if _is_element(only) else only.text
+
+
+def _is_vuln_desc(el) -> bool:
+    return el.tag == "div" and "vuln-desc" in _classes(el)
+
+
+def _collect_block(vuln_desc_div):
+    """vuln-desc div + 다음 vuln-desc 전까지의 형제 요소"""
+    block = [vuln_desc_div]
+    for sib in vuln_desc_div.itersiblings():
+        if not _is_element(sib):
+            continue
+        if _is_vuln_desc(sib):
             break
-        vuln_elements.append(sibling)
-    block_html = "".join(str(el) for el in vuln_elements)
-    return BeautifulSoup(block_html, 'html.parser')
+        block.append(sib)
+    return block
+
+# --- 1-2. 스니펫 정리(sanitize) 규칙: 모듈 로드 시 1회 구성 ---
+ALLOWED_TAGS = frozenset(bleach.sanitizer.ALLOWED_TAGS) | {'div', 'h2', 'h3', 'h4', 'p', 'pre', 'code', 'span', 'ul', 'li', 'ol', 'a', 'svg', 'use', 'path', 'g', 'circle', 'rect', 'polygon', 'defs', 'style', 'table', 'thead', 'tbody', 'tr', 'th', 'td', 'input', 'label', 'button'}
+ALLOWED_ATTRIBUTES = frozenset(['class', 'id', 'style', 'aria-label', 'tabindex', 'role', 'aria-labelledby', 'scope', 'type', 'checked', 'for', 'data-responseid', 'data-button', 'data-panel', 'aria-controls', 'aria-selected', 'aria-expanded', 'aria-hidden', 'viewbox', 'xmlns', 'points', 'cx', 'cy', 'r', 'd', 'fill', 'transform', 'x', 'y', 'width', 'height', 'rx', 'ry', 'xlink:href', 'x1', 'y1', 'x2', 'y2', 'stroke', 'stroke-width'])
+ALLOWED_CSS_PROPERTIES = ['color', 'background-color', 'width', 'height', 'font-size', 'font-weight', 'text-align', 'padding', 'margin', 'border', 'border-left-width', 'display', 'float', 'word-break']
+ALLOWED_PROTOCOLS = frozenset(bleach.sanitizer.ALLOWED_PROTOCOLS)
+CSS_SANITIZER = CSSSanitizer(allowed_css_properties=ALLOWED_CSS_PROPERTIES)
+
+# 트리 기반 정리(기본) / "0"이면 bleach.Cleaner 문자열 경로 사용
+TREE_SANITIZER = os.environ.get("INVICTI_TREE_SANITIZER", "1") != "0"
+
+# bleach가 URI로 검사하는 속성 중 허용 목록에 있는 것
+_URI_ATTRIBUTES = {'xlink:href'}
+_URI_SCHEME = re.compile(r'^([a-z][a-z0-9+.\-]*):')
+_URI_IGNORED_CHARS = re.compile(r'[\x00-\x20\x7f]+')
+
+_cleaner_local = threading.local()
+
+
+def _bleach_cleaner() -> bleach.Cleaner:
+    """재사용 bleach.Cleaner (Cleaner는 스레드 안전하지 않아 스레드별 1개)"""
+    cleaner = getattr(_cleaner_local, "cleaner", None)
+    if cleaner is None:
+        cleaner = _cleaner_local.cleaner = bleach.Cleaner(
+            tags=ALLOWED_TAGS, attributes={'*': sorted(ALLOWED_ATTRIBUTES)},
+            css_sanitizer=CSS_SANITIZER, strip=True,
+        )
+    return cleaner
+
+
+@lru_cache(maxsize=4096)
+def _sanitize_css(style: str) -> str:
+    # Invicti 리포트는 같은 인라인 style이 반복됨 → 결과 캐시
+    return CSS_SANITIZER.sanitize_css(style)
+
+
+def _uri_allowed(value: str) -> bool:
+    """bleach sanitize_uri_value와 같은 기준: 상대 경로/프래그먼트 또는 허용 프로토콜"""
+    normalized = _URI_IGNORED_CHARS.sub('', value).lower()
+    match = _URI_SCHEME.match(normalized)
+    return match is None or match.group(1) in ALLOWED_PROTOCOLS
+
+
+def _append_text(parent, prev, text):
+    if prev is None:
+        parent.text = (parent.text or '') + text
+    else:
+        prev.tail = (prev.tail or '') + text
+
+
+def _unwrap(el, keep_content=True):
+    """el 태그만 제거하고 텍스트/자식은 제자리에 남김 (bleach strip=True 동작)"""
+    parent = el.getparent()
+    prev = el.getprevious()
+    last = prev
+    if keep_content:
+        if el.text:
+            _append_text(parent, prev, el.text)
+        idx = parent.index(el)
+        children = list(el)
+        for offset, child in enumerate(children):
+            parent.insert(idx + offset, child)
+        if children:
+            last = children[-1]
+    tail, el.tail = el.tail, None
+    parent.remove(el)
+    if tail:
+        _append_text(parent, last, tail)
+
+
+def _clean_element(el):
+    if el.tag == 'style' and el.text:
+        # <style> 내용은 직렬화 시 이스케이프되지 않음 → svg 안(외부 콘텐츠)에서 마크업으로 해석되지 않도록 '<'를 CSS 이스케이프
+        el.text = el.text.replace('<', '\\3c ')
+    attrib = el.attrib
+    for name in list(attrib):
+        if name not in ALLOWED_ATTRIBUTES:
+            del attrib[name]
+        elif name == 'style':
+            attrib[name] = _sanitize_css(attrib[name])
+        elif name in _URI_ATTRIBUTES and not _uri_allowed(attrib[name]):
+            del attrib[name]
+
+
+def _sanitize_children(el):
+    for child in list(el):
+        if not _is_element(child):
+            _unwrap(child, keep_content=False)  # 주석/PI 제거
+            continue
+        _sanitize_children(child)
+        if child.tag in ALLOWED_TAGS:
+            _clean_element(child)
+        else:
+            _unwrap(child)
+
+
+def _sanitize_block_html(vuln_block) -> str:
+    """
+    블록 노드를 제자리에서 허용 목록 기준으로 정리한 뒤 1회 직렬화.
+    블록은 행 생성 직후 버려지므로 복사하지 않는다(다른 추출이 모두 끝난 뒤 호출할 것).
+    """
+    parts = []
+    for node in vuln_block:
+        _sanitize_children(node)
+        if node.tag in ALLOWED_TAGS:
+            _clean_element(node)
+            parts.append(_outer_html(node))
+        else:
+            parts.append(html.escape(node.text or '', quote=False))
+            parts.extend(lxml_html.tostring(child, encoding="unicode") for child in node)
+    return "".join(parts)
 
+# --- 2. 변수 추출 함수 정의 ---
+# 핸들러는 블록 노드 목록([vuln-desc div, 형제들...])을 받는다.
 def _find_h4_sibling_text(vuln_block, text):
-    h4_tag = vuln_block.find('h4', string=re.compile(text, re.I))
-    if h4_tag:
-        next_sibling = h4_tag.find_next_sibling()
-        if next_sibling and next_sibling.find('li'):
-            return next_sibling.find('li').text.strip()
+    pattern = re.compile(text, re.I)
+    for h4_tag in _select(vuln_block, _X_H4):
+        string = _single_string(h4_tag)
+        if string is None or not pattern.search(string):
+            continue
+        next_sibling = _next_element_sibling(h4_tag)
+        if next_sibling is not None:
+            li = next(next_sibling.iterdescendants("li"), None)
+            if li is not None:
+                return _text(li).strip()
+        return ''
     return ''
 
-def get_variables_default(vuln_desc_div):
+def get_variables_default(vuln_block):
     return {}
 
-def get_variables_for_urls(vuln_desc_div):
-    block = _get_vuln_block_from_desc(vuln_desc_div)
-    urls = block.select('.vuln-url div')
+def get_variables_for_urls(vuln_block):
+    urls = _select(vuln_block, _X_VULN_URL_DIVS)
     url_texts = []
     for url in urls:
-        text = url.text.strip()
+        text = _text(url).strip()
         text = re.sub(r'^\d+\.\d+\.\s*', '', text)
         if text.endswith('확정됨'):
             text = text[:-len('확정됨')].strip()
 
         if text:
             url_texts.append(text)
-            
+
     return {'url': '\n'.join(url_texts)}
-    
-def get_variables_for_weak_ciphers(vuln_desc_div):
-    block = _get_vuln_block_from_desc(vuln_desc_div)
-    selector = "li[data-description*='지원되는 약한 암호 목록']"
-    weak_ciphers = [li.text.strip() for li in block.select(selector)]
+
+def get_variables_for_weak_ciphers(vuln_block):
+    weak_ciphers = [_text(li).strip() for li in _select(vuln_block, _X_WEAK_CIPHERS)]
     return {'weak': '\n'.join(weak_ciphers)}
 
-def get_variables_for_out_of_date(vuln_desc_div):
-    block = _get_vuln_block_from_desc(vuln_desc_div)
-    v1 = _find_h4_sibling_text(block, 'Overall Latest Version')
-    v2 = _find_h4_sibling_text(block, '확인된 버전')
+def get_variables_for_out_of_date(vuln_block):
+    v1 = _find_h4_sibling_text(vuln_block, 'Overall Latest Version')
+    v2 = _find_h4_sibling_text(vuln_block, '확인된 버전')
     return {'v1': v1, 'v2': v2}
 
 # --- 3. 핸들러 매핑 ---
@@ -71,15 +292,15 @@ VARIABLE_HANDLERS = {
 }
 
 def _clean_text(el) -> str:
-    return "" if el is None else el.get_text("\n", strip=True)
+    return "" if el is None else _text(el, "\n", strip=True)
 
 def _vd_parse_table(table_tag) -> Optional[Dict[str, Any]]:
-    if not table_tag:
+    if table_tag is None:
         return None
-    first_tr = table_tag.find('tr')
-    if not first_tr:
+    first_tr = next(table_tag.iterdescendants('tr'), None)
+    if first_tr is None:
         return None
-    headers = [th.get_text(strip=True) for th in first_tr.find_all(['th','td'])]
+    headers = [_text(th, strip=True) for th in _X_TH_TD(first_tr)]
 
     mapping: List[tuple] = []
     for h in headers:
@@ -91,8 +312,8 @@ def _vd_parse_table(table_tag) -> Optional[Dict[str, Any]]:
         else: mapping.append((f"col_{len(mapping)}", h))
 
     rows = []
-    for tr in table_tag.find_all('tr')[1:]:
-        cells = [td.get_text("\n", strip=True) for td in tr.find_all(['td','th'])]
+    for tr in list(table_tag.iterdescendants('tr'))[1:]:
+        cells = [_text(td, "\n", strip=True) for td in _X_TH_TD(tr)]
         if len(cells) < len(mapping):
             cells += ['']*(len(mapping)-len(cells))
         row_obj = {}
@@ -103,34 +324,54 @@ def _vd_parse_table(table_tag) -> Optional[Dict[str, Any]]:
     columns = [{"key": k, "label": lbl} for (k, lbl) in mapping]
     return {"columns": columns, "rows": rows}
 
-def _vd_extract_pre_text(container, selector: str) -> Optional[str]:
-    if not container:
+def _vd_extract_pre_text(container, xpath) -> Optional[str]:
+    if container is None:
         return None
-    el = container.select_one(selector)
-    if not el:
+    found = xpath(container)
+    if not found:
         return None
-    pre = el.find('pre')
-    if not pre:
+    el = found[0]
+    pre = next(el.iterdescendants('pre'), None)
+    if pre is None:
         return _clean_text(el)
-    code = pre.find('code')
-    return code.get_text("\n", strip=False) if code else pre.get_text("\n", strip=False)
+    code = next(pre.iterdescendants('code'), None)
+    if code is not None:
+        return _text(code, "\n")
+    return "\n".join(_pre_strings(pre))
 
-def _extract_vuln_detail_as_json(vuln_block: BeautifulSoup) -> Optional[Dict[str, Any]]:
+def _pre_strings(pre):
+    """
+    pre 문자열(BeautifulSoup html.parser 기준) 순회.
+    libxml2는 <pre> 안에서 table/ul 등이 시작되면 pre를 닫고 그 요소와 뒤 텍스트를 형제로 옮긴다
+    (원래의 </pre>는 무시) → pre 바로 뒤가 그런 요소면 탭 안의 뒤따르는 형제까지 pre 내용으로 본다.
     """
-    개별 취약점 블록에서 첫 번째 vuln의 상세 정보를 JSON으로 추출합니다.
+    yield from _strings(pre)
+    nxt = pre.getnext()
+    if pre.tail or nxt is None or nxt.tag not in _PRE_BREAKING_TAGS:
+        return
+    for sib in pre.itersiblings():
+        if _is_element(sib):
+            yield from _strings(sib)
+        if sib.tail:
+            yield sib.tail
+
+def _extract_vuln_detail_as_json(vuln_block) -> Optional[Dict[str, Any]]:
+    """
+    개별 취약점 블록(노드 목록)에서 첫 번째 vuln의 상세 정보를 JSON으로 추출합니다.
     """
     if not vuln_block:
         return None
-        
-    header_div = vuln_block.select_one('div.vuln-desc-header')
-    
+
+    header_div = _first(vuln_block, _X_HEADER_DIV)
+
     # 첫 번째 vuln 요소만 선택
-    first_vuln = vuln_block.select_one('div.vuln')
-    if not first_vuln:
+    first_vuln = _first(vuln_block, _X_FIRST_VULN)
+    if first_vuln is None:
         return None
 
-    detail_container = first_vuln.select_one('div.vuln-detail')
-    if not detail_container:
+    found = _X_DETAIL(first_vuln)
+    detail_container = found[0] if found else None
+    if detail_container is None:
         return {
             "header": _clean_text(header_div),
             "list": [],
@@ -139,149 +380,244 @@ def _extract_vuln_detail_as_json(vuln_block: BeautifulSoup) -> Optional[Dict[str
         }
 
     data_list = []
-    
+
     # 테이블 파싱
-    table_tag = detail_container.find('table')
-    if table_tag:
+    table_tag = next(detail_container.iterdescendants('table'), None)
+    if table_tag is not None:
         table_data = _vd_parse_table(table_tag)
         if table_data:
             data_list.append({"type": "table", "data": table_data})
-            
+
     # 코드 블록 파싱 (pre.cprompt)
-    code_block = detail_container.select_one('pre.cprompt')
-    if code_block:
-        key_tag = code_block.find_previous_sibling('h3') or code_block.find_previous_sibling('h4')
-        key = _clean_text(key_tag) if key_tag else "Code Block"
+    found = _X_CPROMPT(detail_container)
+    if found:
+        code_block = found[0]
+        key_tag = _previous_sibling_named(code_block, 'h3')
+        if key_tag is None:
+            key_tag = _previous_sibling_named(code_block, 'h4')
+        key = _clean_text(key_tag) if key_tag is not None else "Code Block"
         data_list.append({"type": "code", "key": key, "value": _clean_text(code_block)})
 
     # h4 + ul/a 구조 파싱 (key-value, link)
-    h4_tags = detail_container.find_all('h4')
-    for h4 in h4_tags:
+    for h4 in detail_container.iterdescendants('h4'):
         key = _clean_text(h4)
-        next_sibling = h4.find_next_sibling()
-        if next_sibling and next_sibling.name == 'ul':
-            link_tag = next_sibling.find('a')
-            li_tag = next_sibling.find('li')
-            if link_tag:
+        next_sibling = _next_element_sibling(h4)
+        if next_sibling is not None and next_sibling.tag == 'ul':
+            link_tag = next(next_sibling.iterdescendants('a'), None)
+            li_tag = next(next_sibling.iterdescendants('li'), None)
+            if link_tag is not None:
                 value = link_tag.get('href', _clean_text(link_tag))
                 data_list.append({"type": "link", "key": key, "value": value})
-            elif li_tag:
+            elif li_tag is not None:
                 value = _clean_text(li_tag)
                 data_list.append({"type": "key-value", "key": key, "value": value})
 
     return {
         "header": _clean_text(header_div),
         "list": data_list,
-        "request": _vd_extract_pre_text(detail_container, '.vuln-tab.vuln-req1-tab'),
-        "response": _vd_extract_pre_text(detail_container, '.vuln-tab.vuln-resp1-tab'),
+        "request": _vd_extract_pre_text(detail_container, _X_REQ_TAB),
+        "response": _vd_extract_pre_text(detail_container, _X_RESP_TAB),
     }
 
+def _outer_html(el) -> str:
+    return lxml_html.tostring(el, encoding="unicode", with_tail=False)
+
 # --- 4. 메인 추출 함수 ---
+def _extract_css(head) -> str:
+    # <style> 내용만 이어 붙인 순수 CSS (해시 저장 후 .css로 제공)
+    return "\n".join((style.text or "").strip() for style in head.iter("style"))
+
+def _build_row(vuln_desc_div, vuln_block, matcher) -> Dict[str, Any]:
+    """vuln-desc div와 블록 노드 목록으로 결과 행 1개 생성"""
+    h2_tag = next(vuln_desc_div.iterdescendants('h2'), None)
+    if h2_tag is None:
+        return None
+
+    h2_text = _text(h2_tag).strip()
+    cleaned_title = re.sub(r'^\d+\.\s*', '', h2_text)
+
+    matched_row = matcher.match(cleaned_title)
+
+    defect_summary = h2_text
+    defect_description = "\n".join([_text(p).strip() for p in vuln_desc_div.iterdescendants('p')])
+
+    if matched_row is not None:
+        template_summary = str(matched_row['TTA 결함 리포트 결함 요약'])
+        template_description = str(matched_row['결함 내용'])
+
+        o_text = ''
+        match = re.search(r'\((.*?)\)', h2_text)
+        if match:
+            o_text = match.group(1).strip()
+
+        handler_id = matched_row['번호']
+        handler = VARIABLE_HANDLERS.get(handler_id, get_variables_default)
+        other_variables = handler(vuln_block)
+
+        all_variables = {'o': o_text, **other_variables}
+        for key, value in all_variables.items():
+            if value:
+                template_summary = template_summary.replace(f'{{{key}}}', value)
+                template_description = template_description.replace(f'{{{key}}}', value)
+
+        defect_summary = template_summary
+        defect_description = template_description
+
+    vuln_detail_json = _extract_vuln_detail_as_json(vuln_block)
+
+    gpt_prompt = ""
+    if vuln_detail_json:
+        clean_json_data = {k: v for k, v in vuln_detail_json.items() if v}
+        prompt_body = json.dumps(clean_json_data, indent=2, ensure_ascii=False)
+        gpt_prompt = (
+            "다음 Invicti 취약점 데이터에 대한 구체적인 해결 방안을 한글로 제시해줘.\n"
+            "코드가 포함된 답변이라면, 해당 코드는 마크다운 코드 블록으로 감싸줘.\n\n"
+            f"{prompt_body}"
+        )
+
+    level_class = _classes(vuln_desc_div)
+    defect_level = 'H' if any(c in level_class for c in ['criticals', 'highs']) else 'M' if 'mediums' in level_class else ''
+
+    # 스니펫은 블록 노드를 정리하므로 다른 추출이 모두 끝난 뒤 생성
+    parent_container = next((a for a in vuln_desc_div.iterancestors() if 'container-fluid' in _classes(a)), None)
+    html_snippet = ""
+    if parent_container is not None:
+        parent_class = html.escape(' '.join(_classes(parent_container)))
+        if TREE_SANITIZER:
+            html_snippet = f'<div class="{parent_class}">{_sanitize_block_html(vuln_block)}</div>'
+        else:
+            inner_html = "".join(_outer_html(el) for el in vuln_block)
+            html_snippet = _bleach_cleaner().clean(f'<div class="{parent_class}">{inner_html}</div>')
+
+    return {
+        "id": None, "test_env_os": "시험환경\n모든 OS",
+        "defect_summary": defect_summary, "defect_level": defect_level,
+        "frequency": "A", "quality_attribute": "보안성",
+        "defect_description": defect_description, "invicti_report": h2_text,
+        "invicti_analysis": html_snippet,
+        "vuln_detail_json": vuln_detail_json,
+        "gpt_prompt": gpt_prompt,
+    }
+
+class ReportStreamParser:
+    """
+    Invicti HTML 증분 파서 (lxml HTMLPullParser)
+    - feed()로 받은 청크를 이벤트로 처리, 블록이 닫히는 즉시(다음 vuln-desc 시작 또는 부모 종료) 행을 생성
+    - 처리한 블록 노드는 트리에서 제거 → 메모리는 리포트 크기가 아니라 블록 1개 크기에 비례
+    """
+
+    def __init__(self, matcher=None):
+        self.matcher = matcher or get_resource("security_matcher")
+        self.css = ""
+        self._parser = etree.HTMLPullParser(events=("start", "end"), encoding="utf-8", huge_tree=True)
+        self._pending = {}  # 부모 요소 → 아직 블록이 닫히지 않은 vuln-desc div
+
+    def feed(self, chunk) -> List[Dict[str, Any]]:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> List[Dict[str, Any]]:
+        self._parser.close()
+        rows = self._drain()
+        for parent in list(self._pending):
+            rows.extend(self._flush(parent))
+        return rows
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        rows = []
+        for event, el in self._parser.read_events():
+            if event == "start":
+                if _is_vuln_desc(el):
+                    parent = el.getparent()
+                    # 같은 부모 아래 새 vuln-desc 시작 → 직전 블록의 형제들은 모두 닫힌 상태
+                    if parent in self._pending:
+                        rows.extend(self._flush(parent))
+                    self._pending[parent] = el
+            elif el in self._pending:
+                rows.extend(self._flush(el))
+            elif el.tag == "head":
+                self.css = _extract_css(el)
+        return rows
+
+    def _flush(self, parent) -> List[Dict[str, Any]]:
+        vuln_desc_div = self._pending.pop(parent)
+        vuln_block = _collect_block(vuln_desc_div)
+        rows = []
+        if _TARGET_LEVELS & set(_classes(vuln_desc_div)):
+            row_data = _build_row(vuln_desc_div, vuln_block, self.matcher)
+            if row_data is not None:
+                rows.append(row_data)
+        # 처리 끝난 블록(대상 외 등급 포함)은 버린다 (이미 닫힌 앞쪽 형제라 제거해도 안전)
+        for node in vuln_block:
+            parent.remove(node)
+        return rows
+
+
+def iter_report_chunks(data, chunk_size: int = STREAM_CHUNK_SIZE):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    for i in range(0, len(data), chunk_size):
+        yield data[i:i + chunk_size]
+
+
 def extract_vulnerability_sections(html_content):
-    soup = BeautifulSoup(html_content, 'html.parser')
-    css_styles = "\n".join(style.prettify() for style in soup.head.find_all('style'))
-    allowed_css_properties = ['color', 'background-color', 'width', 'height', 'font-size', 'font-weight', 'text-align', 'padding', 'margin', 'border', 'border-left-width', 'display', 'float', 'word-break']
-    css_sanitizer = CSSSanitizer(allowed_css_properties=allowed_css_properties)
+    parser = ReportStreamParser()
     results_rows = []
-    
-    SIMILARITY_THRESHOLD = 85
-    
-    target_divs = soup.select('div.vuln-desc.criticals, div.vuln-desc.highs, div.vuln-desc.mediums')
-    for vuln_desc_div in target_divs:
-        h2_tag = vuln_desc_div.find('h2')
-        if not h2_tag: continue
-        
-        h2_text = h2_tag.text.strip()
-        cleaned_title = re.sub(r'^\d+\.\s*', '', h2_text)
-
-        matched_row = None
-        if not df_security_map.empty:
-            best_match_score = 0
-            best_match_row = None
-            
-            for index, row in df_security_map.iterrows():
-                invicti_item = str(row['invicti 결함 리포트 항목']).strip()
-                if not invicti_item: continue
-                
-                score = fuzz.token_set_ratio(cleaned_title, invicti_item)
-                
-                if score > best_match_score:
-                    best_match_score = score
-                    best_match_row = row
-            
-            if best_match_score >= SIMILARITY_THRESHOLD:
-                matched_row = best_match_row
-        
-        defect_summary = h2_text
-        defect_description = "\n".join([p.text.strip() for p in vuln_desc_div.find_all('p')])
-
-        if matched_row is not None:
-            template_summary = str(matched_row['TTA 결함 리포트 결함 요약'])
-            template_description = str(matched_row['결함 내용'])
-            
-            o_text = ''
-            match = re.search(r'\((.*?)\)', h2_text)
-            if match:
-                o_text = match.group(1).strip()
-            
-            handler_id = matched_row['번호']
-            handler = VARIABLE_HANDLERS.get(handler_id, get_variables_default)
-            other_variables = handler(vuln_desc_div)
-            
-            all_variables = {'o': o_text, **other_variables}
-            for key, value in all_variables.items():
-                if value:
-                    template_summary = template_summary.replace(f'{{{key}}}', value)
-                    template_description = template_description.replace(f'{{{key}}}', value)
-            
-            defect_summary = template_summary
-            defect_description = template_description
-        
-        vuln_block_elements = [vuln_desc_div]
-        for sibling in vuln_desc_div.find_next_siblings():
-            if sibling.name == 'div' and 'vuln-desc' in sibling.get('class', []):
-                break
-            vuln_block_elements.append(sibling)
-        
-        block_html_for_json = "".join(str(el) for el in vuln_block_elements)
-        vuln_block_soup = BeautifulSoup(block_html_for_json, 'html.parser')
-        vuln_detail_json = _extract_vuln_detail_as_json(vuln_block_soup)
-
-        gpt_prompt = ""
-        if vuln_detail_json:
-            clean_json_data = {k: v for k, v in vuln_detail_json.items() if v}
-            prompt_body = json.dumps(clean_json_data, indent=2, ensure_ascii=False)
-            gpt_prompt = (
-                "다음 Invicti 취약점 데이터에 대한 구체적인 해결 방안을 한글로 제시해줘.\n"
-                "코드가 포함된 답변이라면, 해당 코드는 마크다운 코드 블록으로 감싸줘.\n\n"
-                f"{prompt_body}"
-            )
-
-        parent_container = vuln_desc_div.find_parent(class_='container-fluid')
-        html_snippet = ""
-        if parent_container:
-            parent_class = ' '.join(parent_container.get('class', []))
-            inner_html = "".join(el.prettify() for el in vuln_block_elements)
-            raw_html = f'<div class="{parent_class}">{inner_html}</div>'
-            allowed_tags = set(bleach.sanitizer.ALLOWED_TAGS) | {'div', 'h2', 'h3', 'h4', 'p', 'pre', 'code', 'span', 'ul', 'li', 'ol', 'a', 'svg', 'use', 'path', 'g', 'circle', 'rect', 'polygon', 'defs', 'style', 'table', 'thead', 'tbody', 'tr', 'th', 'td', 'input', 'label', 'button'}
-            allowed_attrs = {'*': ['class', 'id', 'style', 'aria-label', 'tabindex', 'role', 'aria-labelledby', 'scope', 'type', 'checked', 'for', 'data-responseid', 'data-button', 'data-panel', 'aria-controls', 'aria-selected', 'aria-expanded', 'aria-hidden', 'viewbox', 'xmlns', 'points', 'cx', 'cy', 'r', 'd', 'fill', 'transform', 'x', 'y', 'width', 'height', 'rx', 'ry', 'xlink:href', 'x1', 'y1', 'x2', 'y2', 'stroke', 'stroke-width']}
-            html_snippet = bleach.clean(raw_html, tags=allowed_tags, attributes=allowed_attrs, css_sanitizer=css_sanitizer, strip=True)
-
-        level_class = vuln_desc_div.get('class', [])
-        defect_level = 'H' if any(c in level_class for c in ['criticals', 'highs']) else 'M' if 'mediums' in level_class else ''
-
-        row_data = {
-            "id": None, "test_env_os": "시험환경\n모든 OS",
-            "defect_summary": defect_summary, "defect_level": defect_level,
-            "frequency": "A", "quality_attribute": "보안성",
-            "defect_description": defect_description, "invicti_report": h2_text,
-            "invicti_analysis": html_snippet,
-            "vuln_detail_json": vuln_detail_json,
-            "gpt_prompt": gpt_prompt,
-        }
-        results_rows.append(row_data)
+    for chunk in iter_report_chunks(html_content):
+        results_rows.extend(parser.feed(chunk))
+    results_rows.extend(parser.close())
 
     return {
-        "css": css_styles,
+        "css": parser.css,
         "rows": results_rows,
     }
+
+def parse_report_file(data) -> Dict[str, Any]:
+    """프로세스 풀 작업 단위: 파일 1개 파싱 + 소요 시간(ms). CSS는 해시 파일로 저장하고 해시만 반환"""
+    t0 = time.perf_counter()
+    parsed = extract_vulnerability_sections(data)
+    parsed["css_hash"] = store_css(parsed.pop("css"))
+    parsed["duration_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    return parsed
+
+def _iter_source_chunks(source, chunk_size: int = STREAM_CHUNK_SIZE):
+    """업로드 임시 파일 경로(str)면 파일에서 청크로 읽고, 바이트면 잘라서 산출"""
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+    else:
+        yield from iter_report_chunks(source, chunk_size)
+
+
+def stream_report_file(source, events, tag) -> None:
+    """
+    프로세스 풀 작업 단위(스트리밍): 파일을 청크로 증분 파싱하며 블록이 닫히는 대로 행을 events 큐에 넣는다
+    → (tag, "start", None) · (tag, "css", css_hash) · (tag, "rows", [행...])... · (tag, "file", {"rows", "duration_ms"})
+    - source는 임시 파일 경로 또는 바이트 → 리포트 전체를 한 번에 들고 있지 않는다
+    """
+    t0 = time.perf_counter()
+    events.put((tag, "start", None))
+    parser = ReportStreamParser()
+    css_sent = False
+    count = 0
+    for chunk in _iter_source_chunks(source):
+        rows = parser.feed(chunk)
+        if not css_sent and parser.css:
+            events.put((tag, "css", store_css(parser.css)))
+            css_sent = True
+        if rows:
+            count += len(rows)
+            events.put((tag, "rows", rows))
+    rows = parser.close()
+    if not css_sent:
+        events.put((tag, "css", store_css(parser.css)))
+    if rows:
+        count += len(rows)
+        events.put((tag, "rows", rows))
+    events.put((tag, "file", {"rows": count, "duration_ms": round((time.perf_counter() - t0) * 1000, 1)}))
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+security.xlsx 템플릿 매칭기 (Invicti 취약점 제목 → 템플릿 행)
+- 시트를 1회 컴파일: 'invicti 결함 리포트 항목'을 미리 정규화/토큰화
+- 1차: 정규화 토큰 집합 해시로 즉시 조회(token_set_ratio는 토큰 집합에만 의존)
+- 2차: rapidfuzz.process.extractOne(token_set_ratio) 벡터화 검색
+- 제목별 결과 메모이제이션
+- 기존 fuzzywuzzy 루프(첫 번째 최고점, 정수 반올림 점수 >= 85)와 같은 행을 고른다
+"""
+
+import re
+import threading
+
+from rapidfuzz import fuzz, process
+
+from main.utils.resources import get_resource, register
+
+SIMILARITY_THRESHOLD = 85
+MEMO_MAX = 10000
+
+_NON_WORD = re.compile(r"(?ui)\W")
+# fuzzywuzzy asciidammit: U+0080~U+00FF 제거
+_LATIN1_DROP = {i: None for i in range(128, 256)}
+
+
+def normalize_title(s) -> str:
+    """fuzzywuzzy utils.full_process(force_ascii=True)와 동일한 전처리"""
+    s = str(s).translate(_LATIN1_DROP)
+    return _NON_WORD.sub(" ", s).lower().strip()
+
+
+def _token_key(normalized: str) -> str:
+    return " ".join(sorted(set(normalized.split())))
+
+
+class SecurityTemplateMatcher:
+    def __init__(self, df):
+        self.rows = []      # 템플릿 행(dict), 엑셀 순서 유지
+        self.choices = []   # 정규화된 항목 문자열 (rows와 같은 인덱스)
+        if not df.empty:
+            for rec in df.to_dict("records"):
+                item = str(rec.get("invicti 결함 리포트 항목")).strip()
+                if not item:
+                    continue
+                self.rows.append(rec)
+                self.choices.append(normalize_title(item))
+
+        # 토큰 집합이 같은 제목은 모든 템플릿에 대해 점수가 같다 → 컴파일 시점에 답을 계산해 둔다
+        self._exact = {}
+        for norm in self.choices:
+            key = _token_key(norm)
+            if key not in self._exact:
+                self._exact[key] = self._search(norm)
+
+        self._memo = {}
+        self._memo_lock = threading.Lock()
+
+    def _search(self, normalized: str):
+        if not normalized or not self.choices:
+            return None
+        hit = process.extractOne(
+            normalized, self.choices,
+            scorer=fuzz.token_set_ratio, processor=None,
+            score_cutoff=SIMILARITY_THRESHOLD - 0.5,
+        )
+        if hit is None:
+            return None
+        # fuzzywuzzy는 반올림한 정수 점수로 비교 → 같은 정수 점수면 앞쪽 행이 이긴다
+        best = round(hit[1])
+        if best < SIMILARITY_THRESHOLD:
+            return None
+        for idx in range(hit[2]):
+            if round(fuzz.token_set_ratio(normalized, self.choices[idx], processor=None)) == best:
+                return idx
+        return hit[2]
+
+    def match_index(self, title: str):
+        try:
+            return self._memo[title]
+        except KeyError:
+            pass
+        normalized = normalize_title(title)
+        key = _token_key(normalized)
+        idx = self._exact[key] if key in self._exact else self._search(normalized)
+        with self._memo_lock:
+            if len(self._memo) >= MEMO_MAX:
+                self._memo.clear()
+            self._memo[title] = idx
+        return idx
+
+    def match(self, title: str):
+        """매칭된 템플릿 행(dict) 또는 None"""
+        idx = self.match_index(title)
+        return None if idx is None else self.rows[idx]
+
+
+@register("security_matcher")
+def _make_security_matcher():
+    return SecurityTemplateMatcher(get_resource("security_map"))
@@ -0,0 +1,138 @@
+"""
+Invicti 파싱 세션 저장소
+- 파싱 응답에는 행 요약만 보내고, 무거운 필드(스니펫 HTML/상세 JSON/GPT 프롬프트)는 서버에 보관
+- 키: (파싱 세션 id, 행 번호). 팝업이 열릴 때 상세 엔드포인트로 가져간다
+- 저장소: main/data/invicti_sessions.db (여러 워커 프로세스가 공유), TTL 경과분은 저장 시 정리
+"""
+
+import json
+import re
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.http import JsonResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_GET
+
+DB_PATH = Path("main/data/invicti_sessions.db")
+SESSION_TTL = 24 * 60 * 60  # 초
+
+DETAIL_FIELDS = ("invicti_analysis", "vuln_detail_json", "gpt_prompt")
+
+_SESSION_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _connect():
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS invicti_detail (
+            session          TEXT    NOT NULL,
+            row_no           INTEGER NOT NULL,
+            created          REAL    NOT NULL,
+            title            TEXT,
+            invicti_analysis TEXT,
+            vuln_detail_json TEXT,
+            gpt_prompt       TEXT,
+            PRIMARY KEY (session, row_no)
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_invicti_detail_created ON invicti_detail(created)")
+    return conn
+
+
+def new_session_id() -> str:
+    return uuid.uuid4().hex
+
+
+def save_details(session_id: str, rows: Iterable[Dict[str, Any]], start_no: int = 0) -> List[Dict[str, Any]]:
+    """
+    rows의 상세 필드를 저장하고 요약 행(상세 필드 제거 + parse_session/detail_no 추가) 목록을 반환.
+    스트리밍 모드에서는 묶음마다 start_no를 이어서 호출한다.
+    """
+    now = time.time()
+    summaries, records = [], []
+    for no, row in enumerate(rows, start=start_no):
+        summary = {k: v for k, v in row.items() if k not in DETAIL_FIELDS}
+        summary["parse_session"] = session_id
+        summary["detail_no"] = no
+        summaries.append(summary)
+        records.append((
+            session_id, no, now, row.get("invicti_report"),
+            row.get("invicti_analysis"),
+            json.dumps(row.get("vuln_detail_json"), ensure_ascii=False),
+            row.get("gpt_prompt"),
+        ))
+    if not records:
+        return summaries
+
+    conn = _connect()
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO invicti_detail VALUES (?, ?, ?, ?, ?, ?, ?)",
+                records,
+            )
+            conn.execute("DELETE FROM invicti_detail WHERE created < ?", (now - SESSION_TTL,))
+    finally:
+        conn.close()
+    return summaries
+
+
+def _decode(record: sqlite3.Row) -> Dict[str, Any]:
+    out = dict(record)
+    if "vuln_detail_json" in out and out["vuln_detail_json"] is not None:
+        out["vuln_detail_json"] = json.loads(out["vuln_detail_json"])
+    return out
+
+
+def load_detail(session_id: str, row_no: int, fields: Iterable[str] = DETAIL_FIELDS) -> Optional[Dict[str, Any]]:
+    cols = [f for f in fields if f in DETAIL_FIELDS] or list(DETAIL_FIELDS)
+    conn = _connect()
+    conn.row_factory = sqlite3.Row
+    try:
+        record = conn.execute(
+            f"SELECT {', '.join(cols)} FROM invicti_detail WHERE session = ? AND row_no = ? AND created >= ?",
+            (session_id, row_no, time.time() - SESSION_TTL),
+        ).fetchone()
+    finally:
+        conn.close()
+    return _decode(record) if record else None
+
+
+def load_session_rows(session_id: str, fields: Iterable[str] = ("title", "gpt_prompt")) -> List[Dict[str, Any]]:
+    """세션의 모든 행(row_no 순)"""
+    cols = ["row_no"] + [f for f in fields if f in DETAIL_FIELDS + ("title",)]
+    conn = _connect()
+    conn.row_factory = sqlite3.Row
+    try:
+        records = conn.execute(
+            f"SELECT {', '.join(cols)} FROM invicti_detail WHERE session = ? AND created >= ? ORDER BY row_no",
+            (session_id, time.time() - SESSION_TTL),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [_decode(r) for r in records]
+
+
+def is_valid_session_id(session_id: str) -> bool:
+    return bool(_SESSION_RE.match(session_id or ""))
+
+
+@require_GET
+@cache_control(private=True, max_age=SESSION_TTL)
+def invicti_detail_view(request, session_id, row_no):
+    """GET /security/invicti/detail/<session>/<row_no>/?fields=gpt_prompt,invicti_analysis"""
+    if not is_valid_session_id(session_id):
+        return JsonResponse({"error": "잘못된 세션입니다."}, status=400)
+    fields = [f for f in request.GET.get("fields", "").split(",") if f] or DETAIL_FIELDS
+    detail = load_detail(session_id, row_no, fields)
+    if detail is None:
+        return JsonResponse({"error": "상세 정보가 만료되었거나 없습니다. 리포트를 다시 업로드하세요."}, status=404)
+    return JsonResponse(detail)
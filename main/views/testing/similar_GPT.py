@@ -1,19 +1,9 @@
-import os
-import re
-import json
-from datetime import datetime
-from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_core.documents import Document
-from openai import OpenAI
 from dotenv import load_dotenv
+from main.utils.resources import get_resource
 
 # 환경변수 로드
 load_dotenv()
 
-# GPT API 초기화
-client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-
 def run_openai_GPT(query): # 문장당 유사제품 검색 개수
     print("[STEP 1] 사용자 질문 수신:", query)
     prompt = f"""
@@ -34,6 +24,7 @@ def run_openai_GPT(query): # 문장당 유사제품 검색 개수
     
     print("[STEP 2] GPT 요청 시작")
     try:
+        client = get_resource("openai")  # 첫 호출 시 1회 생성
         response = client.chat.completions.create(
             model="gpt-5-nano",
             messages=[{"role": "user", "content": prompt}]
@@ -1,7 +1,5 @@
-import faiss
 import sqlite3
-import numpy as np
-from sentence_transformers import SentenceTransformer
+from main.utils.resources import get_resource
 
 def select_data_from_db(indices):
     if not indices:
@@ -20,9 +18,9 @@ def select_data_from_db(indices):
     return [dict(row) for row in rows]
 
 def compare_from_index(text, k=30):
-    # 1) 인덱스 + 모델 로드
-    index = faiss.read_index("main/data/faiss_bge_m3_ko.idmap.index")
-    model = SentenceTransformer("upskyy/bge-m3-korean")
+    # 1) 인덱스 + 모델 (프로세스당 1회 로드된 인스턴스 재사용)
+    index = get_resource("faiss_index")
+    model = get_resource("encoder")
 
     # 2) 쿼리 임베딩
     query_vec = model.encode([text], normalize_embeddings=True).astype('float32')
@@ -3,17 +3,16 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from tempfile import NamedTemporaryFile
 
-# 텍스트 추출 관련 라이브러리
-import fitz  # PyMuPDF
-from pptx import Presentation
-
+# 텍스트 추출 라이브러리(fitz, pptx)는 해당 형식 파싱 시점에 import
 import os
 import re
+from main.utils.ooxml import W_P, W_T, W_TBL, iter_body, table_rows
 from .similar_GPT import run_openai_GPT
 from .similar_compare import compare_from_index
 
 # PDF 파일에서 텍스트 추출
 def parse_pdf(file_path):
+    import fitz  # PyMuPDF
     text = ""
     with fitz.open(file_path) as doc:
         for page in doc:
@@ -21,37 +20,22 @@ def parse_pdf(file_path):
     return text
 
 # DOCX 파일에서 텍스트 추출
-def parse_docx(file_path):
-    from zipfile import ZipFile
-    from lxml import etree, objectify
-
-    WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
-    with ZipFile(file_path) as z:
-        xml = z.read("word/document.xml")
-    root = objectify.fromstring(xml)
+def _cell_text_spaced(tc):
+    return " ".join(t.text for t in tc.iter(W_T) if t.text).strip()
 
+def parse_docx(file_path):
     text_blocks = []
 
-    for child in root.body.iterchildren():
-        tag = child.tag.replace(WORD_NS, "")
-        if tag == "p":  # 문단
-            p_text = " ".join(t.text for t in child.iter(tag=WORD_NS+"t") if t.text)
+    # 본문 블록 스트리밍(처리한 블록은 해제) — 문단/표 순서대로
+    for child in iter_body(file_path):
+        if child.tag == W_P:  # 문단
+            p_text = " ".join(t.text for t in child.iter(W_T) if t.text)
             if p_text.strip():
                 text_blocks.append(p_text.strip())
-        elif tag == "tbl":  # 표
-            for row in child.iter(tag=WORD_NS+"tr"):
-                cells = []
-                for tc in row.iter(tag=WORD_NS+"tc"):
-                    # 세로 병합(vMerge) 셀 'continue'는 skip
-                    tcPr = tc.tcPr if hasattr(tc, 'tcPr') else None
-                    vmerge = None
-                    if tcPr is not None and hasattr(tcPr, 'vMerge'):
-                        vmerge = getattr(tcPr.vMerge, "val", None)
-                        if vmerge is None or vmerge == "continue":
-                            continue  # 병합된 셀은 건너뜀
-                    cell_text = " ".join(t.text for t in tc.iter(tag=WORD_NS+"t") if t.text)
-                    if cell_text.strip():
-                        cells.append(cell_text.strip())
+        elif child.tag == W_TBL:  # 표
+            for row in table_rows(child, text=_cell_text_spaced):
+                # 세로 병합(vMerge)으로 위 셀에 이어지는 'continue' 셀은 skip
+                cells = [cell.text for cell in row if cell.vmerge != "continue" and cell.text]
                 if cells:
                     text_blocks.append(" | ".join(cells))
 
@@ -61,6 +45,7 @@ def parse_docx(file_path):
 
 # PPTX 파일에서 텍스트 추출
 def parse_pptx(file_path):
+    from pptx import Presentation
     prs = Presentation(file_path)
     text = []
     for slide in prs.slides:
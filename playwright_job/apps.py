@@ -1,8 +1,13 @@
+from __future__ import annotations
+
 import asyncio
 import logging
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 from django.apps import AppConfig
-from playwright.async_api import Browser  # ← Browser 타입만 남기고, async_playwright는 함수 안에서 import
+
+if TYPE_CHECKING:
+    # 타입 힌트 전용: 앱 로딩(모든 manage.py 실행) 때 playwright를 import하지 않는다
+    from playwright.async_api import Browser
 
 logger = logging.getLogger(__name__)
 